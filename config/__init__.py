@@ -15,7 +15,7 @@ __all__ = [
     'COLOR_BAR', 'COLOR_BAR_EXCEED', 'COLOR_TARGET_LINE', 'COLOR_BG_CONTRIB',
     
     # Mappings
-    'DAYS_ES', 'MONTHS_NUM_TO_ES', 'MONTHS_ES_TO_NUM',
+    'DAYS_ES', 'MONTHS_NUM_TO_ES', 'MONTHS_NUM_TO_ES_ARR', 'MONTHS_ES_TO_NUM',
     'WEEK_MONTH_MAPPING_2025', 'WEEK_DATE_RANGES_2025',
     'get_week_number_sunday_saturday', 'get_week_number_vectorized',
     
@@ -23,7 +23,7 @@ __all__ = [
     'TARGET_RATES', 'TARGET_WEEK_RATES',
     
     # Paths
-    'DATA_FILE_PATH', 'SCRAP_SHEET_NAME', 'VENTAS_SHEET_NAME', 'HORAS_SHEET_NAME',
+    'DATA_FILE_PATH', 'SCRAP_SHEET_NAME', 'VENTAS_SHEET_NAME', 'HORAS_SHEET_NAME', 'DATA_CACHE_FOLDER',
     'APP_TITLE', 'APP_WIDTH', 'APP_HEIGHT', 'APP_THEME', 'APP_COLOR_THEME', 'APP_ICON_PATH',
     'REPORTS_FOLDER', 'WEEK_REPORTS_FOLDER', 'MONTHLY_REPORTS_FOLDER', 
     'QUARTERLY_REPORTS_FOLDER', 'ANNUAL_REPORTS_FOLDER', 'CUSTOM_REPORTS_FOLDER',
@@ -3,6 +3,7 @@ Mappings and utility functions
 Day/month translations, week calculations, and fiscal calendar mappings
 """
 
+import numpy as np
 import pandas as pd
 
 # ============================================
@@ -37,6 +38,10 @@ MONTHS_NUM_TO_ES = {
     12: "Diciembre"
 }
 
+# Mismo mapeo como arreglo indexado por número de mes (posición 0 vacía),
+# para traducir una columna completa de meses con un solo indexado de numpy
+MONTHS_NUM_TO_ES_ARR = np.array([''] + [MONTHS_NUM_TO_ES[m] for m in range(1, 13)], dtype=object)
+
 # Nombre en español a número de mes (1-12) - diccionario inverso
 MONTHS_ES_TO_NUM = {
     "Enero": 1,
@@ -206,7 +211,23 @@ def get_week_number_vectorized(date_series, year=2025):
         
         return weeks
     
-    # Para otros años, usar strftime %U (vectorizado)
-    weeks = date_series.dt.strftime('%U').astype(int)
+    # Para otros años, semana %U (domingo a sábado) con aritmética entera,
+    # sin convertir cada fecha a texto: (día del año - 1 + 7 - día de semana) // 7
+    weeks = _week_number_u(date_series)
     weeks = weeks.where(weeks > 0, 1)  # Reemplazar 0 con 1
     return weeks
+
+
+def _week_number_u(date_series):
+    """
+    Equivalente vectorizado de date_series.dt.strftime('%U').astype(int)
+    
+    Args:
+        date_series: Serie de pandas con fechas (datetime)
+    
+    Returns:
+        Serie de pandas (int) con el número de semana iniciando en domingo (0-53)
+    """
+    day_of_year = date_series.dt.dayofyear
+    weekday_from_sunday = (date_series.dt.dayofweek + 1) % 7  # domingo = 0
+    return ((day_of_year - 1 + 7 - weekday_from_sunday) // 7).astype(int)
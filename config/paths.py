@@ -11,6 +11,7 @@ DATA_FILE_PATH = 'data/test pandas.xlsx'  # Ruta local
 SCRAP_SHEET_NAME = 'Scrap Database'
 VENTAS_SHEET_NAME = 'Ventas Database'
 HORAS_SHEET_NAME = 'Horas Database'
+DATA_CACHE_FOLDER = 'cache'  # Copia local de las hojas ya leídas (se regenera si cambia el Excel)
 
 # ============================================
 # CONFIGURACIÓN DE LA APLICACIÓN 
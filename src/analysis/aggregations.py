@@ -0,0 +1,159 @@
+"""
+aggregations.py - Agregaciones top-N compartidas por los módulos de análisis
+Agrupa con factorize + bincount de numpy (una pasada por columna)
+"""
+
+from typing import Any, Dict, Sequence
+import numpy as np
+import pandas as pd
+
+
+def aggregate_top_n(df: pd.DataFrame,
+                    group_col: str,
+                    top_n: int,
+                    first_cols: Sequence[str] = (),
+                    sum_cols: Sequence[str] = ('Total Posted',),
+                    abs_values: bool = False) -> pd.DataFrame:
+    """
+    Agrupa por una columna y regresa los top N grupos por 'Total Posted'
+
+    Args:
+        df: DataFrame ya filtrado al periodo (no se modifica)
+        group_col: Columna por la que se agrupa ('Item', 'Location', ...)
+        top_n: Número de grupos a retornar
+        first_cols: Columnas de las que se toma el primer valor del grupo
+        sum_cols: Columnas que se suman por grupo (debe incluir 'Total Posted')
+        abs_values: Sumar valores absolutos (scrap con reversas/ajustes negativos)
+
+    Returns:
+        DataFrame con [group_col, *first_cols, *sum_cols] ordenado de mayor a menor,
+        con índice 0..N-1
+    """
+    # Código de grupo por fila; sort=True deja los grupos en el mismo orden que groupby
+    codes, uniques = pd.factorize(df[group_col], sort=True)
+    num_groups = len(uniques)
+
+    # Filas con grupo nulo (código -1) se descartan, igual que groupby
+    valid_rows = codes >= 0
+    valid_codes = codes[valid_rows]
+    positions = np.flatnonzero(valid_rows)
+
+    # Suma por grupo con bincount (NaN cuenta como 0, igual que pandas)
+    sums = {}
+    for col in sum_cols:
+        weights = np.nan_to_num(df[col].to_numpy(dtype=np.float64)[valid_rows])
+        if abs_values:
+            weights = np.abs(weights)
+        sums[col] = np.bincount(valid_codes, weights=weights, minlength=num_groups)
+
+    # Top N en O(n) con argpartition; solo esos N se ordenan de mayor a menor
+    selected = _top_n_indices(sums['Total Posted'], top_n)
+
+    result = {group_col: uniques.take(selected)}
+
+    # Primer valor no nulo de cada grupo: mínima posición de fila por código
+    for col in first_cols:
+        values = df[col].reset_index(drop=True)
+        has_value = values.notna().to_numpy()[valid_rows]
+        first_idx = np.full(num_groups, len(df), dtype=np.int64)
+        np.minimum.at(first_idx, valid_codes[has_value], positions[has_value])
+        first_idx = first_idx[selected]
+        found = first_idx < len(df)
+        result[col] = values.take(np.where(found, first_idx, 0)).where(found).to_numpy()
+
+    # Sumas de los grupos seleccionados (columnas enteras se suman como int64, igual que pandas)
+    for col in sum_cols:
+        col_sums = sums[col][selected]
+        if pd.api.types.is_integer_dtype(df[col].dtype):
+            col_sums = col_sums.astype(np.int64)
+        result[col] = col_sums
+
+    return pd.DataFrame(result)
+
+
+def last_value_by_key(df: pd.DataFrame,
+                      key_col: str,
+                      value_col: str,
+                      keys: pd.Series) -> np.ndarray:
+    """
+    Último valor de value_col para cada clave (ej. la Ubicación de cada Item)
+
+    Equivale a df.set_index(key_col)[value_col].to_dict() + keys.map(...),
+    pero sin crear un dict con una entrada por fila: se deja una fila por
+    clave y se busca con un índice hash.
+
+    Args:
+        df: DataFrame de origen (no se modifica)
+        key_col: Columna clave
+        value_col: Columna de la que se toma el valor
+        keys: Claves a buscar
+
+    Returns:
+        np.ndarray con el valor de cada clave (NaN si no existe)
+    """
+    last_rows = df.drop_duplicates(key_col, keep='last')
+    lookup = pd.Series(last_rows[value_col].to_numpy(dtype=object),
+                       index=last_rows[key_col].to_numpy(dtype=object))
+    return lookup.reindex(keys.to_numpy(dtype=object)).to_numpy()
+
+
+def append_total_row(df: pd.DataFrame, totals: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Agrega la fila TOTAL al final de una tabla de contribuidores sin pd.concat
+
+    Args:
+        df: Tabla de contribuidores ya renombrada para el reporte
+        totals: Valores de la fila TOTAL por columna; las columnas que no
+            aparecen quedan como '' (celda vacía en PDF/UI)
+
+    Returns:
+        DataFrame con una fila más e índice 0..N
+    """
+    num_rows = len(df)
+    data = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        total = totals.get(col, '')
+
+        if isinstance(total, str) or values.dtype == object:
+            # Texto en la fila TOTAL: la columna queda como object
+            column = np.empty(num_rows + 1, dtype=object)
+            column[:num_rows] = values
+            column[num_rows] = total
+        else:
+            # Total numérico: la columna conserva su tipo numérico
+            column = np.append(values, total)
+        data[col] = column
+
+    return pd.DataFrame(data)
+
+
+def _top_n_indices(amounts: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    Índices de los N montos mayores, ordenados de mayor a menor
+
+    Args:
+        amounts: Monto por grupo
+        top_n: Número de índices a retornar
+
+    Returns:
+        np.ndarray: Índices seleccionados (empates en el orden original de los grupos)
+    """
+    if top_n <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    # Con pocos grupos basta un ordenamiento completo
+    if top_n >= len(amounts):
+        return np.argsort(-amounts, kind='stable')
+
+    # Monto del N-ésimo lugar con selección parcial O(n)
+    cutoff = -np.partition(-amounts, top_n - 1)[top_n - 1]
+
+    # Todos los mayores al corte; los lugares restantes van a los empatados
+    # en el corte en orden original (argpartition elegiría uno arbitrario)
+    above = np.flatnonzero(amounts > cutoff)
+    tied = np.flatnonzero(amounts == cutoff)[:top_n - len(above)]
+    idx = np.concatenate((above, tied))
+
+    # Ordenar solo los N elegidos de mayor a menor
+    return idx[np.lexsort((idx, -amounts[idx]))]
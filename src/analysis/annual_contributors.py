@@ -2,7 +2,8 @@
 annual_contributors.py - Análisis de contribuidores anuales de scrap
 """
 
-import pandas as pd
+from src.analysis.aggregations import aggregate_top_n, append_total_row
+from src.utils.date_cache import get_date_parts
 
 def get_annual_contributors(scrap_df, year, top_n=10):
     """
@@ -16,29 +17,20 @@ def get_annual_contributors(scrap_df, year, top_n=10):
     Returns:
         DataFrame: DataFrame con los principales contribuidores o None
     """
-    scrap_df = scrap_df.copy()
-    scrap_df['Create Date'] = pd.to_datetime(scrap_df['Create Date'])
-    scrap_df['Year'] = scrap_df['Create Date'].dt.year
-    
-    scrap_year = scrap_df[scrap_df['Year'] == year]
+    # Año de cada registro desde la caché de fechas (el original no se modifica)
+    years = get_date_parts(scrap_df, 'Create Date')['year']
+    scrap_year = scrap_df[years == year]
     
     if scrap_year.empty:
         return None
     
-    scrap_year = scrap_year.copy()
-    scrap_year['Quantity'] = scrap_year['Quantity'].abs()
-    scrap_year['Total Posted'] = scrap_year['Total Posted'].abs()
-    
-    contributors = scrap_year.groupby('Item', as_index=False).agg({
-        'Description': 'first',
-        'Location': 'first',
-        'Quantity': 'sum',
-        'Total Posted': 'sum'
-    })
-    
-    contributors = contributors.sort_values('Total Posted', ascending=False)
-    contributors = contributors.reset_index(drop=True)
-    contributors = contributors.head(top_n)
+    # Agrupar por Item con valores positivos (abs() dentro de la agregación, sin copiar)
+    contributors = aggregate_top_n(
+        scrap_year, 'Item', top_n,
+        first_cols=('Description', 'Location'),
+        sum_cols=('Quantity', 'Total Posted'),
+        abs_values=True
+    )
     
     total_top_n = contributors['Total Posted'].sum()
     if total_top_n > 0:
@@ -57,18 +49,12 @@ def get_annual_contributors(scrap_df, year, top_n=10):
         'Cumulative %': '% Acumulado'
     })
     
-    total_row = pd.DataFrame({
-        'Lugar': ['TOTAL'],
-        'Número de Parte': [''],
-        'Descripción': [''],
-        'Ubicación': [''],
-        'Cantidad Scrapeada': [contributors['Cantidad Scrapeada'].sum()],
-        'Monto (dls)': [contributors['Monto (dls)'].sum()],
-        '% Acumulado': ['']
+    contributors = append_total_row(contributors, {
+        'Lugar': 'TOTAL',
+        'Cantidad Scrapeada': contributors['Cantidad Scrapeada'].sum(),
+        'Monto (dls)': contributors['Monto (dls)'].sum()
     })
     
-    contributors = pd.concat([contributors, total_row], ignore_index=True)
-    
     return contributors
 
 
@@ -84,25 +70,15 @@ def get_annual_location_contributors(scrap_df, year, top_n=10):
     Returns:
         DataFrame: DataFrame con celdas ordenadas por contribución
     """
-    scrap_df = scrap_df.copy()
-    scrap_df['Create Date'] = pd.to_datetime(scrap_df['Create Date'])
-    scrap_df['Year'] = scrap_df['Create Date'].dt.year
-    
-    scrap_year = scrap_df[scrap_df['Year'] == year]
+    # Año de cada registro desde la caché de fechas (el original no se modifica)
+    years = get_date_parts(scrap_df, 'Create Date')['year']
+    scrap_year = scrap_df[years == year]
     
     if scrap_year.empty:
         return None
     
-    scrap_year = scrap_year.copy()
-    scrap_year['Total Posted'] = scrap_year['Total Posted'].abs()
-    
-    locations = scrap_year.groupby('Location', as_index=False).agg({
-        'Total Posted': 'sum'
-    })
-    
-    locations = locations.sort_values('Total Posted', ascending=False)
-    locations = locations.reset_index(drop=True)
-    locations = locations.head(top_n)
+    # Agrupar por Location con valores positivos (abs() dentro de la agregación)
+    locations = aggregate_top_n(scrap_year, 'Location', top_n, abs_values=True)
     
     total_amount = locations['Total Posted'].sum()
     if total_amount > 0:
@@ -3,6 +3,7 @@ custom_contributors.py - Análisis de contribuidores para rango de fechas person
 """
 
 import pandas as pd
+from src.analysis.aggregations import aggregate_top_n, append_total_row
 
 
 def get_top_contributors_custom(scrap_df, start_date, end_date, n_top=10):
@@ -47,24 +48,14 @@ def get_top_contributors_custom(scrap_df, start_date, end_date, n_top=10):
         print(f"⚠️ No hay datos para el periodo {start_date} - {end_date}")
         return None
     
-    # Convertir valores a positivo
-    df['Quantity'] = df['Quantity'].abs()
-    df['Total Posted'] = df['Total Posted'].abs()
-    
-    # Agrupar por Item (número de parte) como en weekly/monthly/quarterly
-    contributors = df.groupby('Item', as_index=False).agg({
-        'Description': 'first',
-        'Location': 'first',
-        'Quantity': 'sum',
-        'Total Posted': 'sum'
-    })
-    
-    # Ordenar por Total Posted descendente
-    contributors = contributors.sort_values('Total Posted', ascending=False)
-    
-    # Reset index y tomar top n
-    contributors = contributors.reset_index(drop=True)
-    contributors = contributors.head(n_top)
+    # Agrupar por Item (número de parte) como en weekly/monthly/quarterly,
+    # sumando valores positivos y tomando los top n por Total Posted
+    contributors = aggregate_top_n(
+        df, 'Item', n_top,
+        first_cols=('Description', 'Location'),
+        sum_cols=('Quantity', 'Total Posted'),
+        abs_values=True
+    )
     
     # Calcular % acumulado
     total_top_n = contributors['Total Posted'].sum()
@@ -87,18 +78,12 @@ def get_top_contributors_custom(scrap_df, start_date, end_date, n_top=10):
     })
     
     # Agregar fila TOTAL
-    total_row = pd.DataFrame({
-        'Lugar': ['TOTAL'],
-        'Número de Parte': [''],
-        'Descripción': [''],
-        'Ubicación': [''],
-        'Cantidad Scrapeada': [contributors['Cantidad Scrapeada'].sum()],
-        'Monto (dls)': [contributors['Monto (dls)'].sum()],
-        '% Acumulado': ['']
+    contributors = append_total_row(contributors, {
+        'Lugar': 'TOTAL',
+        'Cantidad Scrapeada': contributors['Cantidad Scrapeada'].sum(),
+        'Monto (dls)': contributors['Monto (dls)'].sum()
     })
     
-    contributors = pd.concat([contributors, total_row], ignore_index=True)
-    
     return contributors
 
 def get_scrap_reasons_custom(scrap_df, start_date, end_date, n_top=10):
@@ -4,6 +4,7 @@ Calcula métricas clave de scrap rate para visualización en tiempo real
 """
 
 import pandas as pd
+import numpy as np
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
@@ -26,9 +27,13 @@ class WeeklyKPI:
     variance_pct: float  # Diferencia porcentual vs target
     
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DashboardKPIs:
-    """Estructura completa de KPIs para el dashboard"""
+    """
+    Estructura completa de KPIs para el dashboard
+    
+    Inmutable y con __slots__; construir posicionalmente en el orden de declaración.
+    """
     # Semana actual
     current_week: int
     current_year: int
@@ -58,12 +63,13 @@ class DashboardKPIs:
     alerts: List[Dict] = None
     
     def __post_init__(self):
+        # frozen=True bloquea la asignación normal, se usa object.__setattr__
         if self.top_contributors is None:
-            self.top_contributors = []
+            object.__setattr__(self, 'top_contributors', [])
         if self.historical_weeks is None:
-            self.historical_weeks = []
+            object.__setattr__(self, 'historical_weeks', [])
         if self.alerts is None:
-            self.alerts = []
+            object.__setattr__(self, 'alerts', [])
 
 
 def get_current_week_info() -> Tuple[int, int]:
@@ -212,6 +218,52 @@ def calculate_weekly_kpi(scrap_df: pd.DataFrame,
         return None
 
 
+def truncate_descriptions(descriptions: pd.Series, max_len: int = 30) -> List[str]:
+    """
+    Recorta las descripciones largas a max_len caracteres + '...' (vectorizado)
+    
+    Args:
+        descriptions: Serie con las descripciones
+        max_len: Longitud máxima antes de recortar
+        
+    Returns:
+        Lista de descripciones (str) en el mismo orden
+    """
+    desc = descriptions.astype(str).to_numpy(dtype=str)
+    
+    # Solo las que exceden max_len se recortan (astype a <U{max_len} corta el texto)
+    too_long = np.char.str_len(desc) > max_len
+    truncated = np.where(too_long, np.char.add(desc.astype(f'<U{max_len}'), '...'), desc)
+    
+    return truncated.tolist()
+
+
+def contributors_to_records(contributors: pd.DataFrame,
+                            total_scrap: float,
+                            max_len: int = 30) -> List[Dict]:
+    """
+    Convierte los contribuidores agregados a la lista de diccionarios del dashboard
+    
+    Args:
+        contributors: DataFrame con columnas 'Item', 'Description' y 'Total Posted'
+        total_scrap: Scrap total del periodo (para el porcentaje)
+        max_len: Longitud máxima de la descripción
+        
+    Returns:
+        Lista de diccionarios con item, description, amount, percentage
+    """
+    amounts = contributors['Total Posted'].to_numpy()
+    percentages = amounts / total_scrap * 100 if total_scrap > 0 else np.zeros(len(amounts))
+    
+    # to_dict('records') arma los diccionarios sin crear una Serie por fila
+    return pd.DataFrame({
+        'item': contributors['Item'].to_numpy(),
+        'description': truncate_descriptions(contributors['Description'], max_len),
+        'amount': amounts,
+        'percentage': percentages
+    }).to_dict(orient='records')
+
+
 def get_top_contributors_summary(scrap_df: pd.DataFrame, 
                                   week: int, 
                                   year: int, 
@@ -244,7 +296,7 @@ def get_top_contributors_summary(scrap_df: pd.DataFrame,
             return []
         
         # Agrupar por item
-        contributors = scrap_week.groupby('Item', as_index=False).agg({
+        contributors = scrap_week.groupby('Item', as_index=False, observed=True).agg({
             'Description': 'first',
             'Total Posted': 'sum'
         })
@@ -256,15 +308,7 @@ def get_top_contributors_summary(scrap_df: pd.DataFrame,
         # Calcular porcentaje del total
         total_scrap = scrap_week['Total Posted'].sum()
         
-        result = []
-        for _, row in contributors.iterrows():
-            pct = (row['Total Posted'] / total_scrap * 100) if total_scrap > 0 else 0
-            result.append({
-                'item': row['Item'],
-                'description': row['Description'][:30] + '...' if len(row['Description']) > 30 else row['Description'],
-                'amount': row['Total Posted'],
-                'percentage': pct
-            })
+        result = contributors_to_records(contributors, total_scrap)
         
         return result
         
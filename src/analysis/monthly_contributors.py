@@ -2,8 +2,11 @@
 monthly_contributors.py - Análisis de contribuidores mensuales de scrap
 """
 
+import numpy as np
 import pandas as pd
-from config import WEEK_MONTH_MAPPING_2025, get_week_number_vectorized, MONTHS_ES_TO_NUM
+from src.analysis.aggregations import aggregate_top_n, append_total_row, last_value_by_key
+from src.utils.date_cache import get_date_parts, get_fiscal_weeks
+from config import WEEK_MONTH_MAPPING_2025, MONTHS_ES_TO_NUM
 
 
 def get_monthly_contributors(scrap_df, month, year, top_n=10):
@@ -21,67 +24,20 @@ def get_monthly_contributors(scrap_df, month, year, top_n=10):
         DataFrame: DataFrame con los principales contribuidores o None si no hay datos
     """
     
-    # Hacer una copia para no modificar el original
-    scrap_df = scrap_df.copy()
+    # Filas de las semanas fiscales del mes (el original no se modifica)
+    scrap_month = _filter_month_weeks(scrap_df, month, year)
     
-    # Convertir columnas de fecha a datetime
-    scrap_df['Create Date'] = pd.to_datetime(scrap_df['Create Date'])
-    
-    # Agregar columnas de mes, año y semana DOMINGO-SÁBADO (VECTORIZADO)
-    scrap_df['Month'] = scrap_df['Create Date'].dt.month
-    scrap_df['Year'] = scrap_df['Create Date'].dt.year
-    scrap_df['Week'] = get_week_number_vectorized(scrap_df['Create Date'], year=year)
-    
-    # Filtrar por año
-    scrap_year = scrap_df[scrap_df['Year'] == year]
-    
-    # Convertir nombre de mes a número si es string
-    month_num = MONTHS_ES_TO_NUM.get(month, month) if isinstance(month, str) else month
-    
-    # Determinar las semanas del mes usando el mapeo fiscal si está disponible
-    weeks_in_month = None
-    if year == 2025 and WEEK_MONTH_MAPPING_2025 and month_num in WEEK_MONTH_MAPPING_2025:
-        # Usar el mapeo fiscal explícito (eliminar duplicados preservando orden)
-        seen = set()
-        weeks_in_month = []
-        for w in WEEK_MONTH_MAPPING_2025[month_num]:
-            if w not in seen:
-                seen.add(w)
-                weeks_in_month.append(int(w))
-    else:
-        # Fallback: detectar automáticamente las semanas que tocan el mes
-        weeks_in_month = scrap_year[scrap_year['Month'] == month_num]['Week'].unique()
-    
-    if len(weeks_in_month) == 0:
+    if scrap_month is None:
         return None
     
-    # Filtrar todas las filas de esas semanas (incluye días fuera del mes)
-    scrap_month = scrap_year[scrap_year['Week'].isin(weeks_in_month)].copy()
-    
-    if scrap_month.empty:
-        return None
-    
-    # Hacer copia para modificar
-    scrap_month = scrap_month.copy()
-    
-    # Convertir a valores positivos
-    scrap_month['Quantity'] = scrap_month['Quantity'].abs()
-    scrap_month['Total Posted'] = scrap_month['Total Posted'].abs()
-    
-    # AGRUPAR por Item y SUMAR todos los registros del mismo item
-    contributors = scrap_month.groupby('Item', as_index=False).agg({
-        'Description': 'first',
-        # 'Location': 'first',  # Agregar location
-        'Quantity': 'sum',
-        'Total Posted': 'sum'
-    })
-    
-    # ORDENAR por monto total de MAYOR a MENOR
-    contributors = contributors.sort_values('Total Posted', ascending=False)
-    contributors = contributors.reset_index(drop=True)
-    
-    # Tomar solo los top N
-    contributors = contributors.head(top_n)
+    # AGRUPAR por Item, SUMAR valores positivos (abs() dentro de la agregación),
+    # ORDENAR de MAYOR a MENOR y tomar solo los top N
+    contributors = aggregate_top_n(
+        scrap_month, 'Item', top_n,
+        first_cols=('Description',),
+        sum_cols=('Quantity', 'Total Posted'),
+        abs_values=True
+    )
     
     # CALCULAR PORCENTAJE ACUMULADO basado en el TOTAL de los TOP N
     total_top_n = contributors['Total Posted'].sum()
@@ -92,8 +48,7 @@ def get_monthly_contributors(scrap_df, month, year, top_n=10):
 
     # Agregar columna de Ubicación (Location) si existe en el DataFrame original
     if 'Location' in scrap_month.columns:
-        location_map = scrap_month.set_index('Item')['Location'].to_dict()
-        contributors['Location'] = contributors['Item'].map(location_map)
+        contributors['Location'] = last_value_by_key(scrap_month, 'Item', 'Location', contributors['Item'])
     else:
         contributors['Location'] = ''
     
@@ -111,18 +66,11 @@ def get_monthly_contributors(scrap_df, month, year, top_n=10):
     })
     
     # Agregar fila de totales
-    total_row = pd.DataFrame({
-        'Lugar': ['TOTAL'],
-        'Número de Parte': [''],
-        'Descripción': [''],
-        'Cantidad Scrapeada': [''],
-        'Monto (dls)': [contributors['Monto (dls)'].sum()],
-        '% Acumulado': [''],
-        'Ubicación': [''],
+    contributors = append_total_row(contributors, {
+        'Lugar': 'TOTAL',
+        'Monto (dls)': contributors['Monto (dls)'].sum()
     })
     
-    contributors = pd.concat([contributors, total_row], ignore_index=True)
-    
     return contributors
 
 
@@ -147,14 +95,58 @@ def get_monthly_location_contributors(scrap_df, month, year, top_n=10):
     Obtiene las principales celdas/ubicaciones contribuidoras de scrap para un mes específico.
     Usa semanas domingo-sábado según calendario fiscal de NavicoGroup.
     """
-    scrap_df = scrap_df.copy()
-    scrap_df['Create Date'] = pd.to_datetime(scrap_df['Create Date'])
-    scrap_df['Month'] = scrap_df['Create Date'].dt.month
-    scrap_df['Year'] = scrap_df['Create Date'].dt.year
-    scrap_df['Week'] = get_week_number_vectorized(scrap_df['Create Date'], year=year)
+    # Filas de las semanas fiscales del mes (el original no se modifica)
+    scrap_month = _filter_month_weeks(scrap_df, month, year)
+    
+    if scrap_month is None:
+        return None
+    
+    if 'Location' not in scrap_month.columns:
+        return None
+    
+    # Agrupar por Location con valores positivos (abs() dentro de la agregación)
+    location_contrib = aggregate_top_n(scrap_month, 'Location', top_n, abs_values=True)
+    
+    total_posted = location_contrib['Total Posted'].sum()
+    location_contrib['Cumulative %'] = (location_contrib['Total Posted'].cumsum() / total_posted * 100).round(2)
+    
+    location_contrib.insert(0, 'Ranking', range(1, len(location_contrib) + 1))
+    
+    location_contrib = location_contrib.rename(columns={
+        'Location': 'Celda',
+        'Total Posted': 'Monto (dls)',
+        'Cumulative %': '% Acumulado'
+    })
+    
+    location_contrib = append_total_row(location_contrib, {
+        'Ranking': 'TOTAL',
+        'Monto (dls)': location_contrib['Monto (dls)'].sum()
+    })
+    
+    return location_contrib
+
+
+def _filter_month_weeks(scrap_df, month, year):
+    """
+    Filtra las filas de las semanas fiscales (domingo-sábado) que tocan un mes
+    
+    Fecha, mes, año y semana se toman de la caché de fechas, así que la
+    conversión se hace una sola vez por DataFrame aunque se consulten
+    contribuidores por Item y por Location.
+    
+    Args:
+        scrap_df (DataFrame): DataFrame con datos de scrap (no se modifica)
+        month (int | str): Número de mes (1-12) o nombre en español
+        year (int): Año a procesar
+        
+    Returns:
+        DataFrame: Filas de esas semanas (incluye días fuera del mes) o None si no hay datos
+    """
+    date_parts = get_date_parts(scrap_df, 'Create Date')
+    weeks = get_fiscal_weeks(scrap_df, 'Create Date', year).to_numpy()
     
     # Filtrar por año
-    scrap_year = scrap_df[scrap_df['Year'] == year]
+    in_year = date_parts['year'].to_numpy() == year
     
     # Convertir nombre de mes a número si es string
     month_num = MONTHS_ES_TO_NUM.get(month, month) if isinstance(month, str) else month
@@ -171,48 +163,16 @@ def get_monthly_location_contributors(scrap_df, month, year, top_n=10):
                 weeks_in_month.append(int(w))
     else:
         # Fallback: detectar automáticamente las semanas que tocan el mes
-        weeks_in_month = scrap_year[scrap_year['Month'] == month_num]['Week'].unique()
+        in_month = in_year & (date_parts['month'].to_numpy() == month_num)
+        weeks_in_month = pd.unique(weeks[in_month])
     
     if len(weeks_in_month) == 0:
         return None
     
     # Filtrar todas las filas de esas semanas
-    scrap_month = scrap_year[scrap_year['Week'].isin(weeks_in_month)].copy()
+    scrap_month = scrap_df[in_year & np.isin(weeks, weeks_in_month)]
     
     if scrap_month.empty:
         return None
     
-    if 'Location' not in scrap_month.columns:
-        return None
-    
-    scrap_month['Total Posted'] = scrap_month['Total Posted'].abs()
-    
-    location_contrib = scrap_month.groupby('Location', as_index=False).agg({
-        'Total Posted': 'sum'
-    })
-    
-    location_contrib = location_contrib.sort_values('Total Posted', ascending=False)
-    location_contrib = location_contrib.reset_index(drop=True)
-    location_contrib = location_contrib.head(top_n)
-    
-    total_posted = location_contrib['Total Posted'].sum()
-    location_contrib['Cumulative %'] = (location_contrib['Total Posted'].cumsum() / total_posted * 100).round(2)
-    
-    location_contrib.insert(0, 'Ranking', range(1, len(location_contrib) + 1))
-    
-    location_contrib = location_contrib.rename(columns={
-        'Location': 'Celda',
-        'Total Posted': 'Monto (dls)',
-        'Cumulative %': '% Acumulado'
-    })
-    
-    total_row = pd.DataFrame({
-        'Ranking': ['TOTAL'],
-        'Celda': [''],
-        'Monto (dls)': [location_contrib['Monto (dls)'].sum()],
-        '% Acumulado': ['']
-    })
-    
-    location_contrib = pd.concat([location_contrib, total_row], ignore_index=True)
-    
-    return location_contrib
\ No newline at end of file
+    return scrap_month
@@ -85,7 +85,8 @@ def compare_weekly_periods(scrap_df: pd.DataFrame, ventas_df: pd.DataFrame,
     ventas_df['Create Date'] = pd.to_datetime(ventas_df['Create Date'])
     horas_df['Trans Date'] = pd.to_datetime(horas_df['Trans Date'])
     
-    scrap_df['Total Posted'] = scrap_df['Total Posted'] * -1
+    # Convertir scrap a positivo usando valor absoluto (igual que process_weekly_data)
+    scrap_df['Total Posted'] = scrap_df['Total Posted'].abs()
     
     # Agregar semanas
     scrap_df['Week'] = get_week_number_vectorized(scrap_df['Create Date'], year=year)
@@ -4,15 +4,48 @@ Extiende kpi_calculator.py para soportar mes, trimestre, año y rangos personali
 """
 
 import pandas as pd
+import numpy as np
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from config import TARGET_WEEK_RATES, TARGET_RATES, get_week_number_vectorized
-from src.analysis.kpi_calculator import DashboardKPIs, WeeklyKPI, get_top_contributors_summary
+from src.analysis.kpi_calculator import (DashboardKPIs, WeeklyKPI, get_top_contributors_summary,
+                                         truncate_descriptions, contributors_to_records)
+from src.analysis.aggregations import aggregate_top_n
+from src.utils.date_cache import get_parsed_dates, get_week_rows
 
 logger = logging.getLogger(__name__)
 
+# Meses de cada trimestre (índice = número de trimestre, 0 sin uso)
+_QUARTER_MONTHS = (
+    None,
+    np.array([1, 2, 3], dtype=np.int8),
+    np.array([4, 5, 6], dtype=np.int8),
+    np.array([7, 8, 9], dtype=np.int8),
+    np.array([10, 11, 12], dtype=np.int8)
+)
+
+# Primer mes de cada trimestre (índice = número de trimestre, 0 sin uso)
+_QUARTER_START_MONTH = (0, 1, 4, 7, 10)
+
+# Nombres de meses para labels (índice = número de mes - 1)
+_MONTH_NAMES_ES = ("Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
+                   "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre")
+_MONTH_ABBR_ES = ("Ene", "Feb", "Mar", "Abr", "May", "Jun",
+                  "Jul", "Ago", "Sep", "Oct", "Nov", "Dic")
+
+# Caché LRU de resultados top items/locations: (tipo, id df, huella, periodo, top_n) -> lista
+_TOP_CACHE_MAXSIZE = 64
+_top_cache: "OrderedDict[tuple, List[Dict]]" = OrderedDict()
+# El dashboard se calcula en DashboardLoadThread y en el hilo de la UI
+_top_cache_lock = threading.Lock()
+
+# Target rate por mes (índice = número de mes, 0 sin uso)
+_TARGET_RATES_ARR = np.array([0.50] + [TARGET_RATES.get(m, 0.50) for m in range(1, 13)], dtype=np.float64)
+
 
 def calculate_period_kpis(scrap_df: pd.DataFrame,
                           ventas_df: pd.DataFrame,
@@ -59,6 +92,158 @@ def calculate_period_kpis(scrap_df: pd.DataFrame,
         return None
 
 
+def _calculate_changes(current: Tuple[float, float, float],
+                       previous: Tuple[float, float, float]) -> Tuple[Optional[float], Optional[float], Optional[float], str]:
+    """
+    Calcula los cambios porcentuales (rate, scrap, horas) y la dirección de tendencia
+    
+    Args:
+        current: Tupla (scrap_rate, total_scrap, total_hours) del periodo actual
+        previous: Tupla (scrap_rate, total_scrap, total_hours) del periodo anterior
+    
+    Returns:
+        Tuple: (rate_change_pct, scrap_change_pct, hours_change_pct, trend_direction)
+    """
+    # Convertir a arrays para dividir los tres valores en una sola operación
+    current_arr = np.array(current, dtype=np.float64)
+    prev_arr = np.array(previous, dtype=np.float64)
+    
+    # Dividir solo donde el periodo anterior es > 0, el resto queda como NaN
+    changes = np.divide(current_arr - prev_arr, prev_arr, out=np.full(3, np.nan), where=prev_arr > 0) * 100
+    
+    # Tendencia según el cambio del rate (NaN cae en "neutral")
+    trend_direction = np.select(
+        [changes[0] < -2, changes[0] > 2],
+        ['improving', 'deteriorating'],
+        default='neutral'
+    ).item()
+    
+    # NaN significa que no hay periodo anterior válido
+    rate_change_pct, scrap_change_pct, hours_change_pct = (None if np.isnan(c) else c for c in changes)
+    
+    return rate_change_pct, scrap_change_pct, hours_change_pct, trend_direction
+
+
+def _historical_rates(scrap_sums: np.ndarray,
+                      hours_sums: np.ndarray,
+                      targets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula scrap rate y variance vs target de todos los periodos históricos a la vez
+    
+    Args:
+        scrap_sums: Scrap total de cada periodo
+        hours_sums: Horas totales de cada periodo
+        targets: Target rate de cada periodo
+    
+    Returns:
+        Tuple: (rates, variance_pcts); 0 donde no hay horas o target
+    """
+    # División sin ramas: solo donde el denominador es > 0, el resto queda en 0
+    rates = np.divide(scrap_sums, hours_sums, out=np.zeros(len(scrap_sums)), where=hours_sums > 0)
+    variance_pcts = np.divide(rates - targets, targets, out=np.zeros(len(rates)), where=targets > 0) * 100
+    return rates, variance_pcts
+
+
+def _month_range(year: int, month: int, num_months: int = 1) -> Tuple[np.datetime64, np.datetime64]:
+    """
+    Rango [inicio, fin) de uno o varios meses consecutivos
+    
+    Args:
+        year: Año del primer mes
+        month: Primer mes (1-12)
+        num_months: Número de meses del rango (1=mes, 3=trimestre, 12=año)
+    
+    Returns:
+        Tuple[np.datetime64, np.datetime64]: (primer día del rango, primer día después del rango)
+    """
+    start = np.datetime64(f'{year:04d}-{month:02d}', 'M')
+    return start, start + num_months
+
+
+def _date_range_mask(dates: pd.Series, start: np.datetime64, end: np.datetime64) -> np.ndarray:
+    """
+    Máscara de fechas dentro de [start, end) comparando su valor int64 subyacente
+    
+    Args:
+        dates: Serie datetime
+        start: Inicio del rango (incluido)
+        end: Fin del rango (excluido)
+    
+    Returns:
+        np.ndarray: Máscara booleana (NaT nunca queda dentro del rango)
+    """
+    # Nanosegundos desde epoch; NaT es el int64 mínimo y queda fuera de cualquier rango
+    values = dates.to_numpy(dtype='datetime64[ns]').view('i8')
+    lo = start.astype('datetime64[ns]').astype(np.int64)
+    hi = end.astype('datetime64[ns]').astype(np.int64)
+    return (values >= lo) & (values < hi)
+
+
+def _sum_by_periods(dates: pd.Series,
+                    values: pd.Series,
+                    first_period: np.datetime64,
+                    months_per_period: int,
+                    num_periods: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Suma valores por periodos consecutivos en una sola pasada sobre los datos ordenados
+    
+    Args:
+        dates: Serie datetime con la fecha de cada registro
+        values: Serie numérica a sumar
+        first_period: Mes de inicio del primer periodo (datetime64[M])
+        months_per_period: Meses por periodo (1=mes, 3=trimestre, 12=año)
+        num_periods: Cantidad de periodos consecutivos
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (suma por periodo, registros por periodo)
+    """
+    # Límites de los periodos: inicio de cada uno + fin del último
+    boundaries = np.arange(num_periods + 1) * months_per_period + first_period
+    boundaries = boundaries.astype('datetime64[ns]')
+    
+    return _sum_in_ranges(dates, values, boundaries[:-1], boundaries[1:])
+
+
+def _sum_in_ranges(dates: pd.Series,
+                   values: pd.Series,
+                   starts: np.ndarray,
+                   ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Suma valores dentro de rangos de fecha [inicio, fin) en una sola pasada
+    
+    Args:
+        dates: Serie datetime con la fecha de cada registro
+        values: Serie numérica a sumar
+        starts: Inicio de cada rango (datetime64[ns], incluido)
+        ends: Fin de cada rango (datetime64[ns], excluido)
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (suma por rango, registros por rango)
+    """
+    # Ordenar fechas y valores por fecha (NaN se suma como 0, igual que pandas)
+    date_arr = dates.to_numpy(dtype='datetime64[ns]')
+    order = np.argsort(date_arr, kind='stable')
+    sorted_dates = date_arr[order]
+    sorted_values = np.nan_to_num(values.to_numpy(dtype=np.float64)[order])
+    
+    # Posición de inicio y fin de cada rango dentro de las fechas ordenadas
+    lo = np.searchsorted(sorted_dates, starts, side='left')
+    hi = np.searchsorted(sorted_dates, ends, side='left')
+    counts = np.maximum(hi - lo, 0)
+    
+    # Sumar todos los rangos con un solo reduceat sobre índices intercalados [lo0, hi0, lo1, hi1, ...]
+    # (centinela 0 al final para que un índice == len sea válido)
+    bounds = np.empty(2 * len(lo), dtype=np.intp)
+    bounds[0::2] = lo
+    bounds[1::2] = hi
+    sums = np.add.reduceat(np.append(sorted_values, 0.0), bounds)[0::2]
+    
+    # reduceat devuelve un elemento suelto en rangos vacíos, se fuerzan a 0
+    sums = np.where(counts > 0, sums, 0.0)
+    
+    return sums, counts
+
+
 def _calculate_week_kpis(scrap_df: pd.DataFrame,
                          ventas_df: pd.DataFrame,
                          horas_df: pd.DataFrame,
@@ -88,26 +273,12 @@ def _calculate_week_kpis(scrap_df: pd.DataFrame,
         prev_year = year if week > 1 else year - 1
         prev_kpi = calculate_weekly_kpi(scrap_df, ventas_df, horas_df, prev_week, prev_year)
         
-        # Calcular cambio y dirección
+        # Calcular cambio y dirección (sin semana anterior no hay cambios)
         prev_week_rate = prev_kpi.scrap_rate if prev_kpi else None
-        rate_change_pct = None
-        scrap_change_pct = None
-        hours_change_pct = None
-        trend_direction = "neutral"
-        
-        if prev_kpi:
-            if prev_week_rate and prev_week_rate > 0:
-                rate_change_pct = ((current_kpi.scrap_rate - prev_week_rate) / prev_week_rate) * 100
-                if rate_change_pct < -2:
-                    trend_direction = "improving"
-                elif rate_change_pct > 2:
-                    trend_direction = "deteriorating"
-            
-            if prev_kpi.total_scrap > 0:
-                scrap_change_pct = ((current_kpi.total_scrap - prev_kpi.total_scrap) / prev_kpi.total_scrap) * 100
-            
-            if prev_kpi.total_hours > 0:
-                hours_change_pct = ((current_kpi.total_hours - prev_kpi.total_hours) / prev_kpi.total_hours) * 100
+        rate_change_pct, scrap_change_pct, hours_change_pct, trend_direction = _calculate_changes(
+            (current_kpi.scrap_rate, current_kpi.total_scrap, current_kpi.total_hours),
+            (prev_kpi.scrap_rate, prev_kpi.total_scrap, prev_kpi.total_hours) if prev_kpi else (0, 0, 0)
+        )
         
         # Calcular total de ventas
         ventas_df_copy = ventas_df.copy()
@@ -127,24 +298,24 @@ def _calculate_week_kpis(scrap_df: pd.DataFrame,
         alerts = generate_alerts(current_kpi, historical)
         
         return DashboardKPIs(
-            current_week=current_kpi.week,
-            current_year=current_kpi.year,
-            current_scrap_rate=current_kpi.scrap_rate,
-            current_total_scrap=current_kpi.total_scrap,
-            current_total_hours=current_kpi.total_hours,
-            current_target=current_kpi.target_rate,
-            meets_target=current_kpi.meets_target,
-            variance_pct=current_kpi.variance_pct,
-            previous_week_rate=prev_week_rate,
-            rate_change_pct=rate_change_pct,
-            trend_direction=trend_direction,
-            scrap_change_pct=scrap_change_pct,
-            hours_change_pct=hours_change_pct,
-            total_sales=total_sales,
-            period_label="semana",
-            top_contributors=top_contributors,
-            historical_weeks=historical,
-            alerts=alerts
+            current_kpi.week,  # current_week
+            current_kpi.year,  # current_year
+            current_kpi.scrap_rate,  # current_scrap_rate
+            current_kpi.total_scrap,  # current_total_scrap
+            current_kpi.total_hours,  # current_total_hours
+            current_kpi.target_rate,  # current_target
+            current_kpi.meets_target,  # meets_target
+            current_kpi.variance_pct,  # variance_pct
+            prev_week_rate,  # previous_week_rate
+            rate_change_pct,  # rate_change_pct
+            trend_direction,  # trend_direction
+            scrap_change_pct,  # scrap_change_pct
+            hours_change_pct,  # hours_change_pct
+            total_sales,  # total_sales
+            "semana",  # period_label
+            top_contributors,  # top_contributors
+            historical,  # historical_weeks
+            alerts  # alerts
         )
 
 
@@ -171,9 +342,10 @@ def _calculate_month_kpis(scrap_df: pd.DataFrame,
         scrap_df['Total Posted'] = abs(scrap_df['Total Posted'])
         
         # Filtrar por mes
-        scrap_month = scrap_df[(scrap_df['Create Date'].dt.month == month) & (scrap_df['Create Date'].dt.year == year)]
-        ventas_month = ventas_df[(ventas_df['Create Date'].dt.month == month) & (ventas_df['Create Date'].dt.year == year)]
-        horas_month = horas_df[(horas_df['Trans Date'].dt.month == month) & (horas_df['Trans Date'].dt.year == year)]
+        month_start, month_end = _month_range(year, month)
+        scrap_month = scrap_df[_date_range_mask(scrap_df['Create Date'], month_start, month_end)]
+        ventas_month = ventas_df[_date_range_mask(ventas_df['Create Date'], month_start, month_end)]
+        horas_month = horas_df[_date_range_mask(horas_df['Trans Date'], month_start, month_end)]
         
         if scrap_month.empty and horas_month.empty:
             logger.warning(f"No hay datos para el mes {month}/{year}")
@@ -194,55 +366,41 @@ def _calculate_month_kpis(scrap_df: pd.DataFrame,
         prev_month = month - 1 if month > 1 else 12
         prev_year = year if month > 1 else year - 1
         
-        scrap_prev = scrap_df[(scrap_df['Create Date'].dt.month == prev_month) & (scrap_df['Create Date'].dt.year == prev_year)]
-        horas_prev = horas_df[(horas_df['Trans Date'].dt.month == prev_month) & (horas_df['Trans Date'].dt.year == prev_year)]
-        ventas_prev = ventas_df[(ventas_df['Create Date'].dt.month == prev_month) & (ventas_df['Create Date'].dt.year == prev_year)]
+        prev_start, prev_end = _month_range(prev_year, prev_month)
+        scrap_prev = scrap_df[_date_range_mask(scrap_df['Create Date'], prev_start, prev_end)]
+        horas_prev = horas_df[_date_range_mask(horas_df['Trans Date'], prev_start, prev_end)]
+        ventas_prev = ventas_df[_date_range_mask(ventas_df['Create Date'], prev_start, prev_end)]
         
         prev_total_scrap = scrap_prev['Total Posted'].sum()
         prev_total_hours = horas_prev['Actual Hours'].sum()
         prev_scrap_rate = prev_total_scrap / prev_total_hours if prev_total_hours > 0 else 0
         
         # Calcular cambios
-        rate_change_pct = None
-        scrap_change_pct = None
-        hours_change_pct = None
-        trend_direction = "neutral"
-        
-        if prev_scrap_rate > 0:
-            rate_change_pct = ((scrap_rate - prev_scrap_rate) / prev_scrap_rate) * 100
-            if rate_change_pct < -2:
-                trend_direction = "improving"
-            elif rate_change_pct > 2:
-                trend_direction = "deteriorating"
-        
-        if prev_total_scrap > 0:
-            scrap_change_pct = ((total_scrap - prev_total_scrap) / prev_total_scrap) * 100
-        
-        if prev_total_hours > 0:
-            hours_change_pct = ((total_hours - prev_total_hours) / prev_total_hours) * 100
+        rate_change_pct, scrap_change_pct, hours_change_pct, trend_direction = _calculate_changes(
+            (scrap_rate, total_scrap, total_hours),
+            (prev_scrap_rate, prev_total_scrap, prev_total_hours)
+        )
         
         # Top contributors del mes
         if not scrap_month.empty:
-            contributors = scrap_month.groupby('Item', as_index=False).agg({
+            contributors = scrap_month.groupby('Item', as_index=False, observed=True).agg({
                 'Description': 'first',
                 'Total Posted': 'sum'
             })
             contributors = contributors.sort_values('Total Posted', ascending=False).head(3)
             
             total_scrap_month = scrap_month['Total Posted'].sum()
-            top_contributors = []
-            for _, row in contributors.iterrows():
-                pct = (row['Total Posted'] / total_scrap_month * 100) if total_scrap_month > 0 else 0
-                top_contributors.append({
-                    'item': row['Item'],
-                    'description': row['Description'][:30] + '...' if len(row['Description']) > 30 else row['Description'],
-                    'amount': row['Total Posted'],
-                    'percentage': pct
-                })
+            top_contributors = contributors_to_records(contributors, total_scrap_month)
         else:
             top_contributors = []
         
-        # Tendencia histórica (últimos 6 meses)
+        # Tendencia histórica (últimos 6 meses), sumados en una sola pasada
+        first_month = np.datetime64(f'{year:04d}-{month:02d}', 'M') - 5
+        hist_scrap_sums, hist_scrap_counts = _sum_by_periods(scrap_df['Create Date'], scrap_df['Total Posted'], first_month, 1, 6)
+        hist_hours_sums, hist_hours_counts = _sum_by_periods(horas_df['Trans Date'], horas_df['Actual Hours'], first_month, 1, 6)
+        hist_month_nums = (np.arange(month - 5, month + 1) - 1) % 12 + 1
+        hist_rates, hist_variances = _historical_rates(hist_scrap_sums, hist_hours_sums, _TARGET_RATES_ARR[hist_month_nums])
+        
         historical = []
         for i in range(5, -1, -1):
             hist_month = month - i
@@ -251,24 +409,21 @@ def _calculate_month_kpis(scrap_df: pd.DataFrame,
                 hist_month += 12
                 hist_year -= 1
             
-            hist_scrap = scrap_df[(scrap_df['Create Date'].dt.month == hist_month) & (scrap_df['Create Date'].dt.year == hist_year)]
-            hist_horas = horas_df[(horas_df['Trans Date'].dt.month == hist_month) & (horas_df['Trans Date'].dt.year == hist_year)]
+            # Índice del periodo dentro de los arrays (0 = más antiguo)
+            pos = 5 - i
             
-            if not hist_scrap.empty or not hist_horas.empty:
-                hist_total_scrap = hist_scrap['Total Posted'].sum()
-                hist_total_hours = hist_horas['Actual Hours'].sum()
-                hist_rate = hist_total_scrap / hist_total_hours if hist_total_hours > 0 else 0
+            if hist_scrap_counts[pos] > 0 or hist_hours_counts[pos] > 0:
                 hist_target = TARGET_RATES.get(hist_month, 0.50)
                 
                 historical.append(WeeklyKPI(
                     week=hist_month,  # Usamos month como week para compatibilidad
                     year=hist_year,
-                    scrap_rate=hist_rate,
-                    total_scrap=hist_total_scrap,
-                    total_hours=hist_total_hours,
+                    scrap_rate=hist_rates[pos],
+                    total_scrap=hist_scrap_sums[pos],
+                    total_hours=hist_hours_sums[pos],
                     target_rate=hist_target,
-                    meets_target=hist_rate <= hist_target,
-                    variance_pct=((hist_rate - hist_target) / hist_target * 100) if hist_target > 0 else 0
+                    meets_target=hist_rates[pos] <= hist_target,
+                    variance_pct=hist_variances[pos]
                 ))
         
         # Alertas básicas
@@ -282,24 +437,24 @@ def _calculate_month_kpis(scrap_df: pd.DataFrame,
             })
         
         return DashboardKPIs(
-            current_week=month,  # Usamos month como week
-            current_year=year,
-            current_scrap_rate=scrap_rate,
-            current_total_scrap=total_scrap,
-            current_total_hours=total_hours,
-            current_target=target_rate,
-            meets_target=meets_target,
-            variance_pct=variance_pct,
-            previous_week_rate=prev_scrap_rate,
-            rate_change_pct=rate_change_pct,
-            trend_direction=trend_direction,
-            scrap_change_pct=scrap_change_pct,
-            hours_change_pct=hours_change_pct,
-            total_sales=total_sales,
-            period_label="mes",
-            top_contributors=top_contributors,
-            historical_weeks=historical,
-            alerts=alerts
+            month,  # Usamos month como week (current_week)
+            year,  # current_year
+            scrap_rate,  # current_scrap_rate
+            total_scrap,  # current_total_scrap
+            total_hours,  # current_total_hours
+            target_rate,  # current_target
+            meets_target,  # meets_target
+            variance_pct,  # variance_pct
+            prev_scrap_rate,  # previous_week_rate
+            rate_change_pct,  # rate_change_pct
+            trend_direction,  # trend_direction
+            scrap_change_pct,  # scrap_change_pct
+            hours_change_pct,  # hours_change_pct
+            total_sales,  # total_sales
+            "mes",  # period_label
+            top_contributors,  # top_contributors
+            historical,  # historical_weeks
+            alerts  # alerts
         )
         
     except Exception as e:
@@ -317,13 +472,7 @@ def _calculate_quarter_kpis(scrap_df: pd.DataFrame,
         year = period_config["year"]
         
         # Meses del trimestre
-        quarter_months = {
-            1: [1, 2, 3],
-            2: [4, 5, 6],
-            3: [7, 8, 9],
-            4: [10, 11, 12]
-        }
-        months = quarter_months[quarter]
+        months = _QUARTER_MONTHS[quarter]
         
         logger.info(f"Calculando KPIs para Q{quarter}/{year}")
         
@@ -339,9 +488,10 @@ def _calculate_quarter_kpis(scrap_df: pd.DataFrame,
         scrap_df['Total Posted'] = abs(scrap_df['Total Posted'])
         
         # Filtrar por trimestre
-        scrap_quarter = scrap_df[(scrap_df['Create Date'].dt.month.isin(months)) & (scrap_df['Create Date'].dt.year == year)]
-        ventas_quarter = ventas_df[(ventas_df['Create Date'].dt.month.isin(months)) & (ventas_df['Create Date'].dt.year == year)]
-        horas_quarter = horas_df[(horas_df['Trans Date'].dt.month.isin(months)) & (horas_df['Trans Date'].dt.year == year)]
+        quarter_start, quarter_end = _month_range(year, _QUARTER_START_MONTH[quarter], 3)
+        scrap_quarter = scrap_df[_date_range_mask(scrap_df['Create Date'], quarter_start, quarter_end)]
+        ventas_quarter = ventas_df[_date_range_mask(ventas_df['Create Date'], quarter_start, quarter_end)]
+        horas_quarter = horas_df[_date_range_mask(horas_df['Trans Date'], quarter_start, quarter_end)]
         
         if scrap_quarter.empty and horas_quarter.empty:
             logger.warning(f"No hay datos para Q{quarter}/{year}")
@@ -354,56 +504,49 @@ def _calculate_quarter_kpis(scrap_df: pd.DataFrame,
         scrap_rate = total_scrap / total_hours if total_hours > 0 else 0
         
         # Target del trimestre (promedio de los meses)
-        target_rate = sum(TARGET_RATES.get(m, 0.50) for m in months) / 3
+        target_rate = float(np.take(_TARGET_RATES_ARR, months).mean())
         variance_pct = ((scrap_rate - target_rate) / target_rate * 100) if target_rate > 0 else 0
         meets_target = scrap_rate <= target_rate
         
         # Trimestre anterior
         prev_quarter = quarter - 1 if quarter > 1 else 4
         prev_year = year if quarter > 1 else year - 1
-        prev_months = quarter_months[prev_quarter]
         
-        scrap_prev = scrap_df[(scrap_df['Create Date'].dt.month.isin(prev_months)) & (scrap_df['Create Date'].dt.year == prev_year)]
-        horas_prev = horas_df[(horas_df['Trans Date'].dt.month.isin(prev_months)) & (horas_df['Trans Date'].dt.year == prev_year)]
+        prev_start, prev_end = _month_range(prev_year, _QUARTER_START_MONTH[prev_quarter], 3)
+        scrap_prev = scrap_df[_date_range_mask(scrap_df['Create Date'], prev_start, prev_end)]
+        horas_prev = horas_df[_date_range_mask(horas_df['Trans Date'], prev_start, prev_end)]
         
         prev_total_scrap = scrap_prev['Total Posted'].sum()
         prev_total_hours = horas_prev['Actual Hours'].sum()
         prev_scrap_rate = prev_total_scrap / prev_total_hours if prev_total_hours > 0 else 0
         
         # Calcular cambios
-        rate_change_pct = ((scrap_rate - prev_scrap_rate) / prev_scrap_rate * 100) if prev_scrap_rate > 0 else None
-        scrap_change_pct = ((total_scrap - prev_total_scrap) / prev_total_scrap * 100) if prev_total_scrap > 0 else None
-        hours_change_pct = ((total_hours - prev_total_hours) / prev_total_hours * 100) if prev_total_hours > 0 else None
-        
-        trend_direction = "neutral"
-        if rate_change_pct:
-            if rate_change_pct < -2:
-                trend_direction = "improving"
-            elif rate_change_pct > 2:
-                trend_direction = "deteriorating"
+        rate_change_pct, scrap_change_pct, hours_change_pct, trend_direction = _calculate_changes(
+            (scrap_rate, total_scrap, total_hours),
+            (prev_scrap_rate, prev_total_scrap, prev_total_hours)
+        )
         
         # Top contributors
         if not scrap_quarter.empty:
-            contributors = scrap_quarter.groupby('Item', as_index=False).agg({
+            contributors = scrap_quarter.groupby('Item', as_index=False, observed=True).agg({
                 'Description': 'first',
                 'Total Posted': 'sum'
             })
             contributors = contributors.sort_values('Total Posted', ascending=False).head(3)
             
             total_scrap_q = scrap_quarter['Total Posted'].sum()
-            top_contributors = []
-            for _, row in contributors.iterrows():
-                pct = (row['Total Posted'] / total_scrap_q * 100) if total_scrap_q > 0 else 0
-                top_contributors.append({
-                    'item': row['Item'],
-                    'description': row['Description'][:30] + '...' if len(row['Description']) > 30 else row['Description'],
-                    'amount': row['Total Posted'],
-                    'percentage': pct
-                })
+            top_contributors = contributors_to_records(contributors, total_scrap_q)
         else:
             top_contributors = []
         
-        # Tendencia histórica (últimos 4 trimestres)
+        # Tendencia histórica (últimos 4 trimestres), sumados en una sola pasada
+        first_month = np.datetime64(f'{year:04d}-{_QUARTER_START_MONTH[quarter]:02d}', 'M') - 9
+        hist_scrap_sums, hist_scrap_counts = _sum_by_periods(scrap_df['Create Date'], scrap_df['Total Posted'], first_month, 3, 4)
+        hist_hours_sums, hist_hours_counts = _sum_by_periods(horas_df['Trans Date'], horas_df['Actual Hours'], first_month, 3, 4)
+        hist_quarter_nums = (np.arange(quarter - 3, quarter + 1) - 1) % 4 + 1
+        hist_targets = np.array([np.take(_TARGET_RATES_ARR, _QUARTER_MONTHS[q]).mean() for q in hist_quarter_nums])
+        hist_rates, hist_variances = _historical_rates(hist_scrap_sums, hist_hours_sums, hist_targets)
+        
         historical = []
         for i in range(3, -1, -1):
             hist_q = quarter - i
@@ -412,25 +555,21 @@ def _calculate_quarter_kpis(scrap_df: pd.DataFrame,
                 hist_q += 4
                 hist_year -= 1
             
-            hist_months = quarter_months[hist_q]
-            hist_scrap = scrap_df[(scrap_df['Create Date'].dt.month.isin(hist_months)) & (scrap_df['Create Date'].dt.year == hist_year)]
-            hist_horas = horas_df[(horas_df['Trans Date'].dt.month.isin(hist_months)) & (horas_df['Trans Date'].dt.year == hist_year)]
+            # Índice del periodo dentro de los arrays (0 = más antiguo)
+            pos = 3 - i
             
-            if not hist_scrap.empty or not hist_horas.empty:
-                hist_total_scrap = hist_scrap['Total Posted'].sum()
-                hist_total_hours = hist_horas['Actual Hours'].sum()
-                hist_rate = hist_total_scrap / hist_total_hours if hist_total_hours > 0 else 0
-                hist_target = sum(TARGET_RATES.get(m, 0.50) for m in hist_months) / 3
+            if hist_scrap_counts[pos] > 0 or hist_hours_counts[pos] > 0:
+                hist_target = float(hist_targets[pos])
                 
                 historical.append(WeeklyKPI(
                     week=hist_q,
                     year=hist_year,
-                    scrap_rate=hist_rate,
-                    total_scrap=hist_total_scrap,
-                    total_hours=hist_total_hours,
+                    scrap_rate=hist_rates[pos],
+                    total_scrap=hist_scrap_sums[pos],
+                    total_hours=hist_hours_sums[pos],
                     target_rate=hist_target,
-                    meets_target=hist_rate <= hist_target,
-                    variance_pct=((hist_rate - hist_target) / hist_target * 100) if hist_target > 0 else 0
+                    meets_target=hist_rates[pos] <= hist_target,
+                    variance_pct=hist_variances[pos]
                 ))
         
         # Alertas
@@ -444,24 +583,24 @@ def _calculate_quarter_kpis(scrap_df: pd.DataFrame,
             })
         
         return DashboardKPIs(
-            current_week=quarter,
-            current_year=year,
-            current_scrap_rate=scrap_rate,
-            current_total_scrap=total_scrap,
-            current_total_hours=total_hours,
-            current_target=target_rate,
-            meets_target=meets_target,
-            variance_pct=variance_pct,
-            previous_week_rate=prev_scrap_rate,
-            rate_change_pct=rate_change_pct,
-            trend_direction=trend_direction,
-            scrap_change_pct=scrap_change_pct,
-            hours_change_pct=hours_change_pct,
-            total_sales=total_sales,
-            period_label="trimestre",
-            top_contributors=top_contributors,
-            historical_weeks=historical,
-            alerts=alerts
+            quarter,  # current_week
+            year,  # current_year
+            scrap_rate,  # current_scrap_rate
+            total_scrap,  # current_total_scrap
+            total_hours,  # current_total_hours
+            target_rate,  # current_target
+            meets_target,  # meets_target
+            variance_pct,  # variance_pct
+            prev_scrap_rate,  # previous_week_rate
+            rate_change_pct,  # rate_change_pct
+            trend_direction,  # trend_direction
+            scrap_change_pct,  # scrap_change_pct
+            hours_change_pct,  # hours_change_pct
+            total_sales,  # total_sales
+            "trimestre",  # period_label
+            top_contributors,  # top_contributors
+            historical,  # historical_weeks
+            alerts  # alerts
         )
         
     except Exception as e:
@@ -491,9 +630,10 @@ def _calculate_year_kpis(scrap_df: pd.DataFrame,
         scrap_df['Total Posted'] = abs(scrap_df['Total Posted'])
         
         # Filtrar por año
-        scrap_year = scrap_df[scrap_df['Create Date'].dt.year == year]
-        ventas_year = ventas_df[ventas_df['Create Date'].dt.year == year]
-        horas_year = horas_df[horas_df['Trans Date'].dt.year == year]
+        year_start, year_end = _month_range(year, 1, 12)
+        scrap_year = scrap_df[_date_range_mask(scrap_df['Create Date'], year_start, year_end)]
+        ventas_year = ventas_df[_date_range_mask(ventas_df['Create Date'], year_start, year_end)]
+        horas_year = horas_df[_date_range_mask(horas_df['Trans Date'], year_start, year_end)]
         
         if scrap_year.empty and horas_year.empty:
             logger.warning(f"No hay datos para el año {year}")
@@ -512,68 +652,56 @@ def _calculate_year_kpis(scrap_df: pd.DataFrame,
         
         # Año anterior
         prev_year = year - 1
-        scrap_prev = scrap_df[scrap_df['Create Date'].dt.year == prev_year]
-        horas_prev = horas_df[horas_df['Trans Date'].dt.year == prev_year]
+        prev_start, prev_end = _month_range(prev_year, 1, 12)
+        scrap_prev = scrap_df[_date_range_mask(scrap_df['Create Date'], prev_start, prev_end)]
+        horas_prev = horas_df[_date_range_mask(horas_df['Trans Date'], prev_start, prev_end)]
         
         prev_total_scrap = scrap_prev['Total Posted'].sum()
         prev_total_hours = horas_prev['Actual Hours'].sum()
         prev_scrap_rate = prev_total_scrap / prev_total_hours if prev_total_hours > 0 else 0
         
         # Calcular cambios
-        rate_change_pct = ((scrap_rate - prev_scrap_rate) / prev_scrap_rate * 100) if prev_scrap_rate > 0 else None
-        scrap_change_pct = ((total_scrap - prev_total_scrap) / prev_total_scrap * 100) if prev_total_scrap > 0 else None
-        hours_change_pct = ((total_hours - prev_total_hours) / prev_total_hours * 100) if prev_total_hours > 0 else None
-        
-        trend_direction = "neutral"
-        if rate_change_pct:
-            if rate_change_pct < -2:
-                trend_direction = "improving"
-            elif rate_change_pct > 2:
-                trend_direction = "deteriorating"
+        rate_change_pct, scrap_change_pct, hours_change_pct, trend_direction = _calculate_changes(
+            (scrap_rate, total_scrap, total_hours),
+            (prev_scrap_rate, prev_total_scrap, prev_total_hours)
+        )
         
         # Top contributors del año
         if not scrap_year.empty:
-            contributors = scrap_year.groupby('Item', as_index=False).agg({
+            contributors = scrap_year.groupby('Item', as_index=False, observed=True).agg({
                 'Description': 'first',
                 'Total Posted': 'sum'
             })
             contributors = contributors.sort_values('Total Posted', ascending=False).head(3)
             
             total_scrap_y = scrap_year['Total Posted'].sum()
-            top_contributors = []
-            for _, row in contributors.iterrows():
-                pct = (row['Total Posted'] / total_scrap_y * 100) if total_scrap_y > 0 else 0
-                top_contributors.append({
-                    'item': row['Item'],
-                    'description': row['Description'][:30] + '...' if len(row['Description']) > 30 else row['Description'],
-                    'amount': row['Total Posted'],
-                    'percentage': pct
-                })
+            top_contributors = contributors_to_records(contributors, total_scrap_y)
         else:
             top_contributors = []
         
-        # Tendencia histórica (últimos 3 años)
+        # Tendencia histórica (últimos 3 años), sumados en una sola pasada
+        first_month = np.datetime64(f'{year - 2:04d}-01', 'M')
+        hist_scrap_sums, hist_scrap_counts = _sum_by_periods(scrap_df['Create Date'], scrap_df['Total Posted'], first_month, 12, 3)
+        hist_hours_sums, hist_hours_counts = _sum_by_periods(horas_df['Trans Date'], horas_df['Actual Hours'], first_month, 12, 3)
+        hist_rates, hist_variances = _historical_rates(hist_scrap_sums, hist_hours_sums, np.full(3, 0.50))
+        
         historical = []
         for i in range(2, -1, -1):
             hist_year = year - i
             
-            hist_scrap = scrap_df[scrap_df['Create Date'].dt.year == hist_year]
-            hist_horas = horas_df[horas_df['Trans Date'].dt.year == hist_year]
+            # Índice del periodo dentro de los arrays (0 = más antiguo)
+            pos = 2 - i
             
-            if not hist_scrap.empty or not hist_horas.empty:
-                hist_total_scrap = hist_scrap['Total Posted'].sum()
-                hist_total_hours = hist_horas['Actual Hours'].sum()
-                hist_rate = hist_total_scrap / hist_total_hours if hist_total_hours > 0 else 0
-                
+            if hist_scrap_counts[pos] > 0 or hist_hours_counts[pos] > 0:
                 historical.append(WeeklyKPI(
                     week=1,  # Dummy value
                     year=hist_year,
-                    scrap_rate=hist_rate,
-                    total_scrap=hist_total_scrap,
-                    total_hours=hist_total_hours,
+                    scrap_rate=hist_rates[pos],
+                    total_scrap=hist_scrap_sums[pos],
+                    total_hours=hist_hours_sums[pos],
                     target_rate=0.50,
-                    meets_target=hist_rate <= 0.50,
-                    variance_pct=((hist_rate - 0.50) / 0.50 * 100)
+                    meets_target=hist_rates[pos] <= 0.50,
+                    variance_pct=hist_variances[pos]
                 ))
         
         # Alertas
@@ -587,24 +715,24 @@ def _calculate_year_kpis(scrap_df: pd.DataFrame,
             })
         
         return DashboardKPIs(
-            current_week=1,  # Dummy value
-            current_year=year,
-            current_scrap_rate=scrap_rate,
-            current_total_scrap=total_scrap,
-            current_total_hours=total_hours,
-            current_target=target_rate,
-            meets_target=meets_target,
-            variance_pct=variance_pct,
-            previous_week_rate=prev_scrap_rate,
-            rate_change_pct=rate_change_pct,
-            trend_direction=trend_direction,
-            scrap_change_pct=scrap_change_pct,
-            hours_change_pct=hours_change_pct,
-            total_sales=total_sales,
-            period_label="año",
-            top_contributors=top_contributors,
-            historical_weeks=historical,
-            alerts=alerts
+            1,  # Dummy value (current_week)
+            year,  # current_year
+            scrap_rate,  # current_scrap_rate
+            total_scrap,  # current_total_scrap
+            total_hours,  # current_total_hours
+            target_rate,  # current_target
+            meets_target,  # meets_target
+            variance_pct,  # variance_pct
+            prev_scrap_rate,  # previous_week_rate
+            rate_change_pct,  # rate_change_pct
+            trend_direction,  # trend_direction
+            scrap_change_pct,  # scrap_change_pct
+            hours_change_pct,  # hours_change_pct
+            total_sales,  # total_sales
+            "año",  # period_label
+            top_contributors,  # top_contributors
+            historical,  # historical_weeks
+            alerts  # alerts
         )
         
     except Exception as e:
@@ -667,35 +795,21 @@ def _calculate_custom_kpis(scrap_df: pd.DataFrame,
         prev_scrap_rate = prev_total_scrap / prev_total_hours if prev_total_hours > 0 else 0
         
         # Calcular cambios
-        rate_change_pct = ((scrap_rate - prev_scrap_rate) / prev_scrap_rate * 100) if prev_scrap_rate > 0 else None
-        scrap_change_pct = ((total_scrap - prev_total_scrap) / prev_total_scrap * 100) if prev_total_scrap > 0 else None
-        hours_change_pct = ((total_hours - prev_total_hours) / prev_total_hours * 100) if prev_total_hours > 0 else None
-        
-        trend_direction = "neutral"
-        if rate_change_pct:
-            if rate_change_pct < -2:
-                trend_direction = "improving"
-            elif rate_change_pct > 2:
-                trend_direction = "deteriorating"
+        rate_change_pct, scrap_change_pct, hours_change_pct, trend_direction = _calculate_changes(
+            (scrap_rate, total_scrap, total_hours),
+            (prev_scrap_rate, prev_total_scrap, prev_total_hours)
+        )
         
         # Top contributors
         if not scrap_range.empty:
-            contributors = scrap_range.groupby('Item', as_index=False).agg({
+            contributors = scrap_range.groupby('Item', as_index=False, observed=True).agg({
                 'Description': 'first',
                 'Total Posted': 'sum'
             })
             contributors = contributors.sort_values('Total Posted', ascending=False).head(3)
             
             total_scrap_r = scrap_range['Total Posted'].sum()
-            top_contributors = []
-            for _, row in contributors.iterrows():
-                pct = (row['Total Posted'] / total_scrap_r * 100) if total_scrap_r > 0 else 0
-                top_contributors.append({
-                    'item': row['Item'],
-                    'description': row['Description'][:30] + '...' if len(row['Description']) > 30 else row['Description'],
-                    'amount': row['Total Posted'],
-                    'percentage': pct
-                })
+            top_contributors = contributors_to_records(contributors, total_scrap_r)
         else:
             top_contributors = []
         
@@ -704,29 +818,28 @@ def _calculate_custom_kpis(scrap_df: pd.DataFrame,
         num_segments = min(6, days_diff // 7 + 1)  # Máximo 6 segmentos
         segment_days = days_diff // num_segments if num_segments > 0 else days_diff
         
-        for i in range(num_segments):
-            seg_start = start_date + timedelta(days=i * segment_days)
-            seg_end = seg_start + timedelta(days=segment_days - 1)
-            if seg_end > end_date:
-                seg_end = end_date
-            
-            seg_scrap = scrap_df[(scrap_df['Create Date'] >= seg_start) & (scrap_df['Create Date'] <= seg_end)]
-            seg_horas = horas_df[(horas_df['Trans Date'] >= seg_start) & (horas_df['Trans Date'] <= seg_end)]
-            
-            if not seg_scrap.empty or not seg_horas.empty:
-                seg_total_scrap = seg_scrap['Total Posted'].sum()
-                seg_total_hours = seg_horas['Actual Hours'].sum()
-                seg_rate = seg_total_scrap / seg_total_hours if seg_total_hours > 0 else 0
-                
+        # Inicio y fin (inclusive) de cada segmento
+        seg_starts = [start_date + timedelta(days=i * segment_days) for i in range(num_segments)]
+        seg_ends = [min(seg_start + timedelta(days=segment_days - 1), end_date) for seg_start in seg_starts]
+        
+        # Sumar todos los segmentos en una sola pasada (fin + 1ns = rango [inicio, fin] inclusive)
+        starts_arr = np.array(seg_starts, dtype='datetime64[ns]')
+        ends_arr = np.array(seg_ends, dtype='datetime64[ns]') + np.timedelta64(1, 'ns')
+        seg_scrap_sums, seg_scrap_counts = _sum_in_ranges(scrap_df['Create Date'], scrap_df['Total Posted'], starts_arr, ends_arr)
+        seg_hours_sums, seg_hours_counts = _sum_in_ranges(horas_df['Trans Date'], horas_df['Actual Hours'], starts_arr, ends_arr)
+        seg_rates, seg_variances = _historical_rates(seg_scrap_sums, seg_hours_sums, np.full(num_segments, 0.50))
+        
+        for i, seg_start in enumerate(seg_starts):
+            if seg_scrap_counts[i] > 0 or seg_hours_counts[i] > 0:
                 historical.append(WeeklyKPI(
                     week=i + 1,
                     year=seg_start.year,
-                    scrap_rate=seg_rate,
-                    total_scrap=seg_total_scrap,
-                    total_hours=seg_total_hours,
+                    scrap_rate=seg_rates[i],
+                    total_scrap=seg_scrap_sums[i],
+                    total_hours=seg_hours_sums[i],
                     target_rate=0.50,
-                    meets_target=seg_rate <= 0.50,
-                    variance_pct=((seg_rate - 0.50) / 0.50 * 100)
+                    meets_target=seg_rates[i] <= 0.50,
+                    variance_pct=seg_variances[i]
                 ))
         
         # Alertas
@@ -740,24 +853,24 @@ def _calculate_custom_kpis(scrap_df: pd.DataFrame,
             })
         
         return DashboardKPIs(
-            current_week=1,  # Dummy
-            current_year=end_date.year,
-            current_scrap_rate=scrap_rate,
-            current_total_scrap=total_scrap,
-            current_total_hours=total_hours,
-            current_target=target_rate,
-            meets_target=meets_target,
-            variance_pct=variance_pct,
-            previous_week_rate=prev_scrap_rate,
-            rate_change_pct=rate_change_pct,
-            trend_direction=trend_direction,
-            scrap_change_pct=scrap_change_pct,
-            hours_change_pct=hours_change_pct,
-            total_sales=total_sales,
-            period_label="periodo",
-            top_contributors=top_contributors,
-            historical_weeks=historical,
-            alerts=alerts
+            1,  # Dummy (current_week)
+            end_date.year,  # current_year
+            scrap_rate,  # current_scrap_rate
+            total_scrap,  # current_total_scrap
+            total_hours,  # current_total_hours
+            target_rate,  # current_target
+            meets_target,  # meets_target
+            variance_pct,  # variance_pct
+            prev_scrap_rate,  # previous_week_rate
+            rate_change_pct,  # rate_change_pct
+            trend_direction,  # trend_direction
+            scrap_change_pct,  # scrap_change_pct
+            hours_change_pct,  # hours_change_pct
+            total_sales,  # total_sales
+            "periodo",  # period_label
+            top_contributors,  # top_contributors
+            historical,  # historical_weeks
+            alerts  # alerts
         )
         
     except Exception as e:
@@ -774,9 +887,7 @@ def get_period_label(period_config: Dict) -> str:
     elif period_type == "week":
         return f"Semana {period_config['week']}/{period_config['year']}"
     elif period_type == "month":
-        month_names = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
-                      "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
-        return f"{month_names[period_config['month']-1]} {period_config['year']}"
+        return f"{_MONTH_NAMES_ES[period_config['month']-1]} {period_config['year']}"
     elif period_type == "quarter":
         return f"Q{period_config['quarter']} {period_config['year']}"
     elif period_type == "year":
@@ -789,6 +900,63 @@ def get_period_label(period_config: Dict) -> str:
         return "Periodo Desconocido"
 
 
+def _top_cache_key(kind: str, scrap_df: pd.DataFrame, period_config: Dict, top_n: int) -> Optional[tuple]:
+    """
+    Construye la llave de caché para una consulta top N
+    
+    La huella (filas, primera/última fecha, suma de montos) detecta si el
+    DataFrame cambió aunque Python reutilice su id.
+    
+    Returns:
+        tuple o None si el periodo tiene valores no hashables
+    """
+    try:
+        period_key = frozenset(period_config.items())
+        hash(period_key)
+    except TypeError:
+        return None
+    
+    if scrap_df.empty:
+        fingerprint = (0,)
+    else:
+        dates = scrap_df['Create Date']
+        fingerprint = (len(scrap_df), dates.iloc[0], dates.iloc[-1], float(scrap_df['Total Posted'].sum()))
+    
+    return kind, id(scrap_df), fingerprint, period_key, top_n
+
+
+def _top_cache_get(key: Optional[tuple]) -> Optional[List[Dict]]:
+    """Regresa una copia del resultado cacheado (o None si no existe)"""
+    if key is None:
+        return None
+    with _top_cache_lock:
+        rows = _top_cache.get(key)
+        if rows is None:
+            return None
+        _top_cache.move_to_end(key)
+    # Copia de cada dict para que el llamador no altere la caché
+    return [dict(row) for row in rows]
+
+
+def _top_cache_put(key: Optional[tuple], result: List[Dict]):
+    """Guarda un resultado en la caché, descartando el menos usado si se llena"""
+    if key is None:
+        return
+    rows = [dict(row) for row in result]
+    with _top_cache_lock:
+        _top_cache[key] = rows
+        _top_cache.move_to_end(key)
+        if len(_top_cache) > _TOP_CACHE_MAXSIZE:
+            _top_cache.popitem(last=False)
+
+
+def clear_top_cache():
+    """Limpia la caché de top items/locations (llamar al recargar datos)"""
+    with _top_cache_lock:
+        _top_cache.clear()
+    logger.debug("Caché de top items/locations limpiada")
+
+
 def get_top_items_for_period(scrap_df: pd.DataFrame, 
                              period_config: Dict, 
                              top_n: int = 10) -> List[Dict]:
@@ -804,33 +972,30 @@ def get_top_items_for_period(scrap_df: pd.DataFrame,
         Lista de diccionarios con item, description, amount
     """
     try:
-        scrap_df = scrap_df.copy()
-        scrap_df['Create Date'] = pd.to_datetime(scrap_df['Create Date'])
-        scrap_df['Total Posted'] = abs(scrap_df['Total Posted'])
+        # Reutilizar el resultado si ya se calculó para este DataFrame y periodo
+        cache_key = _top_cache_key('items', scrap_df, period_config, top_n)
+        cached = _top_cache_get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Filtrar según el periodo
+        # Filtrar según el periodo (fechas derivadas cacheadas por DataFrame)
         filtered_df = _filter_by_period(scrap_df, period_config, 'Create Date')
         
         if filtered_df.empty:
             return []
         
-        # Agrupar por Item
-        items = filtered_df.groupby('Item', as_index=False).agg({
-            'Description': 'first',
-            'Total Posted': 'sum'
-        })
-        
-        # Ordenar y tomar top N
-        items = items.sort_values('Total Posted', ascending=False).head(top_n)
-        
-        result = []
-        for _, row in items.iterrows():
-            result.append({
-                'item': row['Item'],
-                'description': row['Description'][:25] + '...' if len(row['Description']) > 25 else row['Description'],
-                'amount': row['Total Posted']
-            })
+        # Agrupar por Item (montos en positivo), ordenar y tomar top N
+        items = aggregate_top_n(filtered_df, 'Item', top_n, first_cols=('Description',), abs_values=True)
+        
+        # Descripciones recortadas y conversión directa a lista de diccionarios
+        items['Description'] = truncate_descriptions(items['Description'], 25)
+        result = items[['Item', 'Description', 'Total Posted']].rename(columns={
+            'Item': 'item',
+            'Description': 'description',
+            'Total Posted': 'amount'
+        }).to_dict(orient='records')
         
+        _top_cache_put(cache_key, result)
         return result
         
     except Exception as e:
@@ -853,31 +1018,27 @@ def get_top_locations_for_period(scrap_df: pd.DataFrame,
         Lista de diccionarios con location, amount
     """
     try:
-        scrap_df = scrap_df.copy()
-        scrap_df['Create Date'] = pd.to_datetime(scrap_df['Create Date'])
-        scrap_df['Total Posted'] = abs(scrap_df['Total Posted'])
+        # Reutilizar el resultado si ya se calculó para este DataFrame y periodo
+        cache_key = _top_cache_key('locations', scrap_df, period_config, top_n)
+        cached = _top_cache_get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Filtrar según el periodo
+        # Filtrar según el periodo (fechas derivadas cacheadas por DataFrame)
         filtered_df = _filter_by_period(scrap_df, period_config, 'Create Date')
         
         if filtered_df.empty:
             return []
         
-        # Agrupar por Location
-        locations = filtered_df.groupby('Location', as_index=False).agg({
-            'Total Posted': 'sum'
-        })
+        # Agrupar por Location (montos en positivo), ordenar y tomar top N
+        locations = aggregate_top_n(filtered_df, 'Location', top_n, abs_values=True)
         
-        # Ordenar y tomar top N
-        locations = locations.sort_values('Total Posted', ascending=False).head(top_n)
-        
-        result = []
-        for _, row in locations.iterrows():
-            result.append({
-                'location': row['Location'],
-                'amount': row['Total Posted']
-            })
+        result = locations[['Location', 'Total Posted']].rename(columns={
+            'Location': 'location',
+            'Total Posted': 'amount'
+        }).to_dict(orient='records')
         
+        _top_cache_put(cache_key, result)
         return result
         
     except Exception as e:
@@ -968,17 +1129,13 @@ def get_monthly_scrap_rates_for_year(scrap_df: pd.DataFrame,
         current_year = datetime.now().year
         max_month = 12 if year < current_year else current_month
         
-        month_names = ["Ene", "Feb", "Mar", "Abr", "May", "Jun", 
-                      "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
-        
         logger.info(f"Obteniendo scrap rates mensuales para año {year}, hasta mes {max_month}")
         
         for month in range(1, max_month + 1):
             # Filtrar por mes
-            scrap_month = scrap_df[(scrap_df['Create Date'].dt.year == year) & 
-                                   (scrap_df['Create Date'].dt.month == month)]
-            horas_month = horas_df[(horas_df['Trans Date'].dt.year == year) & 
-                                   (horas_df['Trans Date'].dt.month == month)]
+            month_start, month_end = _month_range(year, month)
+            scrap_month = scrap_df[_date_range_mask(scrap_df['Create Date'], month_start, month_end)]
+            horas_month = horas_df[_date_range_mask(horas_df['Trans Date'], month_start, month_end)]
             
             if not scrap_month.empty and not horas_month.empty:
                 total_scrap = abs(scrap_month['Total Posted'].sum())
@@ -992,7 +1149,7 @@ def get_monthly_scrap_rates_for_year(scrap_df: pd.DataFrame,
                     
                     results.append({
                         'month': month,
-                        'month_name': month_names[month - 1],
+                        'month_name': _MONTH_ABBR_ES[month - 1],
                         'scrap_rate': scrap_rate,
                         'target': target,
                         'meets_target': meets_target,
@@ -1001,7 +1158,7 @@ def get_monthly_scrap_rates_for_year(scrap_df: pd.DataFrame,
                 else:
                     results.append({
                         'month': month,
-                        'month_name': month_names[month - 1],
+                        'month_name': _MONTH_ABBR_ES[month - 1],
                         'scrap_rate': 0,
                         'target': TARGET_RATES.get(month, 0.5),
                         'meets_target': True,
@@ -1010,7 +1167,7 @@ def get_monthly_scrap_rates_for_year(scrap_df: pd.DataFrame,
             else:
                 results.append({
                     'month': month,
-                    'month_name': month_names[month - 1],
+                    'month_name': _MONTH_ABBR_ES[month - 1],
                     'scrap_rate': 0,
                     'target': TARGET_RATES.get(month, 0.5),
                     'meets_target': True,
@@ -1030,7 +1187,7 @@ def _filter_by_period(df: pd.DataFrame, period_config: Dict, date_column: str) -
     Filtra un DataFrame según la configuración de periodo
     
     Args:
-        df: DataFrame a filtrar
+        df: DataFrame a filtrar (no se modifica)
         period_config: Configuración del periodo
         date_column: Nombre de la columna de fecha
         
@@ -1039,6 +1196,9 @@ def _filter_by_period(df: pd.DataFrame, period_config: Dict, date_column: str) -
     """
     period_type = period_config.get("type")
     
+    # Fechas como datetime (conversión cacheada por DataFrame)
+    dates = get_parsed_dates(df, date_column)
+    
     if period_type == "last_week" or period_type == "week":
         week = period_config.get("week")
         year = period_config.get("year")
@@ -1053,29 +1213,25 @@ def _filter_by_period(df: pd.DataFrame, period_config: Dict, date_column: str) -
             else:
                 return pd.DataFrame()
         
-        df['Week'] = get_week_number_vectorized(df[date_column], year=year)
-        df['Year'] = df[date_column].dt.year
-        return df[(df['Week'] == week) & (df['Year'] == year)]
+        return df.iloc[get_week_rows(df, date_column, week, year)]
         
     elif period_type == "month":
         month = period_config["month"]
         year = period_config["year"]
-        return df[(df[date_column].dt.month == month) & (df[date_column].dt.year == year)]
+        return df[_date_range_mask(dates, *_month_range(year, month))]
         
     elif period_type == "quarter":
         quarter = period_config["quarter"]
         year = period_config["year"]
-        quarter_months = {1: [1, 2, 3], 2: [4, 5, 6], 3: [7, 8, 9], 4: [10, 11, 12]}
-        months = quarter_months[quarter]
-        return df[(df[date_column].dt.month.isin(months)) & (df[date_column].dt.year == year)]
+        return df[_date_range_mask(dates, *_month_range(year, _QUARTER_START_MONTH[quarter], 3))]
         
     elif period_type == "year":
         year = period_config["year"]
-        return df[df[date_column].dt.year == year]
+        return df[_date_range_mask(dates, *_month_range(year, 1, 12))]
         
     elif period_type == "custom":
         start_date = pd.to_datetime(period_config["start_date"])
         end_date = pd.to_datetime(period_config["end_date"])
-        return df[(df[date_column] >= start_date) & (df[date_column] <= end_date)]
+        return df[(dates >= start_date) & (dates <= end_date)]
     
     return df
@@ -2,7 +2,8 @@
 quarterly_contributors.py - Análisis de contribuidores trimestrales de scrap
 """
 
-import pandas as pd
+from src.analysis.aggregations import aggregate_top_n, append_total_row, last_value_by_key
+from src.utils.date_cache import get_date_parts
 
 
 def get_quarterly_contributors(scrap_df, quarter, year, top_n=10):
@@ -19,41 +20,26 @@ def get_quarterly_contributors(scrap_df, quarter, year, top_n=10):
         DataFrame: DataFrame con los principales contribuidores trimestrales o None si no hay datos
     """
     
-    # COPIA DE DATOS BASE
-    # Hacemos una copia del DataFrame original para evitar modificarlo directamente
-    scrap_df = scrap_df.copy()
-
-    # Convertimos la columna 'Create Date' a formato datetime para extraer trimestre y año
-    scrap_df['Create Date'] = pd.to_datetime(scrap_df['Create Date'])
-    scrap_df['Quarter'] = scrap_df['Create Date'].dt.quarter
-    scrap_df['Year'] = scrap_df['Create Date'].dt.year
+    # TRIMESTRE Y AÑO DE CADA REGISTRO
+    # Se calculan una sola vez por DataFrame y se reutilizan (el original no se modifica)
+    date_parts = get_date_parts(scrap_df, 'Create Date')
 
     # FILTRAR POR TRIMESTRE Y AÑO
-    scrap_quarter = scrap_df[(scrap_df['Quarter'] == quarter) & (scrap_df['Year'] == year)]
+    scrap_quarter = scrap_df[(date_parts['quarter'] == quarter) & (date_parts['year'] == year)]
 
     if scrap_quarter.empty:
         # Si no hay datos, retornamos None
         return None
 
-    # NORMALIZACIÓN DE VALORES
-    # Nos aseguramos de que todos los valores sean positivos
-    # Esto evita errores si hay registros negativos (por reversas o ajustes)
-    scrap_quarter = scrap_quarter.copy()
-    scrap_quarter['Quantity'] = scrap_quarter['Quantity'].abs()
-    scrap_quarter['Total Posted'] = scrap_quarter['Total Posted'].abs()
-    
-    # AGRUPAR POR NÚMERO DE PARTE
-    # Sumamos la cantidad y el monto total de cada número de parte dentro del trimestre
-    contributors = scrap_quarter.groupby('Item', as_index=False).agg({
-        'Description': 'first',        # Tomar la primera descripción
-        'Quantity': 'sum',             # SUMAR todas las cantidades del mismo item
-        'Total Posted': 'sum'          # SUMAR todos los montos del mismo item (YA EN POSITIVO)
-    })
-
-    # ORDENAR Y SELECCIONAR TOP N
-    contributors = contributors.sort_values('Total Posted', ascending=False)
-    contributors = contributors.reset_index(drop=True)
-    contributors = contributors.head(top_n)
+    # AGRUPAR POR NÚMERO DE PARTE, ORDENAR Y SELECCIONAR TOP N
+    # Primera descripción y suma de cantidad y monto de cada número de parte.
+    # abs_values: se suman valores positivos (evita errores por reversas o ajustes negativos)
+    contributors = aggregate_top_n(
+        scrap_quarter, 'Item', top_n,
+        first_cols=('Description',),
+        sum_cols=('Quantity', 'Total Posted'),
+        abs_values=True
+    )
 
     # CÁLCULO DE PORCENTAJE ACUMULADO
     total_top_n = contributors['Total Posted'].sum()
@@ -67,8 +53,7 @@ def get_quarterly_contributors(scrap_df, quarter, year, top_n=10):
     
     # MAPEO DE UBICACIÓN (SI EXISTE)
     if 'Location' in scrap_quarter.columns:
-        location_map = scrap_quarter.set_index('Item')['Location'].to_dict()
-        contributors['Location'] = contributors['Item'].map(location_map)
+        contributors['Location'] = last_value_by_key(scrap_quarter, 'Item', 'Location', contributors['Item'])
     else:
         contributors['Location'] = ''
     
@@ -86,18 +71,11 @@ def get_quarterly_contributors(scrap_df, quarter, year, top_n=10):
     })
     
     # Agregar fila de totales al final (sin % acumulado en total)
-    total_row = pd.DataFrame({
-        'Lugar': ['TOTAL'],
-        'Número de Parte': [''],
-        'Descripción': [''],
-        'Cantidad Scrapeada': [''],
-        'Monto (dls)': [contributors['Monto (dls)'].sum()],
-        '% Acumulado': [''],
-        'Ubicación': ['']
+    contributors = append_total_row(contributors, {
+        'Lugar': 'TOTAL',
+        'Monto (dls)': contributors['Monto (dls)'].sum()
     })
 
-    contributors = pd.concat([contributors, total_row], ignore_index=True)
-
     return contributors
 
 def export_quarterly_contributors_to_console(scrap_df, quarter, year, top_n=10):
@@ -2,9 +2,9 @@
 weekly_contributors.py - Módulo para análisis de principales contribuidores de scrap
 """
 
-import pandas as pd
 from colorama import Fore, Style
-from config import get_week_number_vectorized
+from src.analysis.aggregations import aggregate_top_n, append_total_row, last_value_by_key
+from src.utils.date_cache import get_week_rows
 
 
 def get_top_contributors_by_week(scrap_df, week_number, year, top_n=10):
@@ -23,47 +23,24 @@ def get_top_contributors_by_week(scrap_df, week_number, year, top_n=10):
         DataFrame: DataFrame con los principales contribuidores o None si no hay datos
     """
     
-    # Hacer una copia para no modificar el original
-    scrap_df = scrap_df.copy()
-    
-    # Convertir columnas de fecha a datetime
-    scrap_df['Create Date'] = pd.to_datetime(scrap_df['Create Date'])
-    
-    # Agregar columnas de semana DOMINGO-SÁBADO y año (VECTORIZADO)
-    scrap_df['Week'] = get_week_number_vectorized(scrap_df['Create Date'], year=year)
-    scrap_df['Year'] = scrap_df['Create Date'].dt.year
-    
-    # Filtrar por semana específica
-    scrap_week = scrap_df[(scrap_df['Week'] == week_number) & (scrap_df['Year'] == year)]
+    # Filtrar por semana específica (DOMINGO-SÁBADO)
+    # Las filas de la semana se calculan una sola vez por DataFrame y se comparten
+    # con process_weekly_data y las ubicaciones (el original no se modifica)
+    scrap_week = scrap_df.iloc[get_week_rows(scrap_df, 'Create Date', week_number, year)]
     
     if scrap_week.empty:
         return None
     
-    # Hacer copia para modificar
-    scrap_week = scrap_week.copy()
-    
-    # Convertir a valores positivos ANTES de agrupar
-    # IMPORTANTE: Usamos abs() para asegurar valores positivos
-    scrap_week['Quantity'] = scrap_week['Quantity'].abs()
-    scrap_week['Total Posted'] = scrap_week['Total Posted'].abs()
-    
     # AGRUPAR por Item y SUMAR todos los registros del mismo item
-    # Esto combina todas las veces que aparece el mismo número de parte
-    contributors = scrap_week.groupby('Item', as_index=False).agg({
-        'Description': 'first',      # Tomar la primera descripción
-        'Quantity': 'sum',            # SUMAR todas las cantidades del mismo item
-        'Total Posted': 'sum'         # SUMAR todos los montos del mismo item (YA EN POSITIVO)
-    })
-    
-    # ORDENAR por monto total de MAYOR a MENOR (descendente)
-    # ascending=False significa que los valores MÁS GRANDES van primero
-    contributors = contributors.sort_values('Total Posted', ascending=False)
-    
-    # RESETEAR índice después de ordenar
-    contributors = contributors.reset_index(drop=True)
-    
-    # Tomar solo los top N (los que tienen mayor monto)
-    contributors = contributors.head(top_n)
+    # Esto combina todas las veces que aparece el mismo número de parte,
+    # ordena de MAYOR a MENOR monto y toma solo los top N
+    # IMPORTANTE: abs_values=True suma valores positivos (abs() dentro de la agregación)
+    contributors = aggregate_top_n(
+        scrap_week, 'Item', top_n,
+        first_cols=('Description',),
+        sum_cols=('Quantity', 'Total Posted'),
+        abs_values=True
+    )
     
     # CALCULAR PORCENTAJE ACUMULADO basado en el TOTAL de los TOP N
     total_top_n = contributors['Total Posted'].sum()
@@ -74,8 +51,7 @@ def get_top_contributors_by_week(scrap_df, week_number, year, top_n=10):
     
     # Agregar columna de Ubicación (Location) si existe en el DataFrame original
     if 'Location' in scrap_week.columns:
-        location_map = scrap_week.set_index('Item')['Location'].to_dict()
-        contributors['Location'] = contributors['Item'].map(location_map)
+        contributors['Location'] = last_value_by_key(scrap_week, 'Item', 'Location', contributors['Item'])
     else:
         contributors['Location'] = ''
 
@@ -93,18 +69,11 @@ def get_top_contributors_by_week(scrap_df, week_number, year, top_n=10):
     })
     
     # Agregar fila de totales al final (sin % acumulado en total)
-    total_row = pd.DataFrame({
-        'Lugar': ['TOTAL'],
-        'Número de Parte': [''],
-        'Descripción': [''],
-        'Cantidad Scrapeada': [''],
-        'Monto (dls)': [contributors['Monto (dls)'].sum()],
-        '% Acumulado': [''],
-        'Ubicación': ['']
+    contributors = append_total_row(contributors, {
+        'Lugar': 'TOTAL',
+        'Monto (dls)': contributors['Monto (dls)'].sum()
     })
     
-    contributors = pd.concat([contributors, total_row], ignore_index=True)
-    
     return contributors
 
 def export_contributors_to_console(scrap_df, week, year, top_n=10):
@@ -135,18 +104,8 @@ def get_weekly_location_contributors(scrap_df, week_number, year, top_n=10):
         DataFrame: DataFrame con las celdas contribuidoras ordenadas por monto
     """
     
-    # Hacer copia
-    scrap_df = scrap_df.copy()
-    
-    # Convertir fecha
-    scrap_df['Create Date'] = pd.to_datetime(scrap_df['Create Date'])
-    
-    # Agregar semana DOMINGO-SÁBADO y año (VECTORIZADO)
-    scrap_df['Week'] = get_week_number_vectorized(scrap_df['Create Date'], year=year)
-    scrap_df['Year'] = scrap_df['Create Date'].dt.year
-    
-    # Filtrar por semana específica
-    scrap_week = scrap_df[(scrap_df['Week'] == week_number) & (scrap_df['Year'] == year)]
+    # Filtrar por semana específica DOMINGO-SÁBADO (filas calculadas una vez por DataFrame)
+    scrap_week = scrap_df.iloc[get_week_rows(scrap_df, 'Create Date', week_number, year)]
     
     if scrap_week.empty:
         return None
@@ -155,21 +114,8 @@ def get_weekly_location_contributors(scrap_df, week_number, year, top_n=10):
     if 'Location' not in scrap_week.columns:
         return None
     
-    # Convertir a valores positivos
-    scrap_week = scrap_week.copy()
-    scrap_week['Total Posted'] = scrap_week['Total Posted'].abs()
-    
-    # Agrupar por Location (Celda)
-    location_contrib = scrap_week.groupby('Location', as_index=False).agg({
-        'Total Posted': 'sum'
-    })
-    
-    # Ordenar de mayor a menor
-    location_contrib = location_contrib.sort_values('Total Posted', ascending=False)
-    location_contrib = location_contrib.reset_index(drop=True)
-    
-    # Tomar top N
-    location_contrib = location_contrib.head(top_n)
+    # Agrupar por Location (Celda) sumando valores positivos, ordenar de mayor a menor y tomar top N
+    location_contrib = aggregate_top_n(scrap_week, 'Location', top_n, abs_values=True)
     
     # Calcular porcentaje acumulado
     total_amount = location_contrib['Total Posted'].sum()
@@ -190,15 +136,11 @@ def get_weekly_location_contributors(scrap_df, week_number, year, top_n=10):
     })
     
     # Agregar fila de totales
-    total_row = pd.DataFrame({
-        'Ranking': ['TOTAL'],
-        'Celda': [''],
-        'Monto (dls)': [location_contrib['Monto (dls)'].sum()],
-        'Cumulative %': ['']
+    location_contrib = append_total_row(location_contrib, {
+        'Ranking': 'TOTAL',
+        'Monto (dls)': location_contrib['Monto (dls)'].sum()
     })
     
-    location_contrib = pd.concat([location_contrib, total_row], ignore_index=True)
-    
     return location_contrib
 
 
@@ -3,6 +3,14 @@ Base PDF Generator - Abstract base class for all PDF report generators
 """
 
 import os
+import sys
+import math
+import hashlib
+import dataclasses
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import pandas as pd
 from reportlab.lib.pagesizes import letter, landscape
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.units import inch
@@ -13,6 +21,10 @@ from .styles import (
     get_title_style, get_subtitle_style,
     get_section_title_style, get_target_header_style
 )
+from .components import (
+    CONTRIBUTORS_TABLE_HEADERS, CONTRIBUTORS_TABLE_FORMATS,
+    format_columns, build_table_data, build_contributors_tables
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +40,14 @@ class BasePDFGenerator:
     - Target achievement indicators
     """
     
+    # Output folders already created in this process (shared by all generators)
+    _created_dirs: set = set()
+    
+    # Reports built in this process: input key -> (filepath, mtime_ns, size), LRU order
+    _report_cache: OrderedDict = OrderedDict()
+    _report_cache_lock = threading.Lock()  # Report threads (QThread) build concurrently
+    _REPORT_CACHE_SIZE = 16
+    
     def __init__(self, output_folder='reports'):
         """
         Initialize PDF generator
@@ -39,10 +59,132 @@ class BasePDFGenerator:
         self.elements = []
         
     def _ensure_output_folder(self):
-        """Create output folder if it doesn't exist"""
-        if not os.path.exists(self.output_folder):
-            os.makedirs(self.output_folder)
-            logger.info(f"Created output folder: {self.output_folder}")
+        """Create output folder if it doesn't exist (checked once per folder)"""
+        folder = str(self.output_folder)
+        if folder in BasePDFGenerator._created_dirs:
+            return
+        
+        path = Path(folder)
+        if not path.is_dir():
+            path.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Created output folder: {folder}")
+        BasePDFGenerator._created_dirs.add(folder)
+    
+    def _output_path(self, filename):
+        """
+        Build the full path of a report inside the output folder
+        
+        Args:
+            filename: PDF file name
+            
+        Returns:
+            str: Full path to the output file
+        """
+        return str(Path(self.output_folder) / filename)
+    
+    @staticmethod
+    def _frame_fingerprint(df):
+        """
+        Content hash of a DataFrame (columns, dtypes, index and values)
+        
+        Args:
+            df: DataFrame to hash, or None
+            
+        Returns:
+            tuple: Hashable fingerprint (None if df is None)
+        """
+        if df is None:
+            return None
+        row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16).digest()
+        return tuple(map(str, df.columns)), tuple(map(str, df.dtypes)), digest
+    
+    def _report_key(self, filepath, df, contributors_df, *params):
+        """
+        Build the cache key of a report from its inputs
+        
+        Args:
+            filepath: Output PDF path
+            df: Main report DataFrame
+            contributors_df: Contributors DataFrame (or None)
+            *params: Period parameters; a PeriodComparison is keyed by its field values
+            
+        Returns:
+            tuple: Hashable key, or None if the inputs cannot be hashed
+        """
+        params = tuple(
+            dataclasses.astuple(param) if dataclasses.is_dataclass(param) else param
+            for param in params
+        )
+        try:
+            return (
+                type(self).__name__, filepath,
+                self._frame_fingerprint(df), self._frame_fingerprint(contributors_df),
+                params
+            )
+        except TypeError as e:
+            logger.debug(f"Report inputs cannot be hashed, cache skipped: {e}")
+            return None
+    
+    def _get_cached_report(self, key):
+        """
+        Return the PDF built earlier for the same inputs
+        
+        The entry is only used while the file on disk is the one that was
+        built (same modification time and size); otherwise it is dropped.
+        
+        Args:
+            key: Key from _report_key
+            
+        Returns:
+            str: Path to the existing PDF, or None on a cache miss
+        """
+        if key is None:
+            return None
+        cache = BasePDFGenerator._report_cache
+        with BasePDFGenerator._report_cache_lock:
+            entry = cache.get(key)
+        if entry is None:
+            return None
+        
+        filepath, mtime_ns, size = entry
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            stat = None
+        
+        # Report threads share the cache: another one may have dropped or replaced the entry
+        with BasePDFGenerator._report_cache_lock:
+            if stat is None or (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+                if cache.get(key) == entry:
+                    cache.pop(key, None)
+                return None
+            if key in cache:
+                cache.move_to_end(key)
+        logger.info(f"Report inputs unchanged, reusing PDF: {filepath}")
+        return filepath
+    
+    def _store_cached_report(self, key, filepath):
+        """
+        Remember the PDF built for the given inputs (keeps the last _REPORT_CACHE_SIZE)
+        
+        Args:
+            key: Key from _report_key
+            filepath: Path to the generated PDF
+        """
+        if key is None:
+            return
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return
+        
+        cache = BasePDFGenerator._report_cache
+        with BasePDFGenerator._report_cache_lock:
+            cache[key] = (filepath, stat.st_mtime_ns, stat.st_size)
+            cache.move_to_end(key)
+            while len(cache) > self._REPORT_CACHE_SIZE:
+                cache.popitem(last=False)
     
     def _create_document(self, filepath):
         """
@@ -121,19 +263,83 @@ class BasePDFGenerator:
         """
         self.elements.append(Spacer(1, height_inches * inch))
     
+    def _add_contributors_table(self, contrib_data, cumulative_col_idx=5, threshold=80.0):
+        """
+        Add the contributors table with the cumulative % highlight
+        
+        Long tables are added as several chunk tables separated by a small spacer.
+        
+        Args:
+            contrib_data: List of lists with contributors table data (including headers)
+            cumulative_col_idx: Index of cumulative % column (default 5)
+            threshold: Cumulative percentage threshold (default 80.0%)
+        """
+        tables = build_contributors_tables(contrib_data, cumulative_col_idx, threshold)
+        for i, table in enumerate(tables):
+            if i:
+                self._add_spacer(0.1)
+            self.elements.append(table)
+    
+    def _build_empty_report(self, filepath, title_text, subtitle_text):
+        """
+        Build a one-page report stating that the period has no data
+        
+        Used when the report DataFrame is empty, so no tables are formatted or styled.
+        
+        Args:
+            filepath: Full path to output PDF file
+            title_text: Report title
+            subtitle_text: Subtitle with period/year info
+            
+        Returns:
+            str: Path to the generated PDF file
+        """
+        logger.warning(f"No data for the period, building empty report: {filepath}")
+        self.elements = []
+        self._add_main_title(title_text)
+        self._add_subtitle(subtitle_text)
+        self._add_spacer(0.3)
+        self._add_section_title("SIN DATOS PARA EL PERIODO")
+        return self.build_and_save(self._create_document(filepath))
+    
     def _add_page_break(self):
         """Add page break"""
         self.elements.append(PageBreak())
     
     def _close_matplotlib_figures(self):
         """Close all open matplotlib figures to free memory"""
+        # If pyplot was never imported there are no figures to close;
+        # avoid paying its import cost just to close nothing
+        plt = sys.modules.get('matplotlib.pyplot')
+        if plt is None:
+            return
         try:
-            import matplotlib.pyplot as plt
+            # Nothing to do when pyplot is loaded but no figure is open
+            if not plt.get_fignums():
+                return
             plt.close('all')
             logger.debug("Closed all matplotlib figures")
         except Exception as e:
             logger.warning(f"Error closing matplotlib figures: {e}")
     
+    @staticmethod
+    def _to_float(value, default=0.0):
+        """
+        Convert a single table cell to float
+        
+        Args:
+            value: Cell value (number or numeric string)
+            default: Value returned for missing or non-numeric cells
+            
+        Returns:
+            float
+        """
+        try:
+            number = float(value)
+        except (ValueError, TypeError):
+            return default
+        return default if math.isnan(number) else number
+    
     def _calculate_target_achievement(self, df):
         """
         Calculate if period meets target rate (to be implemented by subclasses)
@@ -160,7 +366,9 @@ class BasePDFGenerator:
     
     def _build_contributors_table_data(self, contributors_df):
         """
-        Build data structure for contributors table (to be implemented by subclasses)
+        Build data structure for contributors table
+        
+        Shared by the period reports; subclasses with a different layout override it.
         
         Args:
             contributors_df: DataFrame with contributors data
@@ -168,7 +376,51 @@ class BasePDFGenerator:
         Returns:
             list: List of lists with contributors table data (including headers)
         """
-        raise NotImplementedError("Subclasses must implement _build_contributors_table_data")
+        return build_table_data(
+            CONTRIBUTORS_TABLE_HEADERS,
+            format_columns(contributors_df, CONTRIBUTORS_TABLE_FORMATS)
+        )
+    
+    @staticmethod
+    def _select_columns(df, columns, defaults=None):
+        """
+        Select the given columns, filling any column df lacks with a constant
+        
+        Args:
+            df: Source DataFrame (not modified)
+            columns: Column names, in table order
+            defaults: Optional {column: value} for missing columns ('' if not given)
+            
+        Returns:
+            DataFrame with exactly the given columns
+        """
+        columns = list(columns)
+        missing = [col for col in columns if col not in df.columns]
+        if not missing:
+            return df[columns]
+        
+        defaults = defaults or {}
+        fill = {col: defaults.get(col, '') for col in missing}
+        return df.reindex(columns=columns).assign(**fill)
+    
+    @classmethod
+    def _iter_rows(cls, df, columns, defaults=None):
+        """
+        Iterate DataFrame rows as plain tuples of the given columns
+        
+        Uses itertuples (no per-row Series as with iterrows). A column missing
+        from df yields its value from defaults ('' if not given), like
+        row.get(col, default) did.
+        
+        Args:
+            df: DataFrame to iterate
+            columns: Column names, in the order of the returned tuples
+            defaults: Optional {column: value} for missing columns
+            
+        Returns:
+            Iterator of tuples
+        """
+        return cls._select_columns(df, columns, defaults).itertuples(index=False, name=None)
     
     def build_and_save(self, doc):
         """
@@ -0,0 +1,87 @@
+"""
+Batch PDF generation - Build several monthly/quarterly reports in parallel
+"""
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from src.pdf.generators.monthly import generate_monthly_pdf_report
+from src.pdf.generators.quarterly import generate_quarterly_pdf_report
+
+logger = logging.getLogger(__name__)
+
+
+def _generate_one(spec):
+    """
+    Generate the report described by one spec (runs in a worker process)
+
+    Args:
+        spec: Report spec (see generate_many)
+
+    Returns:
+        str: Path to the generated PDF, or None if the period type is unknown
+    """
+    kwargs = {'comparison': spec.get('comparison')}
+    if 'output_folder' in spec:
+        kwargs['output_folder'] = spec['output_folder']
+
+    if spec['type'] == 'month':
+        return generate_monthly_pdf_report(
+            spec['df'], spec.get('contributors_df'), spec['month'], spec['year'], **kwargs
+        )
+    if spec['type'] == 'quarter':
+        return generate_quarterly_pdf_report(
+            spec['df'], spec.get('contributors_df'), spec['quarter'], spec['year'], **kwargs
+        )
+
+    logger.warning(f"Unknown report type in batch: {spec['type']}")
+    return None
+
+
+def generate_many(specs, max_workers=None):
+    """
+    Generate several monthly/quarterly PDF reports, one worker process per report
+
+    Each ReportLab build is CPU-bound and independent, so the reports are
+    built in a process pool. A single report is built in this process.
+
+    Args:
+        specs: List of dicts, each with:
+            - 'type': 'month' or 'quarter'
+            - 'month' or 'quarter', and 'year'
+            - 'df': Processed period DataFrame
+            - 'contributors_df': Optional contributors DataFrame
+            - 'comparison': Optional PeriodComparison
+            - 'output_folder': Optional output folder (generator default if missing)
+        max_workers: Worker processes (default: CPU count, at most one per report)
+
+    Returns:
+        list: PDF path for each spec, in the same order (None for reports that failed)
+    """
+    specs = list(specs)
+    if not specs:
+        return []
+
+    # One report: no pool startup or DataFrame pickling
+    if len(specs) == 1:
+        try:
+            return [_generate_one(specs[0])]
+        except Exception as e:
+            logger.error(f"Error generating report: {e}")
+            return [None]
+
+    workers = min(max_workers or os.cpu_count() or 1, len(specs))
+    logger.info(f"Generating {len(specs)} reports with {workers} worker processes")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_generate_one, spec) for spec in specs]
+        for spec, future in zip(specs, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"Error generating {spec['type']} report {spec.get(spec['type'])}/{spec.get('year')}: {e}")
+                results.append(None)
+
+    return results
@@ -2,74 +2,303 @@
 PDF Components module - Reusable table and component builders
 """
 
+import re
+from functools import lru_cache
+import numpy as np
+import pandas as pd
 from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.platypus import Table, TableStyle
 from config import (
     COLOR_HEADER, COLOR_ROW, COLOR_TOTAL, COLOR_TEXT,
-    COLOR_BAR, COLOR_BAR_EXCEED, COLOR_BG_CONTRIB
+    COLOR_BAR, COLOR_BAR_EXCEED, COLOR_BG_CONTRIB,
+    MONTHS_NUM_TO_ES_ARR, TARGET_RATES
 )
 
 
-def get_main_table_style(with_conditional_coloring=True):
+# Colors used by the table styles, parsed once at import time
+_HEADER_COLOR = colors.HexColor(COLOR_HEADER)
+_ROW_COLOR = colors.HexColor(COLOR_ROW)
+_TOTAL_COLOR = colors.HexColor(COLOR_TOTAL)
+_TEXT_COLOR = colors.HexColor(COLOR_TEXT)
+_BAR_COLOR = colors.HexColor(COLOR_BAR)
+_BAR_EXCEED_COLOR = colors.HexColor(COLOR_BAR_EXCEED)
+_BG_CONTRIB_COLOR = colors.HexColor(COLOR_BG_CONTRIB)
+_CUMULATIVE_HIGHLIGHT_COLOR = colors.HexColor('#FFCCCC')
+
+# Base styles built once; every report gets its own copy (see get_*_table_style)
+_MAIN_TABLE_STYLE = TableStyle([
+    # Encabezado
+    ('BACKGROUND', (0, 0), (-1, 0), _HEADER_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+
+    # Cuerpo
+    ('BACKGROUND', (0, 1), (-1, -2), _ROW_COLOR),
+    ('TEXTCOLOR', (0, 1), (-1, -1), _TEXT_COLOR),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+
+    # Fila total
+    ('BACKGROUND', (0, -1), (-1, -1), _TOTAL_COLOR),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, -1), (-1, -1), 10),
+    ('LINEABOVE', (0, -1), (-1, -1), 2, _HEADER_COLOR),
+
+    # Bordes
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('TOPPADDING', (0, 1), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+])
+
+_CONTRIBUTORS_TABLE_STYLE = TableStyle([
+    # Encabezado
+    ('BACKGROUND', (0, 0), (-1, 0), _BAR_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+
+    # Cuerpo
+    ('BACKGROUND', (0, 1), (-1, -2), _BG_CONTRIB_COLOR),
+    ('TEXTCOLOR', (0, 1), (-1, -1), _TEXT_COLOR),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+
+    # Fila total
+    ('BACKGROUND', (0, -1), (-1, -1), _TOTAL_COLOR),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+
+    # Bordes
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('ALIGN', (2, 1), (2, -1), 'LEFT'),  # Description column left-aligned
+])
+
+# Header row of the contributors table (same in every period report)
+CONTRIBUTORS_TABLE_HEADERS = ('Ranking', 'Número de parte', 'Descripción', 'Cantidad', 'Monto (USD)', '% Acumulado', 'Celda')
+
+# Cell formats of the numeric report columns (main and contributors tables)
+MAIN_TABLE_FORMATS = {
+    'Scrap': '${:,.2f}',
+    'Hrs Prod.': '{:.2f}',
+    '$ Venta (dls)': '${:,.0f}',
+    'Rate': '{:.2f}',
+    'Target Rate': '{:.2f}',
+}
+
+CONTRIBUTORS_TABLE_FORMATS = {
+    'Cantidad Scrapeada': '{:,.2f}',
+    'Monto (dls)': '${:,.2f}',
+    '% Acumulado': '{:.2f}%',
+}
+
+# Contributors tables with more body rows than this are split in several tables
+CONTRIBUTORS_CHUNK_ROWS = 50
+
+
+def get_main_table_style(with_conditional_coloring=True, commands=None):
     """
     Get the standard table style for main data tables
     
     Args:
         with_conditional_coloring: Whether to check for rate>target conditional coloring
+        commands: Optional extra style commands (e.g. from rate_conditional_commands)
+    
+    Returns:
+        TableStyle object (a copy of the base style plus commands, safe to modify)
+    """
+    return TableStyle(commands, parent=_MAIN_TABLE_STYLE)
+
+
+def get_contributors_table_style(commands=None):
+    """
+    Get table style for contributors/top defects tables
+    
+    Args:
+        commands: Optional extra style commands (e.g. from contributors_cumulative_commands)
+    
+    Returns:
+        TableStyle object (a copy of the base style plus commands, safe to modify)
+    """
+    return TableStyle(commands, parent=_CONTRIBUTORS_TABLE_STYLE)
+
+
+@lru_cache(maxsize=None)
+def _printf_format(fmt):
+    """
+    printf equivalent of a fixed-point format such as '{:.2f}%' -> '%.2f%%'
+    
+    Args:
+        fmt: Format string with a single '{:.Nf}' field
+    
+    Returns:
+        str, or None when there is no equivalent (e.g. '{:,.2f}' thousands separator)
+    """
+    match = re.fullmatch(r'([^{}]*)\{:\.(\d+)f\}([^{}]*)', fmt)
+    if match is None:
+        return None
+    prefix, digits, suffix = match.groups()
+    return f"{prefix.replace('%', '%%')}%.{digits}f{suffix.replace('%', '%%')}"
+
+
+def format_column(series, fmt):
+    """
+    Format a numeric report column with fmt in one pass
+    
+    Args:
+        series: Column to format
+        fmt: Format string for numbers (e.g. '${:,.2f}')
     
     Returns:
-        TableStyle object
-    """
-    return TableStyle([
-        # Encabezado
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(COLOR_HEADER)),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-
-        # Cuerpo
-        ('BACKGROUND', (0, 1), (-1, -2), colors.HexColor(COLOR_ROW)),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor(COLOR_TEXT)),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-
-        # Fila total
-        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor(COLOR_TOTAL)),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, -1), (-1, -1), 10),
-        ('LINEABOVE', (0, -1), (-1, -1), 2, colors.HexColor(COLOR_HEADER)),
-
-        # Bordes
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('TOPPADDING', (0, 1), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-    ])
-
-
-def get_contributors_table_style():
-    """Get table style for contributors/top defects tables"""
-    return TableStyle([
-        # Encabezado
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(COLOR_BAR)),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-
-        # Cuerpo
-        ('BACKGROUND', (0, 1), (-1, -2), colors.HexColor(COLOR_BG_CONTRIB)),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor(COLOR_TEXT)),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-
-        # Fila total
-        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor(COLOR_TOTAL)),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-
-        # Bordes
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('ALIGN', (2, 1), (2, -1), 'LEFT'),  # Description column left-aligned
-    ])
+        pd.Series or np.ndarray of str
+    """
+    # Plain numeric column: every cell is a number, format directly
+    # ('%' formatting of the whole array when the format has a printf equivalent)
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf':
+        printf_fmt = _printf_format(fmt)
+        if printf_fmt is not None:
+            return np.char.mod(printf_fmt, series.to_numpy())
+        return series.map(fmt.format)
+    
+    # Mixed/object column (e.g. the TOTAL row's '' cells): convert to numbers once;
+    # cells that are not numbers are kept as text
+    numbers = pd.to_numeric(series, errors='coerce')
+    return numbers.map(fmt.format).where(numbers.notna(), series.map(str))
+
+
+def format_columns(df, formats, cell_formatters=None):
+    """
+    Format every cell of df column by column (no per-row loop)
+    
+    Args:
+        df: DataFrame to format
+        formats: {column: format string} for numeric columns
+        cell_formatters: Optional {column: callable value -> str} for special columns
+    
+    Returns:
+        list of formatted columns (pd.Series or np.ndarray of str), in column order;
+        columns without a format are formatted with str
+    """
+    cell_formatters = cell_formatters or {}
+    formatted = []
+    for i, col in enumerate(df.columns):
+        series = df.iloc[:, i]
+        if col in cell_formatters:
+            formatted.append(series.map(cell_formatters[col]))
+        elif col in formats:
+            formatted.append(format_column(series, formats[col]))
+        else:
+            formatted.append(series.map(str))
+    return formatted
+
+
+def format_month_columns(df, formatted):
+    """
+    Replace the formatted Month and Target Rate columns of a by-month table
+    
+    Month numbers are shown in Spanish and Target Rate is the target of each
+    row's month; rows without a valid month (e.g. TOTAL) keep their text.
+    
+    Args:
+        df: Table DataFrame (with 'Month' and optionally 'Target Rate')
+        formatted: Formatted columns of df (from format_columns), updated in place
+    """
+    if 'Month' not in df.columns:
+        return
+    
+    # Month number of each row (0 for rows without a month, such as TOTAL)
+    month_numbers = df['Month'].map(lambda value: value if isinstance(value, int) else 0)
+    months = month_numbers.to_numpy()
+    valid_month = (months >= 1) & (months <= 12)
+    
+    # Spanish month names with a single fancy index
+    month_names = MONTHS_NUM_TO_ES_ARR[np.where(valid_month, months, 0)]
+    formatted[df.columns.get_loc('Month')] = np.where(valid_month, month_names, df['Month'].map(str).to_numpy())
+    
+    # Target rate of each row's month
+    if 'Target Rate' in df.columns:
+        month_targets = month_numbers.map(TARGET_RATES).fillna(0.0).map('{:.2f}'.format)
+        formatted[df.columns.get_loc('Target Rate')] = month_targets.where(month_numbers != 0, df['Target Rate'].map(str))
+
+
+def build_table_data(headers, columns):
+    """
+    Build the full table data: header row followed by the formatted rows
+    
+    Args:
+        headers: Header row
+        columns: Formatted columns (see build_table_rows)
+    
+    Returns:
+        list of lists, headers first
+    """
+    return [list(headers)] + build_table_rows(columns)
+
+
+def build_table_rows(columns):
+    """
+    Turn formatted columns into table rows for reportlab
+    
+    Args:
+        columns: Equal-length sequences of cell strings, one per table column
+    
+    Returns:
+        list of lists (one per row)
+    """
+    if not columns:
+        return []
+    
+    # Fill one preallocated object array column by column (no per-column
+    # copies to stack), then convert to nested lists in a single call
+    rows = np.empty((len(columns[0]), len(columns)), dtype=object)
+    for col_idx, col in enumerate(columns):
+        rows[:, col_idx] = np.asarray(col, dtype=object)
+    return rows.tolist()
+
+def _numeric_column(rows, col_idx):
+    """
+    Parse one column of formatted table cells ('$1,234.50', '0.52') as floats
+    
+    Args:
+        rows: List of table rows (lists of cell values)
+        col_idx: Index of the column to parse
+    
+    Returns:
+        np.ndarray of floats (NaN for missing or non-numeric cells)
+    """
+    cells = pd.Series([row[col_idx] if col_idx < len(row) else '' for row in rows], dtype=object)
+    cleaned = cells.astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False).str.strip()
+    return pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=float)
+
+
+def rate_conditional_commands(data, rate_col_idx=7, target_col_idx=8):
+    """
+    Style commands that paint table rows where rate > target
+    
+    Args:
+        data: List of lists with table data
+        rate_col_idx: Index of the Rate column (default 7)
+        target_col_idx: Index of the Target Rate column (default 8)
+    
+    Returns:
+        list of TableStyle commands
+    """
+    rows = data[1:-1]  # Excluir header (0) y total (-1)
+    if not rows:
+        return []
+    
+    # Parse both columns once and compare them in a single vectorized step
+    # (non-numeric cells become NaN and never match)
+    rates = _numeric_column(rows, rate_col_idx)
+    targets = _numeric_column(rows, target_col_idx)
+    
+    # Only rows where the rate exceeds the target get styled
+    commands = []
+    for i in (np.flatnonzero(rates > targets) + 1).tolist():
+        commands.append(('BACKGROUND', (0, i), (-1, i), _BAR_EXCEED_COLOR))
+        commands.append(('TEXTCOLOR', (0, i), (-1, i), colors.white))
+    return commands
 
 
 def apply_rate_conditional_coloring(table_style, data, rate_col_idx=7, target_col_idx=8):
@@ -82,40 +311,137 @@ def apply_rate_conditional_coloring(table_style, data, rate_col_idx=7, target_co
         rate_col_idx: Index of the Rate column (default 7)
         target_col_idx: Index of the Target Rate column (default 8)
     """
-    for i in range(1, len(data) - 1):  # Excluir header (0) y total (-1)
-        try:
-            rate_str = str(data[i][rate_col_idx])
-            target_str = str(data[i][target_col_idx])
-            
-            # Convertir a float (remover $ si existe)
-            rate = float(rate_str.replace('$', '').replace(',', ''))
-            target = float(target_str.replace('$', '').replace(',', ''))
-            
-            # Si el rate excede el target, colorear la fila
-            if rate > target:
-                table_style.add('BACKGROUND', (0, i), (-1, i), colors.HexColor(COLOR_BAR_EXCEED))
-                table_style.add('TEXTCOLOR', (0, i), (-1, i), colors.white)
-        except (ValueError, IndexError):
-            pass
+    for command in rate_conditional_commands(data, rate_col_idx, target_col_idx):
+        table_style.add(*command)
 
 
-def apply_contributors_cumulative_coloring(table_style, data, cumulative_col_idx=5, threshold=80.0):
+def _cumulative_highlight_rows(data, cumulative_col_idx, threshold):
     """
-    Apply red tint to contributors rows until cumulative % reaches threshold
+    Rows of a contributors table whose cumulative % is within threshold
     
     Args:
-        table_style: TableStyle object to modify
-        data: List of lists with contributor data
-        cumulative_col_idx: Index of cumulative % column (default 5 = % Acumulado)
-        threshold: Cumulative percentage threshold (default 80.0%)
+        data: List of lists with contributor data (header first, total row last)
+        cumulative_col_idx: Index of cumulative % column
+        threshold: Cumulative percentage threshold
+    
+    Returns:
+        list of row indices in data
     """
+    highlighted = []
     # Iterate through data rows, excluding header (0) and total row (last)
     for i in range(1, len(data) - 1):
         try:
             cumulative_str = str(data[i][cumulative_col_idx]).replace('%', '').strip()
             cumulative = float(cumulative_str)
             if cumulative <= threshold:
-                table_style.add('BACKGROUND', (0, i), (-1, i), colors.HexColor('#FFCCCC'))
+                highlighted.append(i)
         except (ValueError, IndexError, AttributeError) as e:
             # Skip rows that can't be parsed
             pass
+    return highlighted
+
+
+def contributors_cumulative_commands(data, cumulative_col_idx=5, threshold=80.0):
+    """
+    Style commands that tint contributors rows until cumulative % reaches threshold
+    
+    Args:
+        data: List of lists with contributor data
+        cumulative_col_idx: Index of cumulative % column (default 5 = % Acumulado)
+        threshold: Cumulative percentage threshold (default 80.0%)
+    
+    Returns:
+        list of TableStyle commands
+    """
+    return [
+        ('BACKGROUND', (0, i), (-1, i), _CUMULATIVE_HIGHLIGHT_COLOR)
+        for i in _cumulative_highlight_rows(data, cumulative_col_idx, threshold)
+    ]
+
+
+def apply_contributors_cumulative_coloring(table_style, data, cumulative_col_idx=5, threshold=80.0):
+    """
+    Apply red tint to contributors rows until cumulative % reaches threshold
+    
+    Args:
+        table_style: TableStyle object to modify
+        data: List of lists with contributor data
+        cumulative_col_idx: Index of cumulative % column (default 5 = % Acumulado)
+        threshold: Cumulative percentage threshold (default 80.0%)
+    """
+    for command in contributors_cumulative_commands(data, cumulative_col_idx, threshold):
+        table_style.add(*command)
+
+
+def _column_widths(data, font_name='Helvetica-Bold', font_size=10, padding=12):
+    """
+    Width of each column: widest cell text plus cell padding
+    
+    Args:
+        data: List of lists with table data
+        font_name: Font used to measure (bold, the widest used in the table)
+        font_size: Font size in points
+        padding: Left + right cell padding in points
+    
+    Returns:
+        list of column widths in points
+    """
+    return [
+        max(stringWidth(str(cell), font_name, font_size) for cell in column) + padding
+        for column in zip(*data)
+    ]
+
+
+def build_contributors_tables(data, cumulative_col_idx=5, threshold=80.0, chunk_rows=CONTRIBUTORS_CHUNK_ROWS):
+    """
+    Build the styled contributors table, split in chunks when it is long
+    
+    Tables with up to chunk_rows contributor rows are built as a single
+    Table. Longer ones become one Table per chunk_rows rows, each with the
+    header (the TOTAL row stays in the last one), so ReportLab lays out
+    several small tables instead of one large one. The chunks share column
+    widths so their columns line up.
+    
+    Args:
+        data: List of lists with contributor data (header first, total row last)
+        cumulative_col_idx: Index of cumulative % column (default 5 = % Acumulado)
+        threshold: Cumulative percentage threshold (default 80.0%)
+        chunk_rows: Maximum contributor rows per table
+    
+    Returns:
+        list of Table objects, in order
+    """
+    if len(data) - 2 <= chunk_rows:
+        table = Table(data, repeatRows=1)
+        table.setStyle(get_contributors_table_style(
+            contributors_cumulative_commands(data, cumulative_col_idx, threshold)
+        ))
+        return [table]
+    
+    header, body, total_row = data[0], data[1:-1], data[-1]
+    highlighted = set(_cumulative_highlight_rows(data, cumulative_col_idx, threshold))
+    col_widths = _column_widths(data)
+    
+    tables = []
+    for start in range(0, len(body), chunk_rows):
+        chunk = [header] + body[start:start + chunk_rows]
+        commands = []
+        
+        # Only the last chunk ends with the TOTAL row; elsewhere the last row is a regular one
+        if start + chunk_rows >= len(body):
+            chunk.append(total_row)
+        else:
+            commands.append(('BACKGROUND', (0, -1), (-1, -1), _BG_CONTRIB_COLOR))
+            commands.append(('FONTNAME', (0, -1), (-1, -1), 'Helvetica'))
+        
+        # Chunk row i is row start + i of the full table
+        commands.extend(
+            ('BACKGROUND', (0, i), (-1, i), _CUMULATIVE_HIGHLIGHT_COLOR)
+            for i in range(1, len(chunk)) if start + i in highlighted
+        )
+        
+        table = Table(chunk, colWidths=col_widths, repeatRows=1)
+        table.setStyle(get_contributors_table_style(commands))
+        tables.append(table)
+    
+    return tables
@@ -2,7 +2,6 @@
 Annual PDF Report Generator - Refactored to use BasePDFGenerator
 """
 
-import os
 import pandas as pd
 from reportlab.platypus import Table
 from reportlab.lib.units import inch
@@ -10,13 +9,16 @@ import logging
 
 from src.pdf.base_generator import BasePDFGenerator
 from src.pdf.components import (
-    get_main_table_style, get_contributors_table_style,
-    apply_contributors_cumulative_coloring, apply_rate_conditional_coloring
+    get_main_table_style, rate_conditional_commands,
+    MAIN_TABLE_FORMATS, format_columns, format_month_columns, build_table_data
 )
-from config import MONTHS_NUM_TO_ES, TARGET_RATES, ANNUAL_REPORTS_FOLDER
+from config import ANNUAL_REPORTS_FOLDER
 
 logger = logging.getLogger(__name__)
 
+# Header row of the main table
+_MAIN_TABLE_HEADERS = ('Mes', 'Trimestre', 'Año', 'Scrap', 'Hrs Prod.', 'Venta (dls)', 'Rate', 'Target Rate')
+
 
 class AnnualPDFGenerator(BasePDFGenerator):
     """PDF Generator for annual scrap rate reports"""
@@ -30,9 +32,10 @@ class AnnualPDFGenerator(BasePDFGenerator):
             # For annual, we check the total rate against average target
             total_rate = df['Rate'].iloc[-1] if 'Rate' in df.columns else 0.0
             
-            # Calculate average target from all months
-            target_vals = pd.to_numeric(df['Target Rate'], errors='coerce').dropna()
-            target_rate = target_vals.mean() if len(target_vals) > 0 else 0.0
+            # Calculate average target from all months (mean skips non-numeric cells)
+            target_rate = pd.to_numeric(df['Target Rate'], errors='coerce').mean()
+            if pd.isna(target_rate):
+                target_rate = 0.0
             
             within = total_rate <= target_rate
             return within, total_rate, target_rate
@@ -42,66 +45,18 @@ class AnnualPDFGenerator(BasePDFGenerator):
     
     def _build_main_table_data(self, df):
         """Build main annual report table data (by months)"""
-        data = []
-        headers = ['Mes', 'Trimestre', 'Año', 'Scrap', 'Hrs Prod.', 'Venta (dls)', 'Rate', 'Target Rate']
-        data.append(headers)
+        # Format whole columns (numeric columns converted once, no per-cell type checks);
+        # Month and Target Rate come from each row's month number
+        formatted = format_columns(df, MAIN_TABLE_FORMATS)
+        format_month_columns(df, formatted)
         
-        for _, row in df.iterrows():
-            row_data = []
-            month_value = None
-            
-            for col in df.columns:
-                value = row[col]
-                
-                # Mes traducido
-                if col == 'Month':
-                    if isinstance(value, int):
-                        month_value = value
-                        row_data.append(MONTHS_NUM_TO_ES.get(value, str(value)))
-                    else:
-                        row_data.append(str(value))
-                
-                # Target Rate - usar el del mes específico
-                elif col == 'Target Rate':
-                    if month_value and isinstance(month_value, int):
-                        target_rate = TARGET_RATES.get(month_value, 0.0)
-                        row_data.append(f"{target_rate:.2f}")
-                    else:
-                        row_data.append(str(value) if value != '' else '')
-                
-                # Formatear columnas numéricas
-                elif col == 'Scrap':
-                    row_data.append(f"${value:,.2f}" if isinstance(value, (int, float)) else str(value))
-                elif col in ['Hrs Prod.', 'Rate']:
-                    row_data.append(f"{value:.2f}" if isinstance(value, (int, float)) else str(value))
-                elif col == '$ Venta (dls)':
-                    row_data.append(f"${value:,.0f}" if isinstance(value, (int, float)) else str(value))
-                else:
-                    row_data.append(str(value) if value != '' else '')
-            
-            data.append(row_data)
-        
-        return data
+        return build_table_data(_MAIN_TABLE_HEADERS, formatted)
     
     def _build_contributors_table_data(self, contributors_df):
-        """Build contributors table data"""
-        contrib_data = []
-        contrib_headers = ['Ranking', 'Número de parte', 'Descripción', 'Cantidad', 'Monto (USD)', '% Acumulado', 'Celda']
-        contrib_data.append(contrib_headers)
-        
-        for index, row in contributors_df.iterrows():
-            row_data = [
-                str(row.get('Lugar', '')),  # Ranking
-                str(row.get('Número de Parte', '')),  # Número de parte
-                str(row.get('Descripción', '')),  # Descripción
-                f"{row.get('Cantidad Scrapeada', 0):,.2f}" if isinstance(row.get('Cantidad Scrapeada'), (int, float)) else str(row.get('Cantidad Scrapeada', '')),  # Cantidad
-                f"${row.get('Monto (dls)', 0):,.2f}" if isinstance(row.get('Monto (dls)'), (int, float)) else str(row.get('Monto (dls)', '')),  # Monto (USD)
-                f"{row.get('% Acumulado', 0):.2f}%" if isinstance(row.get('% Acumulado'), (int, float)) else str(row.get('% Acumulado', '')),  # % Acumulado
-                str(row.get('Ubicación', ''))  # Celda (mapea de Ubicación)
-            ]
-            contrib_data.append(row_data)
-        
-        return contrib_data
+        """Build contributors table data (fixed column order, '' for missing columns)"""
+        columns = ['Lugar', 'Número de Parte', 'Descripción', 'Cantidad Scrapeada',
+                   'Monto (dls)', '% Acumulado', 'Ubicación']
+        return super()._build_contributors_table_data(contributors_df.reindex(columns=columns, fill_value=''))
     
     def generate(self, df, contributors_df, year, scrap_df=None, ventas_df=None, horas_df=None):
         """
@@ -132,7 +87,7 @@ class AnnualPDFGenerator(BasePDFGenerator):
         
         # Create filename and document
         filename = f"Scrap_Rate_Anual_{year}.pdf"
-        filepath = os.path.join(self.output_folder, filename)
+        filepath = self._output_path(filename)
         doc = self._create_document(filepath)
         
         # Reset elements
@@ -149,11 +104,9 @@ class AnnualPDFGenerator(BasePDFGenerator):
         table_data = self._build_main_table_data(df)
         table = Table(table_data, repeatRows=1)
         
-        table_style = get_main_table_style()
         # Apply conditional coloring: paint rows gray where rate > target
-        apply_rate_conditional_coloring(table_style, table_data, rate_col_idx=6, target_col_idx=7)
-        
-        table.setStyle(table_style)
+        coloring = rate_conditional_commands(table_data, rate_col_idx=6, target_col_idx=7)
+        table.setStyle(get_main_table_style(commands=coloring))
         self.elements.append(table)
         
         # ============ CONTRIBUTORS SECTION (Same page) ============
@@ -166,13 +119,7 @@ class AnnualPDFGenerator(BasePDFGenerator):
             
             # Build contributors table
             contrib_data = self._build_contributors_table_data(contributors_df)
-            contrib_table = Table(contrib_data, repeatRows=1)
-            
-            contrib_table_style = get_contributors_table_style()
-            apply_contributors_cumulative_coloring(contrib_table_style, contrib_data, cumulative_col_idx=5, threshold=80.0)
-            
-            contrib_table.setStyle(contrib_table_style)
-            self.elements.append(contrib_table)
+            self._add_contributors_table(contrib_data, cumulative_col_idx=5)
         
         # Build PDF
         self.build_and_save(doc)
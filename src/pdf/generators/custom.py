@@ -3,15 +3,33 @@ custom.py - Generador PDF para reportes de rango de fechas personalizado
 """
 
 from src.pdf.base_generator import BasePDFGenerator
-from src.pdf.components import get_main_table_style, get_contributors_table_style, apply_contributors_cumulative_coloring
+from src.pdf.components import (
+    get_main_table_style, get_contributors_table_style,
+    format_column, format_columns, build_table_rows
+)
 from src.pdf.styles import get_section_title_style
 from config import CUSTOM_REPORTS_FOLDER
 from reportlab.platypus import Table, Paragraph
 from reportlab.lib.units import inch
-import os
 import pandas as pd
 
 
+# Columnas de la tabla principal, valor para las que falten y formato numérico
+_MAIN_TABLE_COLUMNS = ('Date', 'Scrap', 'Hrs Prod.', '$ Venta (dls)', 'Rate')
+_MAIN_TABLE_DEFAULTS = {'Scrap': 0, 'Hrs Prod.': 0, '$ Venta (dls)': 0, 'Rate': 0}
+_MAIN_TABLE_FORMATS = {
+    'Scrap': '{:.2f}',
+    'Hrs Prod.': '{:.2f}',
+    '$ Venta (dls)': '${:,.2f}',
+    'Rate': '{:.4f}',
+}
+
+# Encabezados de las tablas (constantes, se copian a cada reporte)
+_MAIN_TABLE_HEADERS = ('Fecha', 'Scrap', 'Hrs Prod.', '$ Venta (dls)', 'Rate')
+_CONTRIBUTORS_TABLE_HEADERS = ('Lugar', 'Número de Parte', 'Descripción', 'Ubicación', 'Cantidad', 'Monto (USD)', '% Acumulado')
+_REASONS_TABLE_HEADERS = ('Razón', 'Total Scrap', 'Cantidad', '% del Total')
+
+
 class CustomPDFGenerator(BasePDFGenerator):
     """Generador de PDF para reportes personalizados (rango de fechas)"""
     
@@ -29,7 +47,7 @@ class CustomPDFGenerator(BasePDFGenerator):
             return False, 0.0, 0.5
         
         # Usar el rate promedio del periodo
-        total_rate = pd.to_numeric(df['Rate'].mean(), errors='coerce')
+        total_rate = pd.to_numeric(df['Rate'], errors='coerce').mean()
         target_rate = 0.8  # Target al 80% (0.8)
         
         within = total_rate <= target_rate if not pd.isna(total_rate) else False
@@ -39,28 +57,21 @@ class CustomPDFGenerator(BasePDFGenerator):
         """
         Construye los datos de la tabla principal
         
+        Args:
+            df: DataFrame del periodo, no vacío (generate() solo llama con datos)
+        
         Returns:
             list: Lista con headers y filas de datos
         """
-        if df is None or df.empty:
-            return [['Sin datos disponibles']]
-        
-        data = []
-        
         # Headers
-        headers = ['Fecha', 'Scrap', 'Hrs Prod.', '$ Venta (dls)', 'Rate']
-        data.append(headers)
+        data = [list(_MAIN_TABLE_HEADERS)]
         
         # Rows (el processor ya incluye la fila TOTAL)
-        for _, row in df.iterrows():
-            row_data = [
-                str(row.get('Date', '')),
-                f"{row.get('Scrap', 0):.2f}",
-                f"{row.get('Hrs Prod.', 0):.2f}",
-                f"${row.get('$ Venta (dls)', 0):,.2f}",
-                f"{row.get('Rate', 0):.4f}"
-            ]
-            data.append(row_data)
+        # Cada columna se formatea completa; las que falten usan su valor por defecto.
+        # format_column usa np.char.mod en columnas numéricas y convierte las mixtas
+        # (celdas '' de la fila TOTAL) con to_numeric
+        table_df = self._select_columns(df, _MAIN_TABLE_COLUMNS, _MAIN_TABLE_DEFAULTS)
+        data.extend(build_table_rows(format_columns(table_df, _MAIN_TABLE_FORMATS)))
         
         return data
     
@@ -68,51 +79,45 @@ class CustomPDFGenerator(BasePDFGenerator):
         """
         Construye los datos de la tabla de contribuidores
         
+        Args:
+            contributors_df: DataFrame de contribuidores, no vacío (generate() solo llama con datos)
+        
         Returns:
             list: Lista con headers y filas de contribuidores
         """
-        if contributors_df is None or contributors_df.empty:
-            return None
-        
-        data = []
-        
         # Headers - ahora con todas las columnas
-        headers = ['Lugar', 'Número de Parte', 'Descripción', 'Ubicación', 'Cantidad', 'Monto (USD)', '% Acumulado']
-        data.append(headers)
+        data = [list(_CONTRIBUTORS_TABLE_HEADERS)]
         
         # Rows
-        for _, row in contributors_df.iterrows():
-            # Detectar fila TOTAL
-            is_total = str(row.get('Lugar', '')).upper() == 'TOTAL'
-            
-            lugar = str(row.get('Lugar', ''))
-            numero_parte = str(row.get('Número de Parte', ''))
-            descripcion = str(row.get('Descripción', ''))[:40]  # Limitar descripción
-            ubicacion = str(row.get('Ubicación', ''))
-            cantidad = row.get('Cantidad Scrapeada', 0)
-            monto = row.get('Monto (dls)', 0)
-            acum = row.get('% Acumulado', '')
-            
-            # Formatear valores
-            if is_total:
-                cantidad_fmt = f"{int(cantidad):,}" if cantidad != '' else ''
-                monto_fmt = f"${monto:,.2f}" if monto != '' else ''
-                acum_fmt = ''
-            else:
-                cantidad_fmt = f"{int(cantidad):,}"
-                monto_fmt = f"${monto:,.2f}"
-                acum_fmt = f"{acum:.1f}%" if acum != '' else ''
-            
-            row_data = [
-                lugar,
-                numero_parte,
-                descripcion,
-                ubicacion,
-                cantidad_fmt,
-                monto_fmt,
-                acum_fmt
-            ]
-            data.append(row_data)
+        columns = ['Lugar', 'Número de Parte', 'Descripción', 'Ubicación',
+                   'Cantidad Scrapeada', 'Monto (dls)', '% Acumulado']
+        defaults = {'Cantidad Scrapeada': 0, 'Monto (dls)': 0}
+        table_df = self._select_columns(contributors_df, columns, defaults)
+        
+        # Columnas de texto convertidas completas (descripción limitada a 40 caracteres)
+        lugar = table_df['Lugar'].map(str)
+        numero_parte = table_df['Número de Parte'].map(str)
+        descripcion = table_df['Descripción'].map(str).str.slice(0, 40)
+        ubicacion = table_df['Ubicación'].map(str)
+        
+        # Detectar fila TOTAL una sola vez para toda la columna
+        is_total = lugar.str.upper().eq('TOTAL').to_numpy()
+        
+        # Formatear valores (celdas vacías se quedan vacías; % Acumulado vacío en TOTAL)
+        # Monto y % Acumulado se formatean por columna completa; Cantidad se trunca a entero
+        cantidad_fmt = table_df['Cantidad Scrapeada'].map(lambda value: '' if value == '' else f"{int(value):,}")
+        monto_fmt = format_column(table_df['Monto (dls)'], '${:,.2f}')
+        acum_fmt = format_column(table_df['% Acumulado'].where(~is_total, ''), '{:.1f}%')
+        
+        data.extend(build_table_rows([
+            lugar,
+            numero_parte,
+            descripcion,
+            ubicacion,
+            cantidad_fmt,
+            monto_fmt,
+            acum_fmt
+        ]))
         
         return data
     
@@ -120,27 +125,22 @@ class CustomPDFGenerator(BasePDFGenerator):
         """
         Construye los datos de la tabla de razones de scrap
         
+        Args:
+            reasons_df: DataFrame de razones, no vacío (generate() solo llama con datos)
+        
         Returns:
             list: Lista con headers y filas de razones
         """
-        if reasons_df is None or reasons_df.empty:
-            return None
-        
-        data = []
-        
         # Headers
-        headers = ['Razón', 'Total Scrap', 'Cantidad', '% del Total']
-        data.append(headers)
+        data = [list(_REASONS_TABLE_HEADERS)]
         
-        # Rows
-        for _, row in reasons_df.iterrows():
-            row_data = [
-                str(row.get('Reason', '')),
-                f"{row.get('Total Scrap', 0):.2f}",
-                str(row.get('Count', 0)),
-                f"{row.get('% of Total', 0):.2f}%"
-            ]
-            data.append(row_data)
+        # Rows (una comprensión sobre tuplas, sin append por fila)
+        columns = ['Reason', 'Total Scrap', 'Count', '% of Total']
+        defaults = {'Total Scrap': 0, 'Count': 0, '% of Total': 0}
+        data.extend([
+            [str(reason), f"{total_scrap:.2f}", str(count), f"{pct:.2f}%"]
+            for reason, total_scrap, count, pct in self._iter_rows(reasons_df, columns, defaults)
+        ])
         
         return data
     
@@ -185,7 +185,7 @@ class CustomPDFGenerator(BasePDFGenerator):
         if output_path is None:
             self._ensure_output_folder()
             filename = f"Scrap_Rate_Custom_{start_str_filename}_{end_str_filename}.pdf"
-            output_path = os.path.join(self.output_folder, filename)
+            output_path = self._output_path(filename)
         
         doc = self._create_document(output_path)
         self.elements = []
@@ -220,24 +220,18 @@ class CustomPDFGenerator(BasePDFGenerator):
             self._add_section_title("PRINCIPALES CONTRIBUIDORES")
             
             contrib_data = self._build_contributors_table_data(contributors_df)
-            if contrib_data:
-                contrib_table = Table(contrib_data, repeatRows=1)
-                contrib_table_style = get_contributors_table_style()
-                apply_contributors_cumulative_coloring(contrib_table_style, contrib_data, cumulative_col_idx=6, threshold=80.0)
-                contrib_table.setStyle(contrib_table_style)
-                self.elements.append(contrib_table)
-                
-                self._add_spacer(0.4)
+            self._add_contributors_table(contrib_data, cumulative_col_idx=6)
+            
+            self._add_spacer(0.4)
         
         # ========== PRINCIPALES RAZONES ==========
         if reasons_df is not None and not reasons_df.empty:
             self._add_section_title("PRINCIPALES RAZONES DE SCRAP")
             
             reasons_data = self._build_reasons_table_data(reasons_df)
-            if reasons_data:
-                reasons_table = Table(reasons_data, repeatRows=1)
-                reasons_table.setStyle(get_contributors_table_style())
-                self.elements.append(reasons_table)
+            reasons_table = Table(reasons_data, repeatRows=1)
+            reasons_table.setStyle(get_contributors_table_style())
+            self.elements.append(reasons_table)
         
         # Build PDF
         return self.build_and_save(doc)
@@ -2,23 +2,29 @@
 Quarterly PDF Report Generator - Refactored to use BasePDFGenerator
 """
 
-import os
 import pandas as pd
-from reportlab.platypus import Table, Paragraph
+from reportlab.platypus import Table, Paragraph, TableStyle
 from reportlab.lib.units import inch
-from reportlab.lib import colors
 import logging
 
 from src.pdf.base_generator import BasePDFGenerator
+from src.pdf.styles import (
+    get_comparison_title_style, get_comparison_note_style, get_comparison_note_text,
+    COMPARISON_TABLE_STYLE_COMMANDS, COMPARISON_IMPROVEMENT_COLOR,
+    COMPARISON_DETERIORATION_COLOR, COMPARISON_NEUTRAL_COLOR
+)
 from src.pdf.components import (
-    get_main_table_style, get_contributors_table_style,
-    apply_contributors_cumulative_coloring, apply_rate_conditional_coloring
+    get_main_table_style, rate_conditional_commands,
+    MAIN_TABLE_FORMATS, format_columns, format_month_columns, build_table_data
 )
-from config import MONTHS_NUM_TO_ES, TARGET_RATES, QUARTERLY_REPORTS_FOLDER
+from config import TARGET_RATES, QUARTERLY_REPORTS_FOLDER
 from src.analysis.period_comparison import PeriodComparison
 
 logger = logging.getLogger(__name__)
 
+# Header row of the main table
+_MAIN_TABLE_HEADERS = ('Mes', 'Trimestre', 'Año', 'Scrap', 'Hrs Prod.', 'Venta (dls)', 'Rate', 'Target Rate')
+
 QUARTERS_ES = {
     1: "Primer Trimestre (Q1)",
     2: "Segundo Trimestre (Q2)",
@@ -38,9 +44,7 @@ class QuarterlyPDFGenerator(BasePDFGenerator):
         try:
             # For quarterly, we check the total rate against average target
             # Convert Rate to numeric to handle potential string values
-            total_rate = pd.to_numeric(df['Rate'].iloc[-1], errors='coerce')
-            if pd.isna(total_rate):
-                total_rate = 0.0
+            total_rate = self._to_float(df['Rate'].iat[-1])
             
             # Calculate average target from the months in this quarter
             # Get month values to look up their targets from config
@@ -48,7 +52,9 @@ class QuarterlyPDFGenerator(BasePDFGenerator):
                 months = df['Month'].dropna()
                 # Exclude the 'Total' row
                 months = months[months != 'Total']
-                target_sum = sum(TARGET_RATES.get(int(m), 0.0) for m in months if isinstance(m, (int, float)))
+                # Target of every month in one lookup (0.0 for cells that are not a month number)
+                month_numbers = pd.to_numeric(months, errors='coerce')
+                target_sum = month_numbers.map(TARGET_RATES).fillna(0.0).sum()
                 target_rate = target_sum / len(months) if len(months) > 0 else 0.0
             else:
                 target_rate = 0.0
@@ -61,86 +67,18 @@ class QuarterlyPDFGenerator(BasePDFGenerator):
     
     def _build_main_table_data(self, df):
         """Build main quarterly report table data (by months)"""
-        data = []
-        headers = ['Mes', 'Trimestre', 'Año', 'Scrap', 'Hrs Prod.', 'Venta (dls)', 'Rate', 'Target Rate']
-        data.append(headers)
-        
-        for index, row in df.iterrows():
-            row_data = []
-            month_value = None
-            
-            for col in df.columns:
-                value = row[col]
-                
-                # Mes traducido
-                if col == 'Month':
-                    if isinstance(value, int):
-                        month_value = value
-                        row_data.append(MONTHS_NUM_TO_ES.get(value, str(value)))
-                    else:
-                        row_data.append(str(value))
-                
-                # Target Rate - usar el del mes específico
-                elif col == 'Target Rate':
-                    if month_value and isinstance(month_value, int):
-                        target_rate = TARGET_RATES.get(month_value, 0.0)
-                        row_data.append(f"{target_rate:.2f}")
-                    else:
-                        row_data.append(str(value) if value != '' else '')
-                
-                # Formatear columnas numéricas
-                elif col == 'Scrap':
-                    row_data.append(f"${value:,.2f}" if isinstance(value, (int, float)) else str(value))
-                elif col in ['Hrs Prod.', 'Rate']:
-                    row_data.append(f"{value:.2f}" if isinstance(value, (int, float)) else str(value))
-                elif col == '$ Venta (dls)':
-                    row_data.append(f"${value:,.0f}" if isinstance(value, (int, float)) else str(value))
-                else:
-                    row_data.append(str(value) if value != '' else '')
-            
-            data.append(row_data)
+        # Format whole columns (numeric columns converted once, no per-cell type checks);
+        # Month and Target Rate come from each row's month number
+        formatted = format_columns(df, MAIN_TABLE_FORMATS)
+        format_month_columns(df, formatted)
         
-        return data
-    
-    def _build_contributors_table_data(self, contributors_df):
-        """Build contributors table data"""
-        contrib_data = []
-        contrib_headers = ['Ranking', 'Número de parte', 'Descripción', 'Cantidad', 'Monto (USD)', '% Acumulado', 'Celda']
-        contrib_data.append(contrib_headers)
-        
-        for index, row in contributors_df.iterrows():
-            row_data = []
-            for col in contributors_df.columns:
-                value = row[col]
-                if col == 'Cantidad Scrapeada':
-                    row_data.append(f"{value:,.2f}" if isinstance(value, (int, float)) else str(value))
-                elif col == 'Monto (dls)':
-                    row_data.append(f"${value:,.2f}" if isinstance(value, (int, float)) else str(value))
-                elif col == '% Acumulado':
-                    row_data.append(f"{value:.2f}%" if isinstance(value, (int, float)) else str(value))
-                else:
-                    row_data.append(str(value))
-            contrib_data.append(row_data)
-        
-        return contrib_data
+        return build_table_data(_MAIN_TABLE_HEADERS, formatted)
     
     def _add_comparison_section(self, comparison: PeriodComparison):
         """Add period comparison section to PDF"""
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.platypus import Paragraph, TableStyle
-        from reportlab.lib.enums import TA_CENTER
-        
-        styles = getSampleStyleSheet()
-        
         # Título de sección centrado
         self._add_spacer(0.3)
-        title_style = ParagraphStyle(
-            'ComparisonTitle',
-            parent=styles['Heading2'],
-            alignment=TA_CENTER,
-            fontSize=12,
-            textColor=colors.HexColor('#333333')
-        )
+        title_style = get_comparison_title_style()
         title = Paragraph("<b>COMPARACIÓN CON PERIODO ANTERIOR</b>", title_style)
         self.elements.append(title)
         self._add_spacer(0.2)
@@ -169,78 +107,54 @@ class QuarterlyPDFGenerator(BasePDFGenerator):
         ])
         
         # Fila de Horas Producción con indicador
-        hours_indicator = "↓" if comparison.hours_change_pct < 0 else ("↑" if comparison.hours_change_pct > 1 else "→")
+        hours_pct = comparison.hours_change_pct
+        hours_indicator = "↓" if hours_pct < 0 else ("↑" if hours_pct > 1 else "→")
         comparison_data.append([
             'Hrs. Producción',
             f"{comparison.previous_total_hours:,.0f}",
             f"{comparison.current_total_hours:,.0f}",
-            f"{hours_indicator} {comparison.hours_change_pct:+.1f}%"
+            f"{hours_indicator} {hours_pct:+.1f}%"
         ])
         
         comparison_table = Table(comparison_data, colWidths=[2.2*inch, 1.8*inch, 1.8*inch, 1.2*inch])
         
-        table_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0d47a1')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 1), (-1, -1), 'MIDDLE'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BOX', (0, 0), (-1, -1), 1.5, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#e3f2fd')]),
-        ])
+        table_styles = list(COMPARISON_TABLE_STYLE_COMMANDS)
         
         if comparison.is_improvement():
-            table_style.add('TEXTCOLOR', (3, 1), (3, 1), colors.HexColor('#2e7d32'))
-            table_style.add('FONTNAME', (3, 1), (3, 1), 'Helvetica-Bold')
+            table_styles.append(('TEXTCOLOR', (3, 1), (3, 1), COMPARISON_IMPROVEMENT_COLOR))
+            table_styles.append(('FONTNAME', (3, 1), (3, 1), 'Helvetica-Bold'))
         elif comparison.rate_change_pct > 1:
-            table_style.add('TEXTCOLOR', (3, 1), (3, 1), colors.HexColor('#c62828'))
-            table_style.add('FONTNAME', (3, 1), (3, 1), 'Helvetica-Bold')
+            table_styles.append(('TEXTCOLOR', (3, 1), (3, 1), COMPARISON_DETERIORATION_COLOR))
+            table_styles.append(('FONTNAME', (3, 1), (3, 1), 'Helvetica-Bold'))
         
         if comparison.scrap_change_abs < 0:
-            table_style.add('TEXTCOLOR', (3, 2), (3, 2), colors.HexColor('#2e7d32'))
-            table_style.add('FONTNAME', (3, 2), (3, 2), 'Helvetica-Bold')
+            table_styles.append(('TEXTCOLOR', (3, 2), (3, 2), COMPARISON_IMPROVEMENT_COLOR))
+            table_styles.append(('FONTNAME', (3, 2), (3, 2), 'Helvetica-Bold'))
         elif comparison.scrap_change_abs > 0:
-            table_style.add('TEXTCOLOR', (3, 2), (3, 2), colors.HexColor('#c62828'))
-            table_style.add('FONTNAME', (3, 2), (3, 2), 'Helvetica-Bold')
+            table_styles.append(('TEXTCOLOR', (3, 2), (3, 2), COMPARISON_DETERIORATION_COLOR))
+            table_styles.append(('FONTNAME', (3, 2), (3, 2), 'Helvetica-Bold'))
         
         # Hrs. Producción (fila 3) - Lógica invertida: menos horas = rojo (deterioro)
-        if comparison.hours_change_pct < -1:  # Disminución significativa de horas = ROJO (malo)
-            table_style.add('TEXTCOLOR', (3, 3), (3, 3), colors.HexColor('#c62828'))
-            table_style.add('FONTNAME', (3, 3), (3, 3), 'Helvetica-Bold')
-        elif comparison.hours_change_pct > 1:  # Aumento de horas = VERDE (bueno)
-            table_style.add('TEXTCOLOR', (3, 3), (3, 3), colors.HexColor('#2e7d32'))
-            table_style.add('FONTNAME', (3, 3), (3, 3), 'Helvetica-Bold')
+        if hours_pct < -1:  # Disminución significativa de horas = ROJO (malo)
+            table_styles.append(('TEXTCOLOR', (3, 3), (3, 3), COMPARISON_DETERIORATION_COLOR))
+            table_styles.append(('FONTNAME', (3, 3), (3, 3), 'Helvetica-Bold'))
+        elif hours_pct > 1:  # Aumento de horas = VERDE (bueno)
+            table_styles.append(('TEXTCOLOR', (3, 3), (3, 3), COMPARISON_IMPROVEMENT_COLOR))
+            table_styles.append(('FONTNAME', (3, 3), (3, 3), 'Helvetica-Bold'))
         else:  # Cambio menor a 1% = GRIS (neutral)
-            table_style.add('TEXTCOLOR', (3, 3), (3, 3), colors.HexColor('#666666'))
+            table_styles.append(('TEXTCOLOR', (3, 3), (3, 3), COMPARISON_NEUTRAL_COLOR))
         
-        comparison_table.setStyle(table_style)
+        comparison_table.setStyle(TableStyle(table_styles))
         self.elements.append(comparison_table)
         
         self._add_spacer(0.15)
-        note_style = ParagraphStyle(
-            'ComparisonNote',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#666666'),
-            alignment=TA_CENTER
-        )
+        note_style = get_comparison_note_style()
         
-        rate_indicator = comparison.get_rate_indicator()
-        scrap_indicator = comparison.get_scrap_indicator()
-        hours_indicator = '→' if abs(comparison.hours_change_pct) < 1 else ('↓' if comparison.hours_change_pct < 0 else '↑')
+        # Indicadores de rate/scrap ya calculados para la tabla; en la nota, horas con cambio menor a 1% = sin cambio
+        hours_indicator = '→' if abs(hours_pct) < 1 else ('↓' if hours_pct < 0 else '↑')
         
         note = Paragraph(
-            f"<i><font color='#2e7d32'><b>↓</b></font> = Mejora (reducción) | "
-            f"<font color='#c62828'><b>↑</b></font> = Deterioro (aumento) | "
-            f"<font color='#666666'><b>→</b></font> = Sin cambio significativo (&lt;1%)<br/>"
-            f"<b>Indicadores:</b> Scrap Rate {rate_indicator} | Total Scrap {scrap_indicator} | Horas Prod. {hours_indicator}</i>",
+            get_comparison_note_text(rate_indicator, scrap_indicator, hours_indicator),
             note_style
         )
         self.elements.append(note)
@@ -275,7 +189,23 @@ class QuarterlyPDFGenerator(BasePDFGenerator):
         
         # Create filename and document
         filename = f"Scrap_Rate_Q{quarter}_{year}.pdf"
-        filepath = os.path.join(self.output_folder, filename)
+        filepath = self._output_path(filename)
+        
+        # Reuse the PDF already built for the same inputs
+        report_key = self._report_key(filepath, df, contributors_df, quarter, year, comparison)
+        cached_path = self._get_cached_report(report_key)
+        if cached_path is not None:
+            return cached_path
+        
+        title_text = "REPORTE TRIMESTRAL DE SCRAP RATE"
+        subtitle_text = f"{quarter_name} | Año {year} | Reporte generado automáticamente por Metric Scrap System"
+        
+        # Period without rows: one-page "no data" report, nothing to format
+        if df.empty:
+            self._build_empty_report(filepath, title_text, subtitle_text)
+            self._store_cached_report(report_key, filepath)
+            return filepath
+        
         doc = self._create_document(filepath)
         
         # Reset elements
@@ -283,8 +213,7 @@ class QuarterlyPDFGenerator(BasePDFGenerator):
         
         # ============ PAGE 1: MAIN REPORT ============
         # Add title and subtitle
-        self._add_main_title("REPORTE TRIMESTRAL DE SCRAP RATE")
-        subtitle_text = f"{quarter_name} | Año {year} | Reporte generado automáticamente por Metric Scrap System"
+        self._add_main_title(title_text)
         self._add_subtitle(subtitle_text)
         self._add_spacer(0.15)
         
@@ -300,11 +229,9 @@ class QuarterlyPDFGenerator(BasePDFGenerator):
         table_data = self._build_main_table_data(df)
         table = Table(table_data, repeatRows=1)
         
-        table_style = get_main_table_style()
         # Apply conditional coloring: paint rows gray where rate > target
-        apply_rate_conditional_coloring(table_style, table_data, rate_col_idx=6, target_col_idx=7)
-        
-        table.setStyle(table_style)
+        coloring = rate_conditional_commands(table_data, rate_col_idx=6, target_col_idx=7)
+        table.setStyle(get_main_table_style(commands=coloring))
         self.elements.append(table)
         
         # ============ CONTRIBUTORS SECTION (Same page) ============
@@ -317,16 +244,11 @@ class QuarterlyPDFGenerator(BasePDFGenerator):
             
             # Build contributors table
             contrib_data = self._build_contributors_table_data(contributors_df)
-            contrib_table = Table(contrib_data, repeatRows=1)
-            
-            contrib_table_style = get_contributors_table_style()
-            apply_contributors_cumulative_coloring(contrib_table_style, contrib_data, cumulative_col_idx=5, threshold=80.0)
-            
-            contrib_table.setStyle(contrib_table_style)
-            self.elements.append(contrib_table)
+            self._add_contributors_table(contrib_data, cumulative_col_idx=5)
         
         # Build PDF
         self.build_and_save(doc)
+        self._store_cached_report(report_key, filepath)
         
         return filepath
 
@@ -3,24 +3,32 @@ Weekly PDF Report Generator - Refactored to use BasePDFGenerator
 """
 
 import os
+import numpy as np
 import pandas as pd
 import logging
-from reportlab.platypus import Table, Spacer, Paragraph
+from reportlab.platypus import Table, Spacer, Paragraph, TableStyle
 from reportlab.lib.units import inch
-from reportlab.lib import colors
 
 from src.pdf.base_generator import BasePDFGenerator
+from src.pdf.styles import (
+    get_comparison_title_style, get_comparison_note_style, get_comparison_note_text,
+    COMPARISON_TABLE_STYLE_COMMANDS, COMPARISON_IMPROVEMENT_COLOR,
+    COMPARISON_DETERIORATION_COLOR, COMPARISON_NEUTRAL_COLOR
+)
 from src.pdf.components import (
-    get_main_table_style, get_contributors_table_style,
-    apply_rate_conditional_coloring, apply_contributors_cumulative_coloring
+    get_main_table_style, rate_conditional_commands,
+    MAIN_TABLE_FORMATS, format_columns, build_table_data
 )
 from config import (
-    WEEK_REPORTS_FOLDER, DAYS_ES, MONTHS_NUM_TO_ES
+    WEEK_REPORTS_FOLDER, DAYS_ES, MONTHS_NUM_TO_ES_ARR
 )
 from src.analysis.period_comparison import PeriodComparison
 
 logger = logging.getLogger(__name__)
 
+# Header row of the main table
+_MAIN_TABLE_HEADERS = ('Día', 'N° Día', 'Semana', 'Mes', 'Scrap', 'Hrs Prod.', 'Venta (dls)', 'Rate', 'Target Rate')
+
 
 class WeeklyPDFGenerator(BasePDFGenerator):
     """PDF Generator for weekly scrap rate reports"""
@@ -35,8 +43,9 @@ class WeeklyPDFGenerator(BasePDFGenerator):
             total_horas = pd.to_numeric(df['Hrs Prod.'], errors='coerce').sum()
             total_rate = total_scrap / total_horas if total_horas > 0 else 0
             
-            target_vals = pd.to_numeric(df['Target Rate'], errors='coerce').dropna().unique()
-            target_rate = float(target_vals[0]) if len(target_vals) > 0 else 0
+            # First numeric target of the week (no need to find every unique value)
+            target_vals = pd.to_numeric(df['Target Rate'], errors='coerce').dropna()
+            target_rate = float(target_vals.iat[0]) if len(target_vals) > 0 else 0
             
             within = total_rate <= target_rate
             return within, total_rate, target_rate
@@ -45,77 +54,33 @@ class WeeklyPDFGenerator(BasePDFGenerator):
     
     def _build_main_table_data(self, df, week):
         """Build main weekly report table data"""
-        data = []
-        headers = ['Día', 'N° Día', 'Semana', 'Mes', 'Scrap', 'Hrs Prod.', 'Venta (dls)', 'Rate', 'Target Rate']
-        data.append(headers)
-        
-        for index, row in df.iterrows():
-            row_data = []
-            for col in df.columns:
-                value = row[col]
-                if col == 'Scrap':
-                    row_data.append(f"${value:,.2f}" if isinstance(value, (int, float)) else str(value))
-                elif col in ['Hrs Prod.', 'Rate', 'Target Rate']:
-                    row_data.append(f"{value:.2f}" if isinstance(value, (int, float)) else str(value))
-                elif col == '$ Venta (dls)':
-                    row_data.append(f"${value:,.0f}" if isinstance(value, (int, float)) else str(value))
-                elif col == 'M':
-                    if isinstance(value, (int, float)):
-                        row_data.append(MONTHS_NUM_TO_ES.get(int(value), str(value)))
-                    else:
-                        row_data.append(str(value) if value != '' else '')
-                elif col == 'W':
-                    if str(value) != '':
-                        row_data.append(str(week))
-                    else:
-                        row_data.append('')
-                else:
-                    if col == 'Day' and str(value) in DAYS_ES:
-                        value = DAYS_ES[str(value)]
-                    row_data.append(str(value) if value != '' else '')
-            data.append(row_data)
-        
-        return data
-    
-    def _build_contributors_table_data(self, contributors_df):
-        """Build contributors table data"""
-        contrib_data = []
-        contrib_headers = ['Ranking', 'Número de parte', 'Descripción', 'Cantidad', 'Monto (USD)', '% Acumulado', 'Celda']
-        contrib_data.append(contrib_headers)
-        
-        for index, row in contributors_df.iterrows():
-            row_data = []
-            for col in contributors_df.columns:
-                value = row[col]
-                if col == 'Cantidad Scrapeada':
-                    row_data.append(f"{value:,.2f}" if isinstance(value, (int, float)) else str(value))
-                elif col == 'Monto (dls)':
-                    row_data.append(f"${value:,.2f}" if isinstance(value, (int, float)) else str(value))
-                elif col == '% Acumulado':
-                    row_data.append(f"{value:.2f}%" if isinstance(value, (int, float)) else str(value))
-                else:
-                    row_data.append(str(value))
-            contrib_data.append(row_data)
-        
-        return contrib_data
+        # Format whole columns (numeric columns converted once, no per-cell type checks)
+        formatted = format_columns(df, MAIN_TABLE_FORMATS)
+        
+        # Day name in Spanish (one dict lookup pass over the column)
+        if 'Day' in df.columns:
+            days = df['Day'].map(str)
+            formatted[df.columns.get_loc('Day')] = days.map(DAYS_ES).fillna(days)
+        
+        # Report week on every non-empty row
+        if 'W' in df.columns:
+            has_week = df['W'].map(str).to_numpy() != ''
+            formatted[df.columns.get_loc('W')] = np.where(has_week, str(week), '')
+        
+        # Month name in Spanish with a single fancy index (the total row holds text)
+        if 'M' in df.columns:
+            months = pd.to_numeric(df['M'], errors='coerce').fillna(0).to_numpy(dtype=int)
+            valid_month = (months >= 1) & (months <= 12)
+            month_names = MONTHS_NUM_TO_ES_ARR[np.where(valid_month, months, 0)]
+            formatted[df.columns.get_loc('M')] = np.where(valid_month, month_names, df['M'].map(str).to_numpy())
+        
+        return build_table_data(_MAIN_TABLE_HEADERS, formatted)
     
     def _add_comparison_section(self, comparison: PeriodComparison):
         """Add period comparison section to PDF"""
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.platypus import Paragraph, TableStyle
-        from reportlab.lib.enums import TA_CENTER
-        
-        styles = getSampleStyleSheet()
-        
         # Título de sección centrado
         self._add_spacer(0.3)
-        title_style = ParagraphStyle(
-            'ComparisonTitle',
-            parent=styles['Heading2'],
-            alignment=TA_CENTER,
-            fontSize=12,
-            textColor=colors.HexColor('#333333')
-        )
+        title_style = get_comparison_title_style()
         title = Paragraph("<b>COMPARACIÓN CON PERIODO ANTERIOR</b>", title_style)
         self.elements.append(title)
         self._add_spacer(0.05)
@@ -144,92 +109,61 @@ class WeeklyPDFGenerator(BasePDFGenerator):
         ])
         
         # Fila de Horas Producción con indicador
-        hours_indicator = "↓" if comparison.hours_change_pct < 0 else ("↑" if comparison.hours_change_pct > 1 else "→")
+        hours_pct = comparison.hours_change_pct
+        hours_indicator = "↓" if hours_pct < 0 else ("↑" if hours_pct > 1 else "→")
         comparison_data.append([
             'Hrs. Producción',
             f"{comparison.previous_total_hours:,.0f}",
             f"{comparison.current_total_hours:,.0f}",
-            f"{hours_indicator} {comparison.hours_change_pct:+.1f}%"
+            f"{hours_indicator} {hours_pct:+.1f}%"
         ])
         
         # Crear tabla con anchos ajustados
         comparison_table = Table(comparison_data, colWidths=[2.2*inch, 1.8*inch, 1.8*inch, 1.2*inch])
         
         # Estilo de tabla (misma paleta que tabla principal)
-        table_style = TableStyle([
-            # Header - mismo color que tabla principal
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0d47a1')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
-            
-            # Body
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 1), (-1, -1), 'MIDDLE'),
-            
-            # Borders
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BOX', (0, 0), (-1, -1), 1.5, colors.black),
-            
-            # Alternating rows - mismo patrón que tabla principal
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#e3f2fd')]),
-        ])
+        table_styles = list(COMPARISON_TABLE_STYLE_COMMANDS)
         
         # Colorear columna de cambio según mejora/deterioro
         # Scrap Rate (fila 1)
         if comparison.is_improvement():
-            table_style.add('TEXTCOLOR', (3, 1), (3, 1), colors.HexColor('#2e7d32'))
-            table_style.add('FONTNAME', (3, 1), (3, 1), 'Helvetica-Bold')
+            table_styles.append(('TEXTCOLOR', (3, 1), (3, 1), COMPARISON_IMPROVEMENT_COLOR))
+            table_styles.append(('FONTNAME', (3, 1), (3, 1), 'Helvetica-Bold'))
         elif comparison.rate_change_pct > 1:
-            table_style.add('TEXTCOLOR', (3, 1), (3, 1), colors.HexColor('#c62828'))
-            table_style.add('FONTNAME', (3, 1), (3, 1), 'Helvetica-Bold')
+            table_styles.append(('TEXTCOLOR', (3, 1), (3, 1), COMPARISON_DETERIORATION_COLOR))
+            table_styles.append(('FONTNAME', (3, 1), (3, 1), 'Helvetica-Bold'))
         
         # Total Scrap (fila 2)
         if comparison.scrap_change_abs < 0:
-            table_style.add('TEXTCOLOR', (3, 2), (3, 2), colors.HexColor('#2e7d32'))
-            table_style.add('FONTNAME', (3, 2), (3, 2), 'Helvetica-Bold')
+            table_styles.append(('TEXTCOLOR', (3, 2), (3, 2), COMPARISON_IMPROVEMENT_COLOR))
+            table_styles.append(('FONTNAME', (3, 2), (3, 2), 'Helvetica-Bold'))
         elif comparison.scrap_change_abs > 0:
-            table_style.add('TEXTCOLOR', (3, 2), (3, 2), colors.HexColor('#c62828'))
-            table_style.add('FONTNAME', (3, 2), (3, 2), 'Helvetica-Bold')
+            table_styles.append(('TEXTCOLOR', (3, 2), (3, 2), COMPARISON_DETERIORATION_COLOR))
+            table_styles.append(('FONTNAME', (3, 2), (3, 2), 'Helvetica-Bold'))
         
         # Hrs. Producción (fila 3) - Lógica invertida: menos horas = rojo (deterioro)
-        if comparison.hours_change_pct < -1:  # Disminución significativa de horas = ROJO (malo)
-            table_style.add('TEXTCOLOR', (3, 3), (3, 3), colors.HexColor('#c62828'))
-            table_style.add('FONTNAME', (3, 3), (3, 3), 'Helvetica-Bold')
-        elif comparison.hours_change_pct > 1:  # Aumento de horas = VERDE (bueno)
-            table_style.add('TEXTCOLOR', (3, 3), (3, 3), colors.HexColor('#2e7d32'))
-            table_style.add('FONTNAME', (3, 3), (3, 3), 'Helvetica-Bold')
+        if hours_pct < -1:  # Disminución significativa de horas = ROJO (malo)
+            table_styles.append(('TEXTCOLOR', (3, 3), (3, 3), COMPARISON_DETERIORATION_COLOR))
+            table_styles.append(('FONTNAME', (3, 3), (3, 3), 'Helvetica-Bold'))
+        elif hours_pct > 1:  # Aumento de horas = VERDE (bueno)
+            table_styles.append(('TEXTCOLOR', (3, 3), (3, 3), COMPARISON_IMPROVEMENT_COLOR))
+            table_styles.append(('FONTNAME', (3, 3), (3, 3), 'Helvetica-Bold'))
         else:  # Cambio menor a 1% = GRIS (neutral)
-            table_style.add('TEXTCOLOR', (3, 3), (3, 3), colors.HexColor('#666666'))
+            table_styles.append(('TEXTCOLOR', (3, 3), (3, 3), COMPARISON_NEUTRAL_COLOR))
         
-        comparison_table.setStyle(table_style)
+        comparison_table.setStyle(TableStyle(table_styles))
         self.elements.append(comparison_table)
         
         # Agregar nota explicativa con indicadores debajo de la tabla
         self._add_spacer(0.15)
-        note_style = ParagraphStyle(
-            'ComparisonNote',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor('#666666'),
-            alignment=TA_CENTER
-        )
+        note_style = get_comparison_note_style()
         
         # Construir indicadores con colores
-        rate_indicator = comparison.get_rate_indicator()
-        scrap_indicator = comparison.get_scrap_indicator()
-        hours_indicator = '→' if abs(comparison.hours_change_pct) < 1 else ('↓' if comparison.hours_change_pct < 0 else '↑')
+        # Indicadores de rate/scrap ya calculados para la tabla; en la nota, horas con cambio menor a 1% = sin cambio
+        hours_indicator = '→' if abs(hours_pct) < 1 else ('↓' if hours_pct < 0 else '↑')
         
         note = Paragraph(
-            f"<i><font color='#2e7d32'><b>↓</b></font> = Mejora (reducción) | "
-            f"<font color='#c62828'><b>↑</b></font> = Deterioro (aumento) | "
-            f"<font color='#666666'><b>→</b></font> = Sin cambio significativo (&lt;1%)<br/>"
-            f"<b>Indicadores:</b> Scrap Rate {rate_indicator} | Total Scrap {scrap_indicator} | Horas Prod. {hours_indicator}</i>",
+            get_comparison_note_text(rate_indicator, scrap_indicator, hours_indicator),
             note_style
         )
         self.elements.append(note)
@@ -262,7 +196,7 @@ class WeeklyPDFGenerator(BasePDFGenerator):
         
         # Create filename and document
         filename = f"Scrap_Rate_W{week}_{year}.pdf"
-        filepath = os.path.join(self.output_folder, filename)
+        filepath = self._output_path(filename)
         doc = self._create_document(filepath)
         
         # Reset elements
@@ -286,10 +220,8 @@ class WeeklyPDFGenerator(BasePDFGenerator):
         table_data = self._build_main_table_data(df, week)
         table = Table(table_data, repeatRows=1)
         
-        table_style = get_main_table_style()
-        apply_rate_conditional_coloring(table_style, table_data, rate_col_idx=7, target_col_idx=8)
-        
-        table.setStyle(table_style)
+        coloring = rate_conditional_commands(table_data, rate_col_idx=7, target_col_idx=8)
+        table.setStyle(get_main_table_style(commands=coloring))
         self.elements.append(table)
         
         # ============ PAGE 2: CONTRIBUTORS ============
@@ -303,13 +235,7 @@ class WeeklyPDFGenerator(BasePDFGenerator):
             
             # Build contributors table
             contrib_data = self._build_contributors_table_data(contributors_df)
-            contrib_table = Table(contrib_data, repeatRows=1)
-            
-            contrib_table_style = get_contributors_table_style()
-            apply_contributors_cumulative_coloring(contrib_table_style, contrib_data, cumulative_col_idx=5, threshold=80.0)
-            
-            contrib_table.setStyle(contrib_table_style)
-            self.elements.append(contrib_table)
+            self._add_contributors_table(contrib_data, cumulative_col_idx=5)
         
         # Build PDF
         self.build_and_save(doc)
@@ -2,69 +2,168 @@
 PDF Styles module - Centralized style definitions for all PDF reports
 """
 
+from functools import lru_cache
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.lib import colors
 from config import COLOR_TEXT
 
 
-def get_styles():
-    """Get base ReportLab styles"""
-    return getSampleStyleSheet()
+# Sample stylesheet built once; the styles below only use it as parent
+_SAMPLE_STYLES = getSampleStyleSheet()
 
+# Colors parsed once at import time
+_TEXT_COLOR = colors.HexColor(COLOR_TEXT)
+_WITHIN_TARGET_COLOR = colors.HexColor('#2E8B57')
 
-def get_title_style():
-    """Get title paragraph style"""
-    styles = getSampleStyleSheet()
-    return ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
+# Colors of the period comparison section
+COMPARISON_HEADER_COLOR = colors.HexColor('#0d47a1')
+COMPARISON_ROW_COLOR = colors.HexColor('#e3f2fd')
+COMPARISON_IMPROVEMENT_COLOR = colors.HexColor('#2e7d32')
+COMPARISON_DETERIORATION_COLOR = colors.HexColor('#c62828')
+COMPARISON_NEUTRAL_COLOR = colors.HexColor('#666666')
+
+# Base style commands of the comparison table; each report adds its change-column colors
+COMPARISON_TABLE_STYLE_COMMANDS = (
+    # Header - mismo color que tabla principal
+    ('BACKGROUND', (0, 0), (-1, 0), COMPARISON_HEADER_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
+    
+    # Body
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 1), (-1, -1), 'MIDDLE'),
+    
+    # Borders
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('BOX', (0, 0), (-1, -1), 1.5, colors.black),
+    
+    # Alternating rows - mismo patrón que tabla principal
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, COMPARISON_ROW_COLOR]),
+)
+
+# Paragraph styles of the comparison section (constant, shared by all reports)
+_COMPARISON_TITLE_STYLE = ParagraphStyle(
+    'ComparisonTitle',
+    parent=_SAMPLE_STYLES['Heading2'],
+    alignment=TA_CENTER,
+    fontSize=12,
+    textColor=colors.HexColor('#333333')
+)
+
+_COMPARISON_NOTE_STYLE = ParagraphStyle(
+    'ComparisonNote',
+    parent=_SAMPLE_STYLES['Normal'],
+    fontSize=8,
+    textColor=COMPARISON_NEUTRAL_COLOR,
+    alignment=TA_CENTER
+)
+
+
+# Paragraph styles of the report headers (constant, shared by all reports)
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_SAMPLE_STYLES['Heading1'],
+    fontSize=24,
+    textColor=_TEXT_COLOR,
+    spaceAfter=10,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+_SUBTITLE_STYLE = ParagraphStyle(
+    'CustomSubtitle',
+    parent=_SAMPLE_STYLES['Normal'],
+    fontSize=11,
+    textColor=colors.grey,
+    spaceAfter=10,
+    alignment=TA_CENTER
+)
+
+_SECTION_TITLE_STYLE = ParagraphStyle(
+    'ContributorsTitle',
+    parent=_SAMPLE_STYLES['Heading2'],
+    fontSize=18,
+    textColor=_TEXT_COLOR,
+    spaceAfter=10,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+# DENTRO/FUERA DE META header, one style per result
+_TARGET_HEADER_STYLES = {
+    within_target: ParagraphStyle(
+        'TargetHeader',
+        parent=_SAMPLE_STYLES['Heading1'],
         fontSize=24,
-        textColor=colors.HexColor(COLOR_TEXT),
-        spaceAfter=10,
+        textColor=_WITHIN_TARGET_COLOR if within_target else colors.red,
+        spaceAfter=12,
         alignment=TA_CENTER,
         fontName='Helvetica-Bold'
     )
+    for within_target in (True, False)
+}
+
+
+def get_styles():
+    """Get base ReportLab styles"""
+    return getSampleStyleSheet()
+
+
+def get_title_style():
+    """Get title paragraph style (shared, do not modify)"""
+    return _TITLE_STYLE
 
 
 def get_subtitle_style():
-    """Get subtitle paragraph style"""
-    styles = getSampleStyleSheet()
-    return ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=colors.grey,
-        spaceAfter=10,
-        alignment=TA_CENTER
-    )
+    """Get subtitle paragraph style (shared, do not modify)"""
+    return _SUBTITLE_STYLE
 
 
 def get_section_title_style():
-    """Get section title style (for contributors section, etc.)"""
-    styles = getSampleStyleSheet()
-    return ParagraphStyle(
-        'ContributorsTitle',
-        parent=styles['Heading2'],
-        fontSize=18,
-        textColor=colors.HexColor(COLOR_TEXT),
-        spaceAfter=10,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
+    """Get section title style (for contributors section, etc.; shared, do not modify)"""
+    return _SECTION_TITLE_STYLE
 
 
 def get_target_header_style(within_target=True):
-    """Get style for DENTRO/FUERA DE META header"""
-    styles = getSampleStyleSheet()
-    header_color = colors.HexColor("#2E8B57") if within_target else colors.red
+    """Get style for DENTRO/FUERA DE META header (shared, do not modify)"""
+    return _TARGET_HEADER_STYLES[bool(within_target)]
+
+
+def get_comparison_title_style():
+    """Get title style of the period comparison section (shared, do not modify)"""
+    return _COMPARISON_TITLE_STYLE
+
+
+def get_comparison_note_style():
+    """Get style of the note below the period comparison table (shared, do not modify)"""
+    return _COMPARISON_NOTE_STYLE
+
+
+@lru_cache(maxsize=64)
+def get_comparison_note_text(rate_indicator, scrap_indicator, hours_indicator):
+    """
+    Get the markup of the note below the period comparison table
     
-    return ParagraphStyle(
-        'TargetHeader',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=header_color,
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
+    Depends only on the three indicators (at most 27 combinations), so it is built once per combination.
+    
+    Args:
+        rate_indicator: Scrap rate indicator (↓, ↑ or →)
+        scrap_indicator: Total scrap indicator
+        hours_indicator: Production hours indicator
+    
+    Returns:
+        str: Paragraph markup
+    """
+    return (
+        f"<i><font color='#2e7d32'><b>↓</b></font> = Mejora (reducción) | "
+        f"<font color='#c62828'><b>↑</b></font> = Deterioro (aumento) | "
+        f"<font color='#666666'><b>→</b></font> = Sin cambio significativo (&lt;1%)<br/>"
+        f"<b>Indicadores:</b> Scrap Rate {rate_indicator} | Total Scrap {scrap_indicator} | Horas Prod. {hours_indicator}</i>"
     )
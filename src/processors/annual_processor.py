@@ -3,7 +3,12 @@ annual_processor.py - Procesamiento de datos anuales
 """
 
 import pandas as pd
+import numpy as np
 from config import TARGET_RATES
+from src.analysis.aggregations import append_total_row
+
+# Target rate por mes (índice = número de mes, 0 sin uso; NaN si el mes no tiene target)
+_TARGET_RATES_ARR = np.array([np.nan] + [TARGET_RATES.get(m, np.nan) for m in range(1, 13)], dtype=np.float64)
 
 
 def process_annual_data(scrap_df, ventas_df, horas_df, year):
@@ -98,7 +103,7 @@ def process_annual_data(scrap_df, ventas_df, horas_df, year):
     # Crear DataFrame con todos los meses del año
     result = pd.DataFrame({'Month': range(1, 13)})
     result['Quarter'] = result['Month'].map(quarter_map).fillna(
-        result['Month'].apply(lambda m: (m - 1) // 3 + 1)
+        (result['Month'] - 1) // 3 + 1
     ).astype(int)
     result['Year'] = year
     
@@ -108,13 +113,12 @@ def process_annual_data(scrap_df, ventas_df, horas_df, year):
     result['$ Venta (dls)'] = result['Month'].map(ventas_monthly).fillna(0)
     
     # Calcular Rate
-    result['Rate'] = result.apply(
-        lambda row: row['Scrap'] / row['Hrs Prod.'] if row['Hrs Prod.'] > 0 else 0,
-        axis=1
-    )
+    hours = result['Hrs Prod.'].to_numpy(dtype=float)
+    result['Rate'] = np.divide(result['Scrap'].to_numpy(dtype=float), hours,
+                               out=np.zeros(len(result)), where=hours > 0)
     
     # Agregar Target Rate por mes
-    result['Target Rate'] = result['Month'].map(TARGET_RATES)
+    result['Target Rate'] = _TARGET_RATES_ARR[result['Month'].to_numpy()]
     
     # Calcular totales (sin Rate ni Target Rate)
     total_scrap = result['Scrap'].sum()
@@ -122,19 +126,17 @@ def process_annual_data(scrap_df, ventas_df, horas_df, year):
     total_ventas = result['$ Venta (dls)'].sum()
     
     # Agregar fila de totales
-    total_row = pd.DataFrame({
-        'Month': ['TOTAL'],
-        'Quarter': [''],
-        'Year': [''],
-        'Scrap': [total_scrap],
-        'Hrs Prod.': [total_horas],
-        '$ Venta (dls)': [total_ventas],
-        'Rate': [''],
-        'Target Rate': ['']
+    result = append_total_row(result, {
+        'Month': 'TOTAL',
+        'Quarter': '',
+        'Year': '',
+        'Scrap': total_scrap,
+        'Hrs Prod.': total_horas,
+        '$ Venta (dls)': total_ventas,
+        'Rate': '',
+        'Target Rate': ''
     })
     
-    result = pd.concat([result, total_row], ignore_index=True)
-    
     return result
 
 
@@ -203,9 +205,9 @@ def get_annual_weeks_data(scrap_df, ventas_df, horas_df, year):
     result = pd.DataFrame({'Week': all_weeks})
     result['Scrap'] = result['Week'].map(scrap_weekly).fillna(0)
     result['Hrs Prod.'] = result['Week'].map(horas_weekly).fillna(0)
-    result['Rate'] = result.apply(
-        lambda row: row['Scrap'] / row['Hrs Prod.'] if row['Hrs Prod.'] > 0 else 0,
-        axis=1
-    )
+    # Calcular Rate (evitar división por cero)
+    hours = result['Hrs Prod.'].to_numpy(dtype=float)
+    result['Rate'] = np.divide(result['Scrap'].to_numpy(dtype=float), hours,
+                               out=np.zeros(len(result)), where=hours > 0)
     
     return result
\ No newline at end of file
@@ -3,7 +3,9 @@ custom_processor.py - Procesamiento de datos por rango de fechas personalizado
 """
 
 import pandas as pd
+import numpy as np
 from config import TARGET_RATES
+from src.analysis.aggregations import append_total_row
 
 
 def process_custom_data(scrap_df, ventas_df, horas_df, start_date, end_date):
@@ -108,10 +110,9 @@ def process_custom_data(scrap_df, ventas_df, horas_df, start_date, end_date):
     result['$ Venta (dls)'] = result['Date'].map(ventas_daily).fillna(0)
     
     # Calcular Rate
-    result['Rate'] = result.apply(
-        lambda row: row['Scrap'] / row['Hrs Prod.'] if row['Hrs Prod.'] > 0 else 0,
-        axis=1
-    )
+    hours = result['Hrs Prod.'].to_numpy(dtype=float)
+    result['Rate'] = np.divide(result['Scrap'].to_numpy(dtype=float), hours,
+                               out=np.zeros(len(result)), where=hours > 0)
     
     # Calcular totales
     total_scrap = result['Scrap'].sum()
@@ -120,14 +121,12 @@ def process_custom_data(scrap_df, ventas_df, horas_df, start_date, end_date):
     total_rate = total_scrap / total_horas if total_horas > 0 else 0
     
     # Agregar fila de totales
-    total_row = pd.DataFrame({
-        'Date': ['TOTAL'],
-        'Scrap': [total_scrap],
-        'Hrs Prod.': [total_horas],
-        '$ Venta (dls)': [total_ventas],
-        'Rate': [total_rate]
+    result = append_total_row(result, {
+        'Date': 'TOTAL',
+        'Scrap': total_scrap,
+        'Hrs Prod.': total_horas,
+        '$ Venta (dls)': total_ventas,
+        'Rate': total_rate
     })
     
-    result = pd.concat([result, total_row], ignore_index=True)
-    
     return result
\ No newline at end of file
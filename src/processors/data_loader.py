@@ -7,12 +7,19 @@ import os
 import logging
 from config import TARGET_RATES, DATA_FILE_PATH, SCRAP_SHEET_NAME, VENTAS_SHEET_NAME, HORAS_SHEET_NAME
 from src.utils.cache_manager import get_cache_manager
+from src.utils.date_cache import clear_date_cache
+from src.analysis.period_kpi_calculator import clear_top_cache
 from src.utils.exceptions import DataLoadError, DataValidationError
 from src.utils.data_validator import validate_data
 from src.utils.backup_manager import get_backup_manager
 
 logger = logging.getLogger(__name__)
 
+# Último resultado de la validación avanzada y la tupla de DataFrames validada.
+# CacheManager regresa la misma tupla mientras el Excel no cambie, así que cada
+# reporte no vuelve a validar los mismos datos
+_validation_cache = {'data': None, 'result': None}
+
 
 def load_data(file_path=DATA_FILE_PATH, force_reload=False, validate=True):
     """
@@ -84,8 +91,14 @@ def load_data(file_path=DATA_FILE_PATH, force_reload=False, validate=True):
         # Validación avanzada (opcional)
         validation_result = None
         if validate:
-            logger.info("Ejecutando validación avanzada de datos...")
-            validation_result = validate_data(scrap_df, ventas_df, horas_df)
+            if _validation_cache['data'] is result:
+                logger.info("Usando validación previa (los datos no han cambiado)")
+                validation_result = _validation_cache['result']
+            else:
+                logger.info("Ejecutando validación avanzada de datos...")
+                validation_result = validate_data(scrap_df, ventas_df, horas_df)
+                _validation_cache['data'] = result
+                _validation_cache['result'] = validation_result
             logger.info(validation_result.get_summary())
         
         logger.info("=== Carga de datos completada exitosamente ===")
@@ -111,6 +124,13 @@ def clear_data_cache():
     """
     cache_manager = get_cache_manager()
     cache_manager.clear()
+    
+    # Resultados derivados de los DataFrames anteriores
+    _validation_cache['data'] = None
+    _validation_cache['result'] = None
+    clear_top_cache()
+    clear_date_cache()
+    
     logger.info("Caché de datos limpiado manualmente")
 
 
@@ -3,7 +3,9 @@ monthly_processor.py - Procesamiento de datos mensuales
 """
 
 import pandas as pd
+import numpy as np
 from config import TARGET_RATES, WEEK_MONTH_MAPPING_2025, get_week_number_vectorized, MONTHS_ES_TO_NUM
+from src.analysis.aggregations import append_total_row
 
 
 def process_monthly_data(scrap_df, ventas_df, horas_df, month, year):
@@ -94,10 +96,9 @@ def process_monthly_data(scrap_df, ventas_df, horas_df, month, year):
     result['$ Venta (dls)'] = result['Week'].map(ventas_weekly).fillna(0)
     
     # Calcular Rate
-    result['Rate'] = result.apply(
-        lambda row: row['Scrap'] / row['Hrs Prod.'] if row['Hrs Prod.'] > 0 else 0,
-        axis=1
-    )
+    hours = result['Hrs Prod.'].to_numpy(dtype=float)
+    result['Rate'] = np.divide(result['Scrap'].to_numpy(dtype=float), hours,
+                               out=np.zeros(len(result)), where=hours > 0)
     
     # Agregar Target Rate según el mes
     result['Target Rate'] = TARGET_RATES.get(month, 0.60)
@@ -109,17 +110,15 @@ def process_monthly_data(scrap_df, ventas_df, horas_df, month, year):
     total_rate = total_scrap / total_horas if total_horas > 0 else 0
     
     # Agregar fila de totales
-    total_row = pd.DataFrame({
-        'Week': ['TOTAL'],
-        'Month': [''],
-        'Year': [''],
-        'Scrap': [total_scrap],
-        'Hrs Prod.': [total_horas],
-        'Rate': [total_rate],
-        'Target Rate': [TARGET_RATES.get(month, 0.60)],
-        '$ Venta (dls)': [total_ventas]
+    result = append_total_row(result, {
+        'Week': 'TOTAL',
+        'Month': '',
+        'Year': '',
+        'Scrap': total_scrap,
+        'Hrs Prod.': total_horas,
+        'Rate': total_rate,
+        'Target Rate': TARGET_RATES.get(month, 0.60),
+        '$ Venta (dls)': total_ventas
     })
     
-    result = pd.concat([result, total_row], ignore_index=True)
-    
     return result
\ No newline at end of file
@@ -3,7 +3,9 @@ quarterly_processor.py - Procesamiento de datos trimestrales
 """
 
 import pandas as pd
+import numpy as np
 from config import TARGET_RATES
+from src.analysis.aggregations import append_total_row
 
 
 def process_quarterly_data(scrap_df, ventas_df, horas_df, quarter, year):
@@ -85,10 +87,9 @@ def process_quarterly_data(scrap_df, ventas_df, horas_df, quarter, year):
     result['$ Venta (dls)'] = result['Month'].map(ventas_monthly).fillna(0)
     
     # Calcular Rate
-    result['Rate'] = result.apply(
-        lambda row: row['Scrap'] / row['Hrs Prod.'] if row['Hrs Prod.'] > 0 else 0,
-        axis=1
-    )
+    hours = result['Hrs Prod.'].to_numpy(dtype=float)
+    result['Rate'] = np.divide(result['Scrap'].to_numpy(dtype=float), hours,
+                               out=np.zeros(len(result)), where=hours > 0)
     
     # Agregar Target Rate del último mes del trimestre
     last_month = months[-1]  # último mes del trimestre (por ejemplo, 6 para Q2)
@@ -101,17 +102,15 @@ def process_quarterly_data(scrap_df, ventas_df, horas_df, quarter, year):
     total_ventas = result['$ Venta (dls)'].sum()
     
     # Agregar fila de totales (sin Rate ni Target Rate)
-    total_row = pd.DataFrame({
-        'Month': ['TOTAL'],
-        'Quarter': [''],
-        'Year': [''],
-        'Scrap': [total_scrap],
-        'Hrs Prod.': [total_horas],
-        '$ Venta (dls)': [total_ventas],
-        'Rate': [''],
-        'Target Rate': ['']
+    result = append_total_row(result, {
+        'Month': 'TOTAL',
+        'Quarter': '',
+        'Year': '',
+        'Scrap': total_scrap,
+        'Hrs Prod.': total_horas,
+        '$ Venta (dls)': total_ventas,
+        'Rate': '',
+        'Target Rate': ''
     })
     
-    result = pd.concat([result, total_row], ignore_index=True)
-    
     return result
\ No newline at end of file
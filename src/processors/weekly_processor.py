@@ -3,11 +3,45 @@ Módulo para el procesamiento de datos de Scrap, Ventas y Horas
 """
 
 import pandas as pd
+import numpy as np
 import logging
 from config import TARGET_WEEK_RATES, get_week_number_vectorized
+from src.analysis.aggregations import append_total_row
+from src.utils.date_cache import get_parsed_dates, get_week_rows
 
 logger = logging.getLogger(__name__)
 
+
+def _daily_sums(df, date_column, value_column, rows, abs_values=False):
+    """
+    Suma por día de las filas seleccionadas, sin copiar ni modificar df
+
+    Args:
+        df (DataFrame): DataFrame de origen
+        date_column (str): Columna de fecha por la que se agrupa
+        value_column (str): Columna a sumar
+        rows (np.ndarray): Posiciones de las filas a incluir
+        abs_values (bool): Sumar valores absolutos (scrap)
+
+    Returns:
+        Series: Suma por fecha (índice datetime)
+    """
+    # Fechas de la semana sin nulos (groupby también descarta NaT)
+    dates = get_parsed_dates(df, date_column).to_numpy()[rows]
+    valid = ~np.isnat(dates)
+    dates = dates[valid]
+
+    values = df[value_column].to_numpy()[rows][valid]
+    if abs_values:
+        values = np.abs(values)
+
+    # Agrupar por el valor int64 de la fecha (hash de enteros en lugar de Timestamps)
+    # y regresar a fechas solo en el índice del resultado
+    daily = pd.Series(values).groupby(dates.view(np.int64)).sum()
+    daily.index = pd.DatetimeIndex(daily.index.to_numpy().view(dates.dtype), name=date_column)
+    return daily
+
+
 def process_weekly_data(scrap_df, ventas_df, horas_df, week_number, year):
     """
     Procesa los datos de una semana específica y calcula el rate de scrap.
@@ -25,41 +59,28 @@ def process_weekly_data(scrap_df, ventas_df, horas_df, week_number, year):
     """
     logger.info(f"=== Procesando semana {week_number} del año {year} ===")
     
-    # Convertir columnas de fecha a datetime
-    scrap_df['Create Date'] = pd.to_datetime(scrap_df['Create Date'])
-    ventas_df['Create Date'] = pd.to_datetime(ventas_df['Create Date'])
-    horas_df['Trans Date'] = pd.to_datetime(horas_df['Trans Date'])
-    
-    # Convertir scrap a positivo usando valor absoluto (más robusto)
-    scrap_df['Total Posted'] = abs(scrap_df['Total Posted'])
-    
-    # Agregar columnas de semana DOMINGO-SÁBADO y año (VECTORIZADO)
-    scrap_df['Week'] = get_week_number_vectorized(scrap_df['Create Date'], year=year)
-    scrap_df['Year'] = scrap_df['Create Date'].dt.year
-    ventas_df['Week'] = get_week_number_vectorized(ventas_df['Create Date'], year=year)
-    ventas_df['Year'] = ventas_df['Create Date'].dt.year
-    horas_df['Week'] = get_week_number_vectorized(horas_df['Trans Date'], year=year)
-    horas_df['Year'] = horas_df['Trans Date'].dt.year
-    
     # Usar el número de semana directamente (ya no necesitamos conversión)
     actual_week_number = week_number
 
-    # Filtrar por semana específica (usar semana domingo-sábado)
-    scrap_week = scrap_df[(scrap_df['Week'] == actual_week_number) & (scrap_df['Year'] == year)]
-    ventas_week = ventas_df[(ventas_df['Week'] == actual_week_number) & (ventas_df['Year'] == year)]
-    horas_week = horas_df[(horas_df['Week'] == actual_week_number) & (horas_df['Year'] == year)]
-    
-    logger.info(f"Registros filtrados - Scrap: {len(scrap_week)}, Ventas: {len(ventas_week)}, Horas: {len(horas_week)}")
+    # Filtrar por semana específica ANTES de cualquier otro cálculo
+    # Las filas de la semana se calculan una vez por DataFrame (caché de fechas) y
+    # se comparten con los contribuidores; los DataFrames recibidos no se modifican
+    scrap_rows = get_week_rows(scrap_df, 'Create Date', actual_week_number, year)
+    ventas_rows = get_week_rows(ventas_df, 'Create Date', actual_week_number, year)
+    horas_rows = get_week_rows(horas_df, 'Trans Date', actual_week_number, year)
     
-    # Agrupar por fecha
-    scrap_daily = scrap_week.groupby('Create Date')['Total Posted'].sum()
-    ventas_daily = ventas_week.groupby('Create Date')['Total Posted'].sum()
-    horas_daily = horas_week.groupby('Trans Date')['Actual Hours'].sum()
+    logger.info(f"Registros filtrados - Scrap: {len(scrap_rows)}, Ventas: {len(ventas_rows)}, Horas: {len(horas_rows)}")
     
     # Si no hay datos en ninguna de las fuentes para la semana, devolver None
-    if scrap_daily.empty and ventas_daily.empty and horas_daily.empty:
+    # antes de agrupar o construir el rango de fechas
+    if len(scrap_rows) == 0 and len(ventas_rows) == 0 and len(horas_rows) == 0:
         return None
-
+    
+    # Agrupar por fecha (scrap convertido a positivo usando valor absoluto)
+    scrap_daily = _daily_sums(scrap_df, 'Create Date', 'Total Posted', scrap_rows, abs_values=True)
+    ventas_daily = _daily_sums(ventas_df, 'Create Date', 'Total Posted', ventas_rows)
+    horas_daily = _daily_sums(horas_df, 'Trans Date', 'Actual Hours', horas_rows)
+    
     # Obtener todas las fechas con datos
     all_dates = sorted(set(scrap_daily.index) | set(horas_daily.index) | set(ventas_daily.index))
     
@@ -85,15 +106,14 @@ def process_weekly_data(scrap_df, ventas_df, horas_df, week_number, year):
     result['M'] = result.index.to_series().dt.month.astype(int).values
 
     # Rellenar datos
-    result['Scrap'] = result.index.map(scrap_daily).fillna(0)
-    result['Hrs Prod.'] = result.index.map(horas_daily).fillna(0)
-    result['$ Venta (dls)'] = result.index.map(ventas_daily).fillna(0)
+    result['Scrap'] = scrap_daily.reindex(week_dates, fill_value=0).to_numpy()
+    result['Hrs Prod.'] = horas_daily.reindex(week_dates, fill_value=0).to_numpy()
+    result['$ Venta (dls)'] = ventas_daily.reindex(week_dates, fill_value=0).to_numpy()
     
     # Calcular Rate (evitar división por cero)
-    result['Rate'] = result.apply(
-        lambda row: row['Scrap'] / row['Hrs Prod.'] if row['Hrs Prod.'] > 0 else 0,
-        axis=1
-    )
+    hours = result['Hrs Prod.'].to_numpy(dtype=float)
+    result['Rate'] = np.divide(result['Scrap'].to_numpy(dtype=float), hours,
+                               out=np.zeros(len(result)), where=hours > 0)
     
     # Determinar target rate usando la semana ISO normalizada
     target_rate_for_week = TARGET_WEEK_RATES.get(actual_week_number, 0.50)
@@ -106,18 +126,16 @@ def process_weekly_data(scrap_df, ventas_df, horas_df, week_number, year):
     total_rate = total_scrap / total_horas if total_horas > 0 else 0
     
     # Agregar fila de totales
-    total_row = pd.DataFrame({
-        'Day': ['Total'],
-        'D': [''],
-        'W': [''],
-        'M': [''],
-        'Scrap': [total_scrap],
-        'Hrs Prod.': [total_horas],
-        'Rate': [total_rate],
-        'Target Rate': [target_rate_for_week],
-        '$ Venta (dls)': [total_ventas]
+    result = append_total_row(result, {
+        'Day': 'Total',
+        'D': '',
+        'W': '',
+        'M': '',
+        'Scrap': total_scrap,
+        'Hrs Prod.': total_horas,
+        'Rate': total_rate,
+        'Target Rate': target_rate_for_week,
+        '$ Venta (dls)': total_ventas
     })
     
-    result = pd.concat([result, total_row], ignore_index=True)
-    
     return result
\ No newline at end of file
@@ -6,14 +6,51 @@ la velocidad de generación de reportes subsecuentes.
 """
 
 import os
+import hashlib
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import logging
-from config import SCRAP_SHEET_NAME, VENTAS_SHEET_NAME, HORAS_SHEET_NAME
+from concurrent.futures import ThreadPoolExecutor
+from config import SCRAP_SHEET_NAME, VENTAS_SHEET_NAME, HORAS_SHEET_NAME, DATA_CACHE_FOLDER
 from src.utils.exceptions import DataLoadError, CacheError
 
+# Motor de lectura de Excel: calamine (Rust) si está instalado, si no el de pandas (openpyxl)
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = None
+
+# Motores que liberan el GIL al leer (código nativo): con ellos las hojas se leen en paralelo.
+# openpyxl es Python puro, en hilos no se solapa y solo descomprimiría el libro tres veces
+PARALLEL_SHEET_ENGINES = ('calamine',)
+
+# openpyxl en modo streaming: sin estilos ni fórmulas, solo valores calculados
+OPENPYXL_ENGINE_KWARGS = {'read_only': True, 'data_only': True}
+
 logger = logging.getLogger(__name__)
 
+# Versión del formato de la caché en disco; incrementar si cambia la carga/optimización de tipos
+DISK_CACHE_VERSION = 2
+
+# Columnas que usa la aplicación por hoja (reportes, validación y razones de scrap);
+# el resto de columnas del Excel no se lee
+SHEET_COLUMNS = {
+    SCRAP_SHEET_NAME: frozenset(['Create Date', 'Total Posted', 'Item', 'Description',
+                                 'Location', 'Quantity', 'Reason Code']),
+    VENTAS_SHEET_NAME: frozenset(['Create Date', 'Total Posted']),
+    HORAS_SHEET_NAME: frozenset(['Trans Date', 'Actual Hours'])
+}
+
+# Tipos fijos de las columnas de montos y horas (aplican a las hojas que las tengan).
+# Las fechas no se fuerzan: Excel ya las entrega como fechas y el validador reporta las inválidas
+EXCEL_COLUMN_DTYPES = {'Total Posted': 'float64', 'Actual Hours': 'float64'}
+
+# Columnas de texto de Scrap con muchos valores repetidos: se guardan como category
+# (códigos enteros en lugar de strings, groupby sin re-hashear texto)
+SCRAP_CATEGORICAL_COLUMNS = ['Item', 'Location', 'Description']
+
 
 class CacheManager:
     """
@@ -80,8 +117,9 @@ class CacheManager:
                 needs_reload = True
             
             # Si necesitamos recargar, cargar desde archivo
+            # (force_reload ignora también la caché en disco)
             if needs_reload:
-                data = self._load_from_file(file_path, file_mtime)
+                data = self._load_from_file(file_path, file_mtime, use_disk_cache=not force_reload)
                 return data
             
             # Retornar desde caché
@@ -101,13 +139,53 @@ class CacheManager:
                 original_error=e
             )
     
-    def _load_from_file(self, file_path, file_mtime):
+    def _load_from_file(self, file_path, file_mtime, use_disk_cache=True):
         """
-        Carga datos desde archivo Excel y los almacena en caché.
+        Carga datos desde la caché en disco o desde el Excel y los almacena en caché.
         
         Args:
             file_path (str): Ruta al archivo Excel
             file_mtime (float): Timestamp de modificación del archivo
+            use_disk_cache (bool): Si False, ignora la caché en disco y lee el Excel
+            
+        Returns:
+            tuple: (scrap_df, ventas_df, horas_df)
+            
+        Raises:
+            DataLoadError: Si hay problemas leyendo el archivo Excel
+        """
+        start_time = datetime.now()
+        
+        # Caché en disco vigente: evita abrir y parsear el Excel
+        data = self._read_disk_cache(file_path, file_mtime) if use_disk_cache else None
+        
+        if data is None:
+            data = self._read_excel(file_path)
+            self._write_disk_cache(file_path, file_mtime, data)
+        
+        scrap_df, ventas_df, horas_df = data
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Datos cargados en {elapsed:.2f} segundos")
+        logger.info(f"  - {SCRAP_SHEET_NAME}: {len(scrap_df)} filas")
+        logger.info(f"  - {VENTAS_SHEET_NAME}: {len(ventas_df)} filas")
+        logger.info(f"  - {HORAS_SHEET_NAME}: {len(horas_df)} filas")
+        
+        # Guardar en caché
+        self._cache[file_path] = {
+            'data': data,
+            'mtime': file_mtime,
+            'loaded_at': datetime.now()
+        }
+        
+        logger.info(f"Datos almacenados en caché")
+        return data
+    
+    def _read_excel(self, file_path):
+        """
+        Lee las tres hojas del Excel y optimiza sus tipos de datos.
+        
+        Args:
+            file_path (str): Ruta al archivo Excel
             
         Returns:
             tuple: (scrap_df, ventas_df, horas_df)
@@ -116,53 +194,38 @@ class CacheManager:
             DataLoadError: Si hay problemas leyendo el archivo Excel
         """
         try:
-            start_time = datetime.now()
             logger.info(f"Cargando datos desde: {os.path.basename(file_path)}")
             
-            # Cargar hojas del Excel usando nombres de configuración
-            try:
-                scrap_df = pd.read_excel(file_path, sheet_name=SCRAP_SHEET_NAME)
-            except ValueError as e:
-                raise DataLoadError(
-                    file_path,
-                    reason=f"Hoja '{SCRAP_SHEET_NAME}' no encontrada en el archivo Excel",
-                    original_error=e
-                )
-            
-            try:
-                ventas_df = pd.read_excel(file_path, sheet_name=VENTAS_SHEET_NAME)
-            except ValueError as e:
-                raise DataLoadError(
-                    file_path,
-                    reason=f"Hoja '{VENTAS_SHEET_NAME}' no encontrada en el archivo Excel",
-                    original_error=e
-                )
+            # Abrir el libro una sola vez (se descomprime y analiza una vez)
+            # y leer las tres hojas usando nombres de configuración
+            with self._open_excel(file_path) as excel_file:
+                for sheet_name in (SCRAP_SHEET_NAME, VENTAS_SHEET_NAME, HORAS_SHEET_NAME):
+                    if sheet_name not in excel_file.sheet_names:
+                        raise DataLoadError(
+                            file_path,
+                            reason=f"Hoja '{sheet_name}' no encontrada en el archivo Excel"
+                        )
+                
+                sheet_names = [SCRAP_SHEET_NAME, VENTAS_SHEET_NAME, HORAS_SHEET_NAME]
+                try:
+                    # Tipos conocidos de antemano: pandas no tiene que inferirlos
+                    sheets = self._read_sheets(excel_file, file_path, sheet_names, dtype=EXCEL_COLUMN_DTYPES)
+                except (ValueError, TypeError) as e:
+                    # Valores no numéricos: leer infiriendo tipos para que el validador los reporte
+                    logger.warning(f"Tipos de columna no aplicables, leyendo con inferencia de tipos: {e}")
+                    sheets = self._read_sheets(excel_file, file_path, sheet_names)
             
-            try:
-                horas_df = pd.read_excel(file_path, sheet_name=HORAS_SHEET_NAME)
-            except ValueError as e:
-                raise DataLoadError(
-                    file_path,
-                    reason=f"Hoja '{HORAS_SHEET_NAME}' no encontrada en el archivo Excel",
-                    original_error=e
-                )
+            scrap_df = sheets[SCRAP_SHEET_NAME]
+            ventas_df = sheets[VENTAS_SHEET_NAME]
+            horas_df = sheets[HORAS_SHEET_NAME]
             
-            elapsed = (datetime.now() - start_time).total_seconds()
-            logger.info(f"Datos cargados en {elapsed:.2f} segundos")
-            logger.info(f"  - {SCRAP_SHEET_NAME}: {len(scrap_df)} filas")
-            logger.info(f"  - {VENTAS_SHEET_NAME}: {len(ventas_df)} filas")
-            logger.info(f"  - {HORAS_SHEET_NAME}: {len(horas_df)} filas")
-            
-            # Guardar en caché
-            data = (scrap_df, ventas_df, horas_df)
-            self._cache[file_path] = {
-                'data': data,
-                'mtime': file_mtime,
-                'loaded_at': datetime.now()
-            }
+            # Optimizar tipos de datos una sola vez al cargar
+            scrap_df = self._to_categorical(scrap_df, SCRAP_CATEGORICAL_COLUMNS)
+            scrap_df = self._downcast_numeric(scrap_df)
+            ventas_df = self._downcast_numeric(ventas_df)
+            horas_df = self._downcast_numeric(horas_df)
             
-            logger.info(f"Datos almacenados en caché")
-            return data
+            return scrap_df, ventas_df, horas_df
             
         except DataLoadError:
             # Re-lanzar excepciones de carga
@@ -176,6 +239,209 @@ class CacheManager:
                 original_error=e
             )
     
+    def _read_sheets(self, excel_file, file_path, sheet_names, **read_kwargs):
+        """
+        Lee las hojas del libro abierto, en paralelo si el motor lo permite.
+        
+        Args:
+            excel_file (pd.ExcelFile): Libro abierto
+            file_path (str): Ruta al archivo Excel
+            sheet_names (list): Hojas a leer
+            **read_kwargs: Argumentos adicionales para pd.read_excel (ej. dtype)
+            
+        Returns:
+            dict: {nombre de hoja: DataFrame}
+        """
+        if excel_file.engine in PARALLEL_SHEET_ENGINES:
+            return self._read_sheets_parallel(file_path, excel_file.engine, sheet_names, **read_kwargs)
+        
+        # Solo las columnas que usa la aplicación; usecols como función para que
+        # una columna faltante no falle aquí (la reporta el validador)
+        return {
+            name: excel_file.parse(name, usecols=SHEET_COLUMNS[name].__contains__, **read_kwargs)
+            for name in sheet_names
+        }
+    
+    @staticmethod
+    def _read_sheets_parallel(file_path, engine, sheet_names, **read_kwargs):
+        """
+        Lee varias hojas del libro en paralelo, una por hilo.
+        
+        Cada hilo abre su propio manejador del archivo (los lectores de Excel
+        no son seguros entre hilos).
+        
+        Args:
+            file_path (str): Ruta al archivo Excel
+            engine (str): Motor de lectura (debe liberar el GIL, ver PARALLEL_SHEET_ENGINES)
+            sheet_names (list): Hojas a leer
+            **read_kwargs: Argumentos adicionales para pd.read_excel
+            
+        Returns:
+            dict: {nombre de hoja: DataFrame}
+        """
+        with ThreadPoolExecutor(max_workers=len(sheet_names)) as executor:
+            futures = {
+                name: executor.submit(pd.read_excel, file_path, sheet_name=name, engine=engine,
+                                      usecols=SHEET_COLUMNS[name].__contains__, **read_kwargs)
+                for name in sheet_names
+            }
+            return {name: future.result() for name, future in futures.items()}
+    
+    @staticmethod
+    def _disk_cache_path(file_path):
+        """
+        Ruta del archivo de caché en disco para un Excel.
+        
+        Se guarda en una carpeta local (no junto al Excel, que puede estar en red);
+        el hash de la ruta completa evita choques entre archivos con el mismo nombre.
+        
+        Args:
+            file_path (str): Ruta absoluta al archivo Excel
+            
+        Returns:
+            str: Ruta del archivo .pkl de caché
+        """
+        path_hash = hashlib.sha1(file_path.encode('utf-8')).hexdigest()[:10]
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        return os.path.join(DATA_CACHE_FOLDER, f"{base_name}_{path_hash}.pkl")
+    
+    def _read_disk_cache(self, file_path, file_mtime):
+        """
+        Lee los DataFrames desde la caché en disco si corresponde al Excel actual.
+        
+        Args:
+            file_path (str): Ruta absoluta al archivo Excel
+            file_mtime (float): Timestamp de modificación del Excel
+            
+        Returns:
+            tuple o None: (scrap_df, ventas_df, horas_df), o None si no hay caché vigente
+        """
+        cache_path = self._disk_cache_path(file_path)
+        if not os.path.exists(cache_path):
+            return None
+        
+        try:
+            entry = pd.read_pickle(cache_path)
+        except Exception as e:
+            logger.warning(f"Caché en disco ilegible, se leerá el Excel: {e}")
+            return None
+        
+        # Solo es válida si el Excel no cambió y el formato es el actual
+        if entry.get('version') != DISK_CACHE_VERSION or entry.get('mtime') != file_mtime:
+            logger.info("Caché en disco desactualizada, se leerá el Excel")
+            return None
+        
+        logger.info(f"Usando caché en disco: {os.path.basename(cache_path)}")
+        return entry['data']
+    
+    def _write_disk_cache(self, file_path, file_mtime, data):
+        """
+        Guarda los DataFrames en la caché en disco (errores solo se registran).
+        
+        Args:
+            file_path (str): Ruta absoluta al archivo Excel
+            file_mtime (float): Timestamp de modificación del Excel
+            data (tuple): (scrap_df, ventas_df, horas_df)
+        """
+        cache_path = self._disk_cache_path(file_path)
+        try:
+            os.makedirs(DATA_CACHE_FOLDER, exist_ok=True)
+            
+            # Escribir a un temporal y reemplazar: nunca queda un archivo a medias
+            tmp_path = f"{cache_path}.tmp"
+            pd.to_pickle({'version': DISK_CACHE_VERSION, 'mtime': file_mtime, 'data': data}, tmp_path)
+            os.replace(tmp_path, cache_path)
+            logger.info(f"Caché en disco actualizada: {os.path.basename(cache_path)}")
+        except Exception as e:
+            logger.warning(f"No se pudo guardar la caché en disco: {e}")
+    
+    def _remove_disk_cache(self, file_path=None):
+        """
+        Elimina la caché en disco de un archivo (o toda si file_path es None).
+        
+        Args:
+            file_path (str, optional): Ruta absoluta al archivo Excel
+        """
+        if file_path is not None:
+            cache_paths = [self._disk_cache_path(file_path)]
+        elif os.path.isdir(DATA_CACHE_FOLDER):
+            cache_paths = [os.path.join(DATA_CACHE_FOLDER, name)
+                           for name in os.listdir(DATA_CACHE_FOLDER) if name.endswith('.pkl')]
+        else:
+            cache_paths = []
+        
+        for cache_path in cache_paths:
+            try:
+                if os.path.exists(cache_path):
+                    os.remove(cache_path)
+            except OSError as e:
+                logger.warning(f"No se pudo eliminar la caché en disco {cache_path}: {e}")
+    
+    @staticmethod
+    def _open_excel(file_path):
+        """
+        Abre el libro de Excel con el motor más rápido disponible.
+        
+        Usa calamine si está instalado; si no puede abrir el archivo (ej. formato
+        no soportado) usa openpyxl en modo solo lectura para .xlsx/.xlsm, o el
+        motor por defecto de pandas para otros formatos.
+        
+        Args:
+            file_path (str): Ruta al archivo Excel
+            
+        Returns:
+            pd.ExcelFile: Libro abierto (usar con 'with' para cerrarlo)
+        """
+        if EXCEL_ENGINE is not None:
+            try:
+                return pd.ExcelFile(file_path, engine=EXCEL_ENGINE)
+            except Exception as e:
+                logger.warning(f"No se pudo abrir con {EXCEL_ENGINE}, usando motor por defecto: {e}")
+        
+        if os.path.splitext(file_path)[1].lower() in ('.xlsx', '.xlsm'):
+            return pd.ExcelFile(file_path, engine='openpyxl', engine_kwargs=OPENPYXL_ENGINE_KWARGS)
+        
+        return pd.ExcelFile(file_path)
+    
+    @staticmethod
+    def _to_categorical(df, columns):
+        """
+        Convierte columnas de texto a tipo category (si existen en el DataFrame).
+        
+        Args:
+            df (DataFrame): DataFrame recién cargado
+            columns (list): Columnas a convertir
+            
+        Returns:
+            DataFrame: El mismo DataFrame con las columnas convertidas
+        """
+        for col in columns:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        return df
+    
+    @staticmethod
+    def _downcast_numeric(df):
+        """
+        Reduce el tamaño de las columnas numéricas sin perder precisión.
+        
+        Enteros pasan a int32 si caben. Los flotantes se quedan en float64:
+        aunque cada valor sea exacto en float32, las sumas (totales mensuales,
+        anuales y de contribuidores) se acumularían en float32 y cambiarían.
+        
+        Args:
+            df (DataFrame): DataFrame recién cargado
+            
+        Returns:
+            DataFrame: El mismo DataFrame con las columnas reducidas
+        """
+        int32_info = np.iinfo(np.int32)
+        for col in df.select_dtypes(include='integer').columns:
+            values = df[col]
+            if values.empty or (values.min() >= int32_info.min and values.max() <= int32_info.max):
+                df[col] = values.astype(np.int32)
+        return df
+    
     def clear(self, file_path=None):
         """
         Limpia el caché.
@@ -187,9 +453,11 @@ class CacheManager:
         if file_path is None:
             count = len(self._cache)
             self._cache.clear()
+            self._remove_disk_cache()
             logger.info(f"Caché completo limpiado ({count} archivos)")
         else:
             file_path = os.path.abspath(file_path)
+            self._remove_disk_cache(file_path)
             if file_path in self._cache:
                 del self._cache[file_path]
                 logger.info(f"Caché limpiado para: {os.path.basename(file_path)}")
@@ -0,0 +1,149 @@
+"""
+date_cache.py - Caché de columnas de fecha ya convertidas a datetime
+
+Evita repetir pd.to_datetime y la extracción de año/trimestre/mes/semana
+sobre el mismo DataFrame en cada consulta (dashboard, top items,
+contribuidores). La entrada se libera automáticamente cuando el DataFrame
+original es recolectado por el garbage collector.
+"""
+
+import logging
+import weakref
+from typing import Any, Callable, Dict, Tuple
+import numpy as np
+import pandas as pd
+from config import get_week_number_vectorized
+
+logger = logging.getLogger(__name__)
+
+# Número de filas usadas para detectar si la columna cambió
+_FINGERPRINT_ROWS = 64
+
+# (id del DataFrame, columna, tipo de dato derivado) -> (huella, valor calculado)
+_date_cache: Dict[Tuple[int, str, Any], Tuple[Tuple[int, int], Any]] = {}
+
+
+def _fingerprint(column: pd.Series) -> Tuple[int, int]:
+    """Huella barata de una columna: longitud + hash de las primeras filas"""
+    head_hash = int(pd.util.hash_pandas_object(column.head(_FINGERPRINT_ROWS), index=False).sum())
+    return len(column), head_hash
+
+
+def _get_cached(df: pd.DataFrame, column: str, tag: Any, compute: Callable[[], Any]) -> Any:
+    """
+    Regresa el valor cacheado para (df, column, tag) o lo calcula y lo guarda
+
+    Args:
+        df: DataFrame de origen
+        column: Columna de fecha de la que se deriva el valor
+        tag: Identificador del valor derivado
+        compute: Función sin argumentos que calcula el valor
+
+    Returns:
+        Valor cacheado o recién calculado
+    """
+    key = (id(df), column, tag)
+    fingerprint = _fingerprint(df[column])
+
+    # Reutilizar si el DataFrame es el mismo y la columna no cambió
+    cached = _date_cache.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    # Calcular y guardar; al recolectar df se elimina su entrada
+    value = compute()
+    if cached is None:
+        weakref.finalize(df, _date_cache.pop, key, None)
+    _date_cache[key] = (fingerprint, value)
+
+    return value
+
+
+def get_parsed_dates(df: pd.DataFrame, column: str) -> pd.Series:
+    """
+    Obtiene la columna de fecha como datetime, reutilizando la conversión previa
+
+    Args:
+        df: DataFrame de origen (no se modifica)
+        column: Nombre de la columna de fecha
+
+    Returns:
+        pd.Series: Columna convertida a datetime con el mismo índice que df
+    """
+    parsed = _get_cached(df, column, 'parsed', lambda: pd.to_datetime(df[column]).array)
+    return pd.Series(parsed, index=df.index, name=column, copy=False)
+
+
+def get_date_parts(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    """
+    Obtiene año, trimestre y mes de una columna de fecha, calculados una sola vez
+
+    Args:
+        df: DataFrame de origen (no se modifica)
+        column: Nombre de la columna de fecha
+
+    Returns:
+        pd.DataFrame: Columnas 'year', 'quarter', 'month' (int16, 0 para fechas nulas)
+            con el mismo índice que df
+    """
+    def compute():
+        dates = get_parsed_dates(df, column).dt
+        return {
+            'year': dates.year.fillna(0).to_numpy(dtype=np.int16),
+            'quarter': dates.quarter.fillna(0).to_numpy(dtype=np.int16),
+            'month': dates.month.fillna(0).to_numpy(dtype=np.int16)
+        }
+
+    parts = _get_cached(df, column, 'parts', compute)
+    return pd.DataFrame(parts, index=df.index, copy=False)
+
+
+def get_fiscal_weeks(df: pd.DataFrame, column: str, year: int) -> pd.Series:
+    """
+    Obtiene el número de semana fiscal (domingo-sábado) de cada fecha
+
+    Args:
+        df: DataFrame de origen (no se modifica)
+        column: Nombre de la columna de fecha
+        year: Año cuyo calendario fiscal se aplica
+
+    Returns:
+        pd.Series: Número de semana (int16) con el mismo índice que df
+    """
+    weeks = _get_cached(
+        df, column, ('week', year),
+        lambda: get_week_number_vectorized(get_parsed_dates(df, column), year=year).to_numpy(dtype=np.int16)
+    )
+    return pd.Series(weeks, index=df.index, name=column, copy=False)
+
+
+def get_week_rows(df: pd.DataFrame, column: str, week: int, year: int) -> np.ndarray:
+    """
+    Obtiene las posiciones de las filas de una semana fiscal, calculadas una sola vez
+
+    El reporte semanal (totales por día, contribuidores por Item y por
+    Location) y el dashboard filtran la misma semana del mismo DataFrame;
+    así la comparación semana/año se hace una vez y cada consumidor solo
+    toma sus filas con iloc.
+
+    Args:
+        df: DataFrame de origen (no se modifica)
+        column: Nombre de la columna de fecha
+        week: Número de semana domingo-sábado
+        year: Año de la semana
+
+    Returns:
+        np.ndarray: Posiciones (enteras, ordenadas) de las filas de la semana; no modificar
+    """
+    def compute():
+        weeks = get_fiscal_weeks(df, column, year).to_numpy()
+        years = get_date_parts(df, column)['year'].to_numpy()
+        return np.flatnonzero((weeks == week) & (years == year))
+
+    return _get_cached(df, column, ('week_rows', week, year), compute)
+
+
+def clear_date_cache():
+    """Limpia la caché de fechas convertidas"""
+    _date_cache.clear()
+    logger.debug("Caché de fechas limpiada")
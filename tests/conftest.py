@@ -0,0 +1,8 @@
+"""
+Configuración de pytest: permite importar 'src' desde la raíz del proyecto
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
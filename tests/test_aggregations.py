@@ -0,0 +1,108 @@
+"""
+Pruebas de aggregate_top_n contra el groupby de pandas que reemplaza
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.aggregations import aggregate_top_n, _top_n_indices
+
+
+def _groupby_top_n(df, group_col, top_n, first_cols, sum_cols, abs_values=False):
+    """Referencia: groupby + sort_values + head, como en los módulos originales"""
+    data = df.copy()
+    if abs_values:
+        for col in sum_cols:
+            data[col] = data[col].abs()
+    agg = {col: 'first' for col in first_cols}
+    agg.update({col: 'sum' for col in sum_cols})
+    result = data.groupby(group_col, as_index=False, observed=True).agg(agg)
+    result = result.sort_values('Total Posted', ascending=False, kind='stable')
+    return result.head(top_n).reset_index(drop=True)
+
+
+def _scrap_df(items):
+    """DataFrame de scrap con montos distintos por grupo (sin empates)"""
+    rng = np.random.default_rng(7)
+    n = len(items)
+    return pd.DataFrame({
+        'Item': items,
+        'Description': [f'Desc {i}' if i % 4 else None for i in range(n)],
+        'Quantity': rng.integers(-5, 50, n),
+        'Total Posted': rng.normal(100.0, 80.0, n).round(2),
+    })
+
+
+def _assert_parity(df, group_col, top_n, first_cols=(), sum_cols=('Total Posted',),
+                   abs_values=False):
+    result = aggregate_top_n(df, group_col, top_n, first_cols=first_cols,
+                             sum_cols=sum_cols, abs_values=abs_values)
+    expected = _groupby_top_n(df, group_col, top_n, first_cols, sum_cols, abs_values)
+
+    assert list(result.columns) == [group_col, *first_cols, *sum_cols]
+    assert list(result[group_col].astype(object)) == list(expected[group_col].astype(object))
+    for col in first_cols:
+        assert list(result[col].fillna('')) == list(expected[col].fillna(''))
+    for col in sum_cols:
+        np.testing.assert_allclose(result[col].to_numpy(dtype=np.float64),
+                                   expected[col].to_numpy(dtype=np.float64))
+
+
+@pytest.mark.parametrize('abs_values', [False, True])
+@pytest.mark.parametrize('top_n', [0, 3, 10, 1000])
+def test_parity_numeric_keys(top_n, abs_values):
+    df = _scrap_df([i % 37 for i in range(500)])
+    _assert_parity(df, 'Item', top_n, first_cols=('Description',),
+                   sum_cols=('Quantity', 'Total Posted'), abs_values=abs_values)
+
+
+def test_parity_mixed_int_str_keys():
+    items = [i % 23 if i % 3 else f'P-{i % 11}' for i in range(400)]
+    df = _scrap_df(items)
+    _assert_parity(df, 'Item', 10, first_cols=('Description',),
+                   sum_cols=('Quantity', 'Total Posted'))
+
+
+def test_parity_nan_keys_are_dropped():
+    items = [None if i % 9 == 0 else f'A{i % 17}' for i in range(300)]
+    df = _scrap_df(items)
+    df.loc[df.index % 13 == 0, 'Total Posted'] = np.nan
+    result = aggregate_top_n(df, 'Item', 50)
+
+    assert result['Item'].notna().all()
+    _assert_parity(df, 'Item', 50, sum_cols=('Total Posted',))
+
+
+def test_parity_categorical_keys():
+    df = _scrap_df([f'L{i % 8}' for i in range(200)])
+    df['Location'] = pd.Categorical(df['Item'], categories=[f'L{i}' for i in range(10)])
+    _assert_parity(df, 'Location', 5, first_cols=('Description',))
+
+
+def test_integer_sums_keep_integer_dtype():
+    df = _scrap_df([i % 5 for i in range(50)])
+    result = aggregate_top_n(df, 'Item', 5, sum_cols=('Quantity', 'Total Posted'))
+
+    assert pd.api.types.is_integer_dtype(result['Quantity'])
+    assert list(result.index) == list(range(len(result)))
+
+
+def test_ties_at_cutoff_keep_group_order():
+    # Varios items con el mismo monto exacto (ej. $361.77) justo en el corte del top N
+    items = ['A', 'B', 'C', 'D', 'E', 'F', 'G']
+    amounts = [500.0, 361.77, 90.0, 361.77, 361.77, 361.77, 700.0]
+    df = pd.DataFrame({'Item': items * 3, 'Total Posted': amounts * 3})
+
+    for top_n in range(len(items) + 1):
+        _assert_parity(df, 'Item', top_n)
+    assert list(aggregate_top_n(df, 'Item', 4)['Item']) == ['G', 'A', 'B', 'D']
+
+
+def test_top_n_indices_matches_stable_argsort():
+    rng = np.random.default_rng(11)
+    for _ in range(2000):
+        amounts = rng.integers(0, 6, rng.integers(1, 60)).astype(np.float64)
+        top_n = int(rng.integers(0, len(amounts) + 2))
+        expected = np.argsort(-amounts, kind='stable')[:top_n]
+        np.testing.assert_array_equal(_top_n_indices(amounts, top_n), expected)
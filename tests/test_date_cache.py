@@ -0,0 +1,98 @@
+"""
+Pruebas de la caché de fechas por DataFrame (src/utils/date_cache.py)
+"""
+
+import gc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils import date_cache
+from src.utils.date_cache import (
+    clear_date_cache, get_date_parts, get_parsed_dates, _fingerprint
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_date_cache()
+    yield
+    clear_date_cache()
+
+
+def _dates_df(start='2025-01-01', periods=200):
+    dates = pd.date_range(start, periods=periods, freq='D').strftime('%Y-%m-%d')
+    return pd.DataFrame({'Create Date': dates, 'Total Posted': np.arange(periods, dtype=np.float64)})
+
+
+def _keys_for(df):
+    return [key for key in date_cache._date_cache if key[0] == id(df)]
+
+
+def test_same_frame_is_parsed_once(monkeypatch):
+    df = _dates_df()
+    first = get_parsed_dates(df, 'Create Date')
+
+    # Un segundo acceso no debe volver a convertir
+    monkeypatch.setattr(pd, 'to_datetime', lambda *a, **k: pytest.fail('se volvió a convertir'))
+    second = get_parsed_dates(df, 'Create Date')
+
+    assert first.equals(second)
+    assert first.iloc[0] == pd.Timestamp('2025-01-01')
+
+
+def test_stale_entry_under_reused_id_is_recomputed():
+    df = _dates_df('2025-03-01')
+
+    # Entrada dejada por un DataFrame ya liberado cuyo id ahora tiene df
+    # (otra longitud y otras fechas)
+    other = _dates_df('2020-01-01', periods=50)
+    stale_parts = {'year': np.full(50, 2020, dtype=np.int16)}
+    date_cache._date_cache[(id(df), 'Create Date', 'parts')] = (
+        _fingerprint(other['Create Date']), stale_parts
+    )
+
+    parts = get_date_parts(df, 'Create Date')
+
+    assert len(parts) == len(df)
+    assert parts['year'].iloc[0] == 2025
+    assert parts['month'].iloc[0] == 3
+
+
+def test_entry_is_dropped_when_frame_is_collected():
+    df = _dates_df()
+    get_parsed_dates(df, 'Create Date')
+    get_date_parts(df, 'Create Date')
+    frame_id = id(df)
+    assert len(_keys_for(df)) == 2
+
+    del df
+    gc.collect()
+
+    assert not [key for key in date_cache._date_cache if key[0] == frame_id]
+
+
+def test_changed_head_invalidates_entry():
+    df = _dates_df()
+    assert get_date_parts(df, 'Create Date')['year'].iloc[0] == 2025
+
+    df.loc[0, 'Create Date'] = '2023-07-15'
+    parts = get_date_parts(df, 'Create Date')
+
+    assert parts['year'].iloc[0] == 2023
+    assert parts['month'].iloc[0] == 7
+    assert get_parsed_dates(df, 'Create Date').iloc[0] == pd.Timestamp('2023-07-15')
+
+
+def test_clear_date_cache_forces_recompute():
+    df = _dates_df()
+    first = get_parsed_dates(df, 'Create Date')
+    assert _keys_for(df)
+
+    clear_date_cache()
+    assert not date_cache._date_cache
+
+    second = get_parsed_dates(df, 'Create Date')
+    assert second.equals(first)
+    assert len(_keys_for(df)) == 1
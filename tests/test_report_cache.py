@@ -0,0 +1,125 @@
+"""
+Pruebas de la caché de reportes PDF de BasePDFGenerator (reutilizar el PDF
+cuando las entradas del reporte no cambiaron)
+"""
+
+import dataclasses
+import os
+
+import pandas as pd
+import pytest
+
+from src.analysis.period_comparison import PeriodComparison
+from src.pdf.base_generator import BasePDFGenerator
+from src.pdf.generators.monthly import MonthlyPDFGenerator
+
+
+@pytest.fixture(autouse=True)
+def empty_report_cache():
+    BasePDFGenerator._report_cache.clear()
+    yield
+    BasePDFGenerator._report_cache.clear()
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Cuenta las construcciones reales de PDF (build_and_save)"""
+    calls = []
+    original = BasePDFGenerator.build_and_save
+
+    def counting_build(self, doc):
+        calls.append(doc.filename)
+        return original(self, doc)
+
+    monkeypatch.setattr(BasePDFGenerator, 'build_and_save', counting_build)
+    return calls
+
+
+def _monthly_df(scrap=1500.0):
+    return pd.DataFrame({
+        'Week': [18, 19, 'TOTAL'],
+        'Month': [5, 5, ''],
+        'Year': [2025, 2025, ''],
+        'Scrap': [scrap, 900.0, scrap + 900.0],
+        'Hrs Prod.': [4000.0, 3800.0, 7800.0],
+        '$ Venta (dls)': [250000.0, 240000.0, 490000.0],
+        'Rate': [scrap / 4000.0, 900.0 / 3800.0, (scrap + 900.0) / 7800.0],
+        'Target Rate': [0.5, 0.5, 0.5],
+    })
+
+
+def _comparison(**changes):
+    comparison = PeriodComparison(
+        current_scrap_rate=0.31, current_total_scrap=2400.0, current_total_hours=7800.0,
+        previous_scrap_rate=0.35, previous_total_scrap=2600.0, previous_total_hours=7400.0,
+        rate_change_pct=-11.4, scrap_change_abs=-200.0, scrap_change_pct=-7.7,
+        hours_change_pct=5.4, period_label='Mayo 2025', previous_label='Abril 2025',
+    )
+    return dataclasses.replace(comparison, **changes)
+
+
+def _generate(tmp_path, df, comparison=None):
+    return MonthlyPDFGenerator(str(tmp_path)).generate(df, None, 5, 2025, comparison=comparison)
+
+
+def test_unchanged_inputs_reuse_pdf(tmp_path, builds):
+    first = _generate(tmp_path, _monthly_df(), _comparison())
+    second = _generate(tmp_path, _monthly_df(), _comparison())
+
+    assert first == second
+    assert os.path.exists(first)
+    assert len(builds) == 1
+
+
+def test_changed_df_rebuilds(tmp_path, builds):
+    _generate(tmp_path, _monthly_df(1500.0))
+    _generate(tmp_path, _monthly_df(1750.0))
+
+    assert len(builds) == 2
+
+
+def test_changed_comparison_rebuilds(tmp_path, builds):
+    _generate(tmp_path, _monthly_df(), _comparison())
+    _generate(tmp_path, _monthly_df(), _comparison(rate_change_pct=3.2))
+    _generate(tmp_path, _monthly_df(), None)
+
+    assert len(builds) == 3
+
+
+def test_overwritten_pdf_is_rebuilt(tmp_path, builds):
+    filepath = _generate(tmp_path, _monthly_df())
+
+    # Otro proceso sobrescribió el archivo: tamaño/fecha ya no coinciden
+    with open(filepath, 'wb') as f:
+        f.write(b'%PDF-1.4 otro reporte')
+    key = next(iter(BasePDFGenerator._report_cache))
+    assert MonthlyPDFGenerator(str(tmp_path))._get_cached_report(key) is None
+    assert key not in BasePDFGenerator._report_cache
+
+    rebuilt = _generate(tmp_path, _monthly_df())
+
+    assert rebuilt == filepath
+    assert len(builds) == 2
+    assert os.path.getsize(rebuilt) > len(b'%PDF-1.4 otro reporte')
+
+
+def test_deleted_pdf_is_rebuilt(tmp_path, builds):
+    filepath = _generate(tmp_path, _monthly_df())
+    os.remove(filepath)
+
+    assert _generate(tmp_path, _monthly_df()) == filepath
+    assert os.path.exists(filepath)
+    assert len(builds) == 2
+
+
+def test_cache_keeps_last_entries_only(tmp_path):
+    generator = MonthlyPDFGenerator(str(tmp_path))
+    filepath = tmp_path / 'report.pdf'
+    filepath.write_bytes(b'%PDF')
+
+    for i in range(BasePDFGenerator._REPORT_CACHE_SIZE + 3):
+        generator._store_cached_report(('key', i), str(filepath))
+
+    assert len(BasePDFGenerator._report_cache) == BasePDFGenerator._REPORT_CACHE_SIZE
+    assert generator._get_cached_report(('key', 0)) is None
+    assert generator._get_cached_report(('key', BasePDFGenerator._REPORT_CACHE_SIZE + 2)) == str(filepath)
@@ -0,0 +1,94 @@
+"""
+Pruebas de la caché de top items/locations de period_kpi_calculator
+"""
+
+import pandas as pd
+import pytest
+
+from src.analysis import period_kpi_calculator as pkc
+from src.utils.date_cache import clear_date_cache
+
+
+MAY_2025 = {'type': 'month', 'month': 5, 'year': 2025}
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    pkc.clear_top_cache()
+    clear_date_cache()
+    yield
+    pkc.clear_top_cache()
+    clear_date_cache()
+
+
+@pytest.fixture
+def aggregations(monkeypatch):
+    """Cuenta las llamadas reales a aggregate_top_n (una por consulta no cacheada)"""
+    calls = []
+    original = pkc.aggregate_top_n
+
+    def counting_aggregate(*args, **kwargs):
+        calls.append(args[1])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(pkc, 'aggregate_top_n', counting_aggregate)
+    return calls
+
+
+def _scrap_df():
+    return pd.DataFrame({
+        'Create Date': ['2025-05-02', '2025-05-06', '2025-05-13', '2025-05-20', '2025-05-28'],
+        'Item': ['A-100', 'B-200', 'A-100', 'C-300', 'B-200'],
+        'Description': ['Carcasa', 'Tornillo', 'Carcasa', 'Arnés', 'Tornillo'],
+        'Location': ['L1', 'L2', 'L1', 'L3', 'L2'],
+        'Total Posted': [-120.0, -80.0, -60.0, -150.0, -30.0],
+    })
+
+
+def test_same_df_and_period_hits_cache(aggregations):
+    df = _scrap_df()
+    first = pkc.get_top_items_for_period(df, MAY_2025, top_n=2)
+    second = pkc.get_top_items_for_period(df, MAY_2025, top_n=2)
+
+    assert first == second
+    assert aggregations == ['Item']
+
+
+def test_results_are_copies(aggregations):
+    df = _scrap_df()
+    first = pkc.get_top_items_for_period(df, MAY_2025, top_n=2)
+    first[0]['amount'] = -1
+
+    assert pkc.get_top_items_for_period(df, MAY_2025, top_n=2)[0]['amount'] != -1
+
+
+def test_changed_total_posted_misses_cache(aggregations):
+    df = _scrap_df()
+    before = pkc.get_top_items_for_period(df, MAY_2025, top_n=3)
+
+    # Mismo objeto, mismas fechas y filas: solo cambia la suma de 'Total Posted'
+    df.loc[3, 'Total Posted'] = -10.0
+    after = pkc.get_top_items_for_period(df, MAY_2025, top_n=3)
+
+    assert len(aggregations) == 2
+    assert before != after
+    assert [row['item'] for row in after][0] == 'A-100'
+
+
+def test_period_top_n_and_kind_are_part_of_key(aggregations):
+    df = _scrap_df()
+    pkc.get_top_items_for_period(df, MAY_2025, top_n=2)
+    pkc.get_top_items_for_period(df, MAY_2025, top_n=3)
+    pkc.get_top_items_for_period(df, {'type': 'quarter', 'quarter': 2, 'year': 2025}, top_n=2)
+    pkc.get_top_locations_for_period(df, MAY_2025, top_n=2)
+
+    assert aggregations == ['Item', 'Item', 'Item', 'Location']
+
+
+def test_clear_top_cache_forces_recompute(aggregations):
+    df = _scrap_df()
+    pkc.get_top_items_for_period(df, MAY_2025, top_n=2)
+    pkc.clear_top_cache()
+    pkc.get_top_items_for_period(df, MAY_2025, top_n=2)
+
+    assert len(aggregations) == 2